@@ -0,0 +1,79 @@
+from typing import TYPE_CHECKING, Generator
+
+import click
+from boto3.dynamodb.conditions import Attr
+
+from script_setup import *  # must be imported prior to src imports
+from src.dynamodb.connection import get_table
+from src.models import DynamoOrder
+from src.services.order_service import get_status_index_attributes
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb.service_resource import _Table
+
+
+def iter_unindexed_order_items(table_name: str) -> Generator[dict, None, None]:
+    """
+    Scans the table for Order items without a status_changed, written
+    before create_order wrote the status_shard_index attributes, and
+    yields their id and status.
+    """
+    options: dict = {
+        "FilterExpression": Attr("entity").eq(DynamoOrder._PK_ENTITY)
+        & Attr("status_changed").not_exists(),
+        "ProjectionExpression": "#id, #status",
+        "ExpressionAttributeNames": {"#id": "id", "#status": "status"},
+    }
+    while True:
+        response: dict = get_table(table_name).scan(**options)
+        yield from response.get("Items", [])
+
+        if not response.get("LastEvaluatedKey"):
+            return
+
+        options["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+@click.command()
+@click.option("-t", "--table_name", envvar="PLNT_EXPRESS_TBL", required=True)
+def main(table_name: str) -> None:
+    """
+    Writes the status_shard and status_changed of Orders created before
+    create_order wrote them, so iter_orders_by_status finds them. Each
+    Order is updated only while it still has no status_changed, so an
+    Order whose status changes meanwhile keeps the attributes written
+    with it, and rerunning the backfill skips indexed Orders.
+    """
+    table: "_Table" = get_table(table_name)
+    updated: int = 0
+    skipped: int = 0
+
+    for order_item in iter_unindexed_order_items(table_name):
+        attributes: dict = get_status_index_attributes(
+            order_item["id"], order_item["status"]
+        )
+        try:
+            table.update_item(
+                Key=DynamoOrder.calculate_key(order_item["id"]),
+                UpdateExpression="SET {}".format(
+                    ", ".join(f"#{name} = :{name}" for name in attributes)
+                ),
+                ConditionExpression="attribute_not_exists(#status_changed)",
+                ExpressionAttributeNames={
+                    "#status_changed": "status_changed",
+                    **{f"#{name}": name for name in attributes},
+                },
+                ExpressionAttributeValues={
+                    f":{name}": value for name, value in attributes.items()
+                },
+            )
+            updated += 1
+        except table.meta.client.exceptions.ConditionalCheckFailedException:
+            skipped += 1
+
+    print(f"Orders indexed: {updated}")
+    print(f"Orders indexed meanwhile: {skipped}")
+
+
+if __name__ == "__main__":
+    main()
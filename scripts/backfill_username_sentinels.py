@@ -0,0 +1,53 @@
+from typing import Generator
+
+import click
+from boto3.dynamodb.conditions import Attr
+
+from script_setup import *  # must be imported prior to src imports
+from src.dynamodb.bulk_writer import BulkWriteReport, bulk_write_items
+from src.dynamodb.connection import get_table
+from src.models import Customer, Username
+
+
+def iter_username_items(table_name: str) -> Generator[dict, None, None]:
+    """
+    Scans the table for Customer items and yields the Username
+    sentinel item of each one.
+    """
+    options: dict = {
+        "FilterExpression": Attr("entity").eq(Customer._SK_ENTITY),
+        "ProjectionExpression": "#email, #username",
+        "ExpressionAttributeNames": {"#email": "email", "#username": "username"},
+    }
+    while True:
+        response: dict = get_table(table_name).scan(**options)
+        for item in response.get("Items", []):
+            yield Username(name=item["username"], email=item["email"]).item
+
+        if not response.get("LastEvaluatedKey"):
+            return
+
+        options["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+@click.command()
+@click.option("-t", "--table_name", envvar="PLNT_EXPRESS_TBL", required=True)
+@click.option("-w", "--write_capacity_units", default=1.0, show_default=True)
+def main(table_name: str, write_capacity_units: float) -> None:
+    """
+    Writes the missing Username sentinels of Customers created before
+    create_customer wrote them. Sentinels are derived from the Customer
+    items, so rerunning the backfill rewrites the same items.
+    """
+    report: BulkWriteReport = bulk_write_items(
+        iter_username_items(table_name),
+        table_name=table_name,
+        write_capacity_units=write_capacity_units,
+    )
+
+    print(f"Username sentinels written: {report.items_written}")
+    print(f"Throttles: {report.throttles}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
+from statistics import quantiles
+from threading import Lock
+from time import perf_counter, sleep
+from typing import Callable, Dict, List, Tuple
+
+import click
+import simplejson as json
+from botocore.awsrequest import AWSResponse
+
+from benchmark_setup import *  # must be imported prior to src imports
+from src.dynamodb.connection import get_client, get_table
+from src.models import DynamoOrder, LineItem
+from src.services import order_service
+from src.services.order_service import OrderService
+
+NEW_LINE_ITEM: dict = {
+    "name": "Popplers",
+    "description": "Omicronian enities of small proportions.",
+    "quantity": 100,
+}
+
+
+class LatencyStub:
+    """
+    Answers DynamoDB calls in process after a fixed latency, keeping
+    only the item_count of each Order. moto copies the whole table on
+    every transaction, which would drown out what is measured here:
+    the number of round trips per line item.
+    """
+
+    def __init__(self, latency_ms: float) -> None:
+        self.latency: float = latency_ms / 1000
+        self.item_counts: Dict[str, int] = defaultdict(int)
+        self.lock: Lock = Lock()
+
+    def __call__(self, model, params: dict, **kwargs) -> Tuple[AWSResponse, dict]:
+        sleep(self.latency)
+        body: dict = json.loads(params["body"] or "{}")
+        parsed: dict = {}
+        status_code: int = 200
+
+        with self.lock:
+            if model.name == "UpdateItem":
+                order_pk: str = body["Key"]["pk"]["S"]
+                self.item_counts[order_pk] += 1
+                parsed = {
+                    "Attributes": {
+                        "item_count": {"N": str(self.item_counts[order_pk])},
+                    }
+                }
+            elif model.name == "GetItem":
+                order_pk: str = body["Key"]["pk"]["S"]
+                parsed = {
+                    "Item": {"item_count": {"N": str(self.item_counts[order_pk])}}
+                }
+            elif model.name == "TransactWriteItems":
+                update: dict = body["TransactItems"][0]["Update"]
+                order_pk: str = update["Key"]["pk"]["S"]
+                expected: int = int(
+                    update["ExpressionAttributeValues"][":expected"]["N"]
+                )
+                if self.item_counts[order_pk] == expected:
+                    self.item_counts[order_pk] += 1
+                else:
+                    status_code = 400
+                    parsed = {"Error": {"Code": "TransactionCanceledException"}}
+
+        return AWSResponse(None, status_code, {}, None), parsed
+
+
+def two_round_trip_add(order_key: dict) -> None:
+    """
+    The previous add_line_item_to_order: an update_item then a put_item.
+    """
+    table = get_table()
+    response: dict = table.update_item(
+        Key=order_key,
+        UpdateExpression="SET #item_count = #item_count + :incr",
+        ExpressionAttributeNames={"#item_count": "item_count"},
+        ExpressionAttributeValues={":incr": 1},
+        ReturnValues="UPDATED_NEW",
+    )
+    item_count = response["Attributes"]["item_count"]
+    table.put_item(
+        Item=LineItem(
+            **NEW_LINE_ITEM,
+            id=str(item_count).zfill(2),
+            order_id=order_key["pk"].split("#")[1],
+        ).item
+    )
+
+
+def transaction_add(order_key: dict) -> None:
+    OrderService().add_line_item_to_order(order_key, dict(NEW_LINE_ITEM))
+
+
+def cold_transaction_add(order_key: dict) -> None:
+    """
+    A container that hasn't written the Order yet, it reads item_count first.
+    """
+    order_service._forget_item_count(order_key["pk"])
+    transaction_add(order_key)
+
+
+def run(
+    add: Callable[[dict], None],
+    orders: List[dict],
+    rate: int,
+    duration: int,
+) -> List[float]:
+    """
+    Adds line items at a fixed arrival rate, and returns each request's
+    latency from its scheduled arrival, so queueing is included.
+    """
+    latencies: List[float] = []
+    started: float = perf_counter()
+
+    def request(order_key: dict, scheduled: float) -> None:
+        add(order_key)
+        latencies.append(perf_counter() - scheduled)
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        futures: list = []
+        for index in range(rate * duration):
+            scheduled: float = started + index / rate
+            sleep(max(0, scheduled - perf_counter()))
+            futures.append(
+                executor.submit(request, orders[index % len(orders)], scheduled)
+            )
+        wait(futures)
+        for future in futures:
+            future.result()
+
+    return latencies
+
+
+@click.command()
+@click.option("-r", "--rates", default="20,100,400", show_default=True)
+@click.option("-d", "--duration", default=5, show_default=True)
+@click.option("-l", "--latency_ms", default=8.0, show_default=True)
+@click.option("-o", "--order_count", default=100, show_default=True)
+def main(rates: str, duration: int, latency_ms: float, order_count: int) -> None:
+    """
+    Reports p50/p99 latency of adding a line item at sustained request
+    rates, for the previous two round trip path and the single
+    transaction, with a warm and a cold item_count hint.
+    """
+    stub: LatencyStub = LatencyStub(latency_ms)
+    get_client().meta.events.register("before-call.dynamodb", stub)
+
+    print(f"{'rate':>6} {'path':>18} {'p50':>10} {'p99':>10}")
+    for rate in (int(rate) for rate in rates.split(",")):
+        for path, add in (
+            ("two round trips", two_round_trip_add),
+            ("transaction", transaction_add),
+            ("cold transaction", cold_transaction_add),
+        ):
+            orders: List[dict] = [
+                DynamoOrder.calculate_key(f"{rate}-{path}-{index}")
+                for index in range(order_count)
+            ]
+            for order_key in orders:
+                order_service._remember_item_count(order_key["pk"], 0)
+
+            percentiles: List[float] = quantiles(
+                run(add, orders, rate, duration), n=100
+            )
+            print(
+                f"{rate:>6} {path:>18} "
+                f"{percentiles[49] * 1000:>7.1f} ms "
+                f"{percentiles[98] * 1000:>7.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
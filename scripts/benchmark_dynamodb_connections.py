@@ -0,0 +1,56 @@
+from timeit import timeit
+
+import boto3
+import click
+import moto
+
+from benchmark_setup import *  # must be imported prior to src imports
+from src.constants import TABLE_NAME
+from src.dynamodb.connection import get_table, reset_connections
+
+
+@click.command()
+@click.option("-n", "--iterations", default=200, show_default=True)
+def main(iterations: int) -> None:
+    """
+    Compares the per-call overhead of building a new boto3 resource
+    against reusing the shared Table from src.dynamodb.connection.
+    DynamoDB is mocked with moto, so only client-side cost is measured.
+    """
+    key: dict = {"pk": "Benchmark#1", "sk": "Benchmark#1"}
+
+    with moto.mock_dynamodb2():
+        create_table()
+        boto3.resource("dynamodb").Table(TABLE_NAME).put_item(Item=key)
+        reset_connections()
+        get_table(TABLE_NAME)  # the first call pays the one-off creation cost
+
+        print_result(
+            "before: boto3.resource().Table()",
+            timeit(
+                lambda: boto3.resource("dynamodb").Table(TABLE_NAME), number=iterations
+            ),
+            iterations,
+        )
+        print_result(
+            "after: get_table()",
+            timeit(lambda: get_table(TABLE_NAME), number=iterations),
+            iterations,
+        )
+        print_result(
+            "before: new resource + get_item",
+            timeit(
+                lambda: boto3.resource("dynamodb").Table(TABLE_NAME).get_item(Key=key),
+                number=iterations,
+            ),
+            iterations,
+        )
+        print_result(
+            "after: get_table() + get_item",
+            timeit(lambda: get_table(TABLE_NAME).get_item(Key=key), number=iterations),
+            iterations,
+        )
+
+
+if __name__ == "__main__":
+    main()
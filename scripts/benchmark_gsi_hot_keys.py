@@ -0,0 +1,99 @@
+from collections import Counter
+from typing import Dict, Iterator, List
+
+import click
+from ksuid import ksuid
+
+from script_setup import *  # must be imported prior to src imports
+from src.models import Customer, DynamoAddress, DynamoOrder, LineItem, OrderStatus
+
+# Write throughput a single DynamoDB partition, of a table or index, sustains.
+PARTITION_WCU_PER_SECOND: int = 1000
+
+INDEX_HASH_ATTRIBUTES: Dict[str, str] = {
+    "before: sk_pk_index": "sk",
+    "after: username_index": "username",
+}
+
+
+def build_items(orders: int, line_items: int) -> Iterator[dict]:
+    """
+    Yields the items written for a second of traffic: one Customer
+    with an Address per Order, the Order and its LineItems.
+    """
+    for index in range(orders):
+        email: str = f"customer{index}@planetexpress.com"
+        address_id: str = str(ksuid())
+        order_id: str = str(ksuid())
+
+        yield Customer(
+            email=email,
+            first_name="Philip",
+            last_name="Fry",
+            username=f"customer{index}",
+            date_created="2021-10-04",
+        ).item
+        yield DynamoAddress(
+            id=address_id,
+            email=email,
+            line1="471 1st Street Ct",
+            city="Gotham",
+            state="IL",
+            zipcode="60603",
+            type="delivery",
+            datetime_created="2021-10-04T00:00:00Z",
+        ).item
+        yield DynamoOrder(
+            id=order_id,
+            customer_email=email,
+            datetime_created="2021-10-04T00:00:00Z",
+            status=OrderStatus.NEW,
+            item_count=line_items,
+            delivery_address={
+                "line1": "471 1st Street Ct",
+                "city": "Gotham",
+                "state": "IL",
+                "zipcode": "60603",
+            },
+        ).item
+        for line_item in range(1, line_items + 1):
+            yield LineItem(
+                id=str(line_item).zfill(2),
+                order_id=order_id,
+                name="Popplers",
+                description="Omicronian enities of small proportions.",
+                quantity=100,
+            ).item
+
+
+@click.command()
+@click.option("-o", "--orders-per-second", default=2000, show_default=True)
+@click.option("-l", "--line-items", default=5, show_default=True)
+def main(orders_per_second: int, line_items: int) -> None:
+    """
+    Replays a second of order traffic and counts the index writes
+    each GSI partition key receives. With sk_pk_index every Order's
+    first LineItem lands on LineItem#01, so its partition throttles
+    once orders outgrow a single partition. username_index is only
+    written by Customers, one key per Customer.
+    """
+    items: List[dict] = list(build_items(orders_per_second, line_items))
+
+    print(
+        f"{'index':<24} {'writes/s':>9} {'keys':>7} "
+        f"{'hottest key':<20} {'writes/s':>9} {'throttled':>9}"
+    )
+    for index, attribute in INDEX_HASH_ATTRIBUTES.items():
+        writes: Counter = Counter(
+            item[attribute] for item in items if attribute in item
+        )
+        hottest_key, hottest_writes = writes.most_common(1)[0]
+        print(
+            f"{index:<24} {sum(writes.values()):>9} {len(writes):>7} "
+            f"{hottest_key[:20]:<20} {hottest_writes:>9} "
+            f"{str(hottest_writes > PARTITION_WCU_PER_SECOND):>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
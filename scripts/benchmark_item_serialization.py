@@ -0,0 +1,65 @@
+from timeit import timeit
+
+import click
+import simplejson as json
+from ksuid import ksuid
+from pydantic import BaseModel
+
+from script_setup import *  # must be imported prior to src imports
+from src.models import Order, OrderStatus
+
+
+def build_order(line_item_count: int) -> Order:
+    order_id: str = str(ksuid())
+
+    return Order(
+        id=order_id,
+        customer_email="philipfry@planetexpress.com",
+        datetime_created="2021-10-04T00:00:00Z",
+        status=OrderStatus.NEW,
+        item_count=line_item_count,
+        delivery_address={
+            "line1": "471 1st Street Ct",
+            "city": "Gotham",
+            "state": "IL",
+            "zipcode": "60603",
+        },
+        line_items=[
+            {
+                "id": str(index).zfill(2),
+                "order_id": order_id,
+                "name": "Popplers",
+                "description": "Omicronian enities of small proportions.",
+                "quantity": 100,
+            }
+            for index in range(1, line_item_count + 1)
+        ],
+    )
+
+
+def json_round_trip(order: Order) -> dict:
+    return json.loads(BaseModel.json(order))
+
+
+@click.command()
+@click.option("-n", "--iterations", default=2000, show_default=True)
+def main(iterations: int) -> None:
+    """
+    Compares DynamoItem.item against the json.dumps/json.loads
+    round-trip it replaced, for Orders with a growing number of line items.
+    """
+    print(f"{'line items':>10} {'round-trip':>14} {'item':>14} {'speedup':>8}")
+    for line_item_count in (0, 10, 50, 100):
+        order: Order = build_order(line_item_count)
+        before: float = timeit(lambda: json_round_trip(order), number=iterations)
+        after: float = timeit(lambda: order.item, number=iterations)
+        print(
+            f"{line_item_count:>10} "
+            f"{before / iterations * 1e6:>11.1f} us "
+            f"{after / iterations * 1e6:>11.1f} us "
+            f"{before / after:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+from math import ceil
+from timeit import timeit
+from typing import List
+
+import click
+import moto
+import simplejson as json
+
+from benchmark_setup import *  # must be imported prior to src imports
+from src.dynamodb.connection import reset_connections
+from src.dynamodb.helpers import get_item
+from src.models import DynamoOrder
+from src.services import order_service
+from src.services.order_service import OrderService
+
+READ_UNIT_BYTES: int = 4096
+WRITE_UNIT_BYTES: int = 1024
+
+NEW_ORDER: dict = {
+    "customer_email": "fry@planetexpress.com",
+    "delivery_address": {
+        "line1": "Robot Arms Apts",
+        "line2": "00100100",
+        "city": "New New York",
+        "state": "NY",
+        "zipcode": "10001",
+    },
+}
+NEW_LINE_ITEM: dict = {
+    "name": "Popplers",
+    "description": "Omicronian enities of small proportions.",
+    "quantity": 100,
+}
+
+
+def item_size(item: dict) -> int:
+    return len(json.dumps(item))
+
+
+def read_units(items: List[dict]) -> float:
+    """
+    Eventually consistent Query, the sizes of the returned
+    items are summed, then rounded up to 4 KB.
+    """
+    return max(1, ceil(sum(item_size(item) for item in items) / READ_UNIT_BYTES)) / 2
+
+
+def write_units(items: List[dict], transaction: bool) -> int:
+    """
+    Each written item is rounded up to 1 KB, transactions cost twice.
+    """
+    units: int = sum(max(1, ceil(item_size(item) / WRITE_UNIT_BYTES)) for item in items)
+
+    return units * 2 if transaction else units
+
+
+@click.command()
+@click.option("-l", "--line_item_counts", default="1,5,10,20", show_default=True)
+@click.option("-n", "--iterations", default=100, show_default=True)
+def main(line_item_counts: str, iterations: int) -> None:
+    """
+    Compares reading an Order with get_domain_order_by_id, and adding
+    its last LineItem, with LineItems in their own items and embedded
+    in the Order item. Capacity units are estimated from the item sizes,
+    DynamoDB is mocked with moto, so latency is client-side cost only.
+    """
+    service: OrderService = OrderService()
+
+    print(
+        f"{'line items':>10} {'layout':>9} {'items read':>10} {'RCU':>6} "
+        f"{'WCU/add':>8} {'latency':>12}"
+    )
+    with moto.mock_dynamodb2():
+        create_table()
+        reset_connections()
+
+        for line_item_count in (int(count) for count in line_item_counts.split(",")):
+            for layout, max_embedded in (("rows", 0), ("embedded", line_item_count)):
+                order_service.MAX_EMBEDDED_LINE_ITEMS = max_embedded
+                order: DynamoOrder = service.create_order(dict(NEW_ORDER))
+                for _ in range(line_item_count):
+                    line_item: dict = service.add_line_item_to_order(
+                        order.key, dict(NEW_LINE_ITEM)
+                    )
+
+                items: List[dict] = service.get_domain_order_by_id(
+                    order.id, deserialize=False
+                )
+                order_item: dict = get_item(order.key)
+                if layout == "rows":
+                    wcu: int = write_units([order_item, line_item], transaction=True)
+                else:
+                    wcu = write_units([order_item], transaction=False)
+
+                seconds: float = timeit(
+                    lambda: service.get_domain_order_by_id(order.id),
+                    number=iterations,
+                )
+                print(
+                    f"{line_item_count:>10} {layout:>9} {len(items):>10} "
+                    f"{read_units(items):>6} {wcu:>8} "
+                    f"{seconds / iterations * 1000:>9.3f} ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+from time import process_time
+from typing import Callable, List, Tuple
+
+import click
+import moto
+import simplejson as json
+
+from benchmark_setup import *  # must be imported prior to src imports
+from src import handlers
+from src.apigateway.requests import get_json_body
+from src.models import Customer, DynamoAddress, DynamoOrder, LineItem, OrderStatus
+from src.schemas.address import NewAddressSchema
+from src.schemas.customer import NewCustomerSchema
+from src.schemas.line_item import NewLineItemSchema, NewLineItemsSchema
+from src.schemas.order import NewOrderSchema, TransitionOrdersSchema
+
+ORDER_ID: str = "1zn0BcSmVWOXhQa1vlrI5mWNbyL"
+CUSTOMER: dict = {
+    "email": "philipfry@planetexpress.com",
+    "first_name": "Philip",
+    "last_name": "Fry",
+    "username": "fry",
+}
+ADDRESS: dict = {
+    "line1": "471 1st Street Ct",
+    "city": "Gotham",
+    "state": "IL",
+    "zipcode": "60603",
+    "type": "delivery",
+}
+LINE_ITEM: dict = {
+    "name": "Popplers",
+    "description": "Omicronian entities of small proportions.",
+    "quantity": 100,
+}
+ORDER_VALUES: dict = {
+    "id": ORDER_ID,
+    "datetime_created": "2021-10-04T00:00:00Z",
+    "status": OrderStatus.NEW,
+    "delivery_address": {key: value for key, value in ADDRESS.items() if key != "type"},
+}
+LINE_ITEM_VALUES: dict = {"id": "01", "order_id": ORDER_ID}
+
+# handler, schema, body and the domain models its service builds from the schema
+POST_REQUESTS: List[Tuple[str, type, dict, Callable[[object], object]]] = [
+    (
+        "http_create_customer",
+        NewCustomerSchema,
+        CUSTOMER,
+        lambda data: Customer.from_schema(data, date_created="2021-10-04"),
+    ),
+    (
+        "http_add_address_to_customer",
+        NewAddressSchema,
+        ADDRESS,
+        lambda data: DynamoAddress.from_schema(
+            data,
+            id=ORDER_ID,
+            email=CUSTOMER["email"],
+            datetime_created="2021-10-04T00:00:00Z",
+        ),
+    ),
+    (
+        "http_create_order",
+        NewOrderSchema,
+        {"customer_email": CUSTOMER["email"], "delivery_address_id": ORDER_ID},
+        lambda data: DynamoOrder.from_schema(data, **ORDER_VALUES),
+    ),
+    (
+        "http_add_line_item",
+        NewLineItemSchema,
+        LINE_ITEM,
+        lambda data: LineItem.from_schema(data, **LINE_ITEM_VALUES),
+    ),
+    (
+        "http_add_line_items",
+        NewLineItemsSchema,
+        {"line_items": [LINE_ITEM] * 25},
+        lambda data: [
+            LineItem.from_schema(line_item, **LINE_ITEM_VALUES)
+            for line_item in (
+                data["line_items"] if isinstance(data, dict) else data.line_items
+            )
+        ],
+    ),
+    (
+        "http_transition_orders",
+        TransitionOrdersSchema,
+        {"order_ids": [ORDER_ID], "status": OrderStatus.SUBMITTED.value},
+        lambda data: None,
+    ),
+]
+
+
+def cpu_per_call(function: Callable[[], object], iterations: int) -> float:
+    function()  # the first call pays for lazy imports and compiled loaders
+    started: float = process_time()
+    for _ in range(iterations):
+        function()
+
+    return (process_time() - started) / iterations * 1000
+
+
+def create_fixtures() -> Tuple[str, str]:
+    """
+    Creates the Customer, Address and Order the handlers are called with.
+
+    Returns:
+        ids (Tuple[str, str]): Address id and Order id.
+    """
+    handlers.http_create_customer({"body": json.dumps(CUSTOMER)}, None)
+    address: dict = json.loads(
+        handlers.http_add_address_to_customer(
+            {"body": json.dumps(ADDRESS), "pathParameters": {"username": "fry"}},
+            None,
+        )["body"]
+    )
+    order: dict = json.loads(
+        handlers.http_create_order(
+            {
+                "body": json.dumps(
+                    {
+                        "customer_email": CUSTOMER["email"],
+                        "delivery_address_id": address["id"],
+                    }
+                )
+            },
+            None,
+        )["body"]
+    )
+
+    return address["id"], order["id"]
+
+
+@click.command()
+@click.option("-n", "--iterations", default=200, show_default=True)
+def main(iterations: int) -> None:
+    """
+    Measures the CPU time of every POST handler per request. First the
+    request parsing alone: decoding and validating the body, then
+    building the service's models, with a second validation of the
+    schema's dict (before) against building them from the validated
+    schema (after). Then whole requests against a moto mocked table,
+    which includes moto's own CPU time.
+    """
+    print(f"{'handler':<32} {'before':>12} {'after':>12}  (parse and build)")
+    for name, schema, body, build in POST_REQUESTS:
+        raw_body: str = json.dumps(body)
+        before: float = cpu_per_call(
+            lambda: build(schema(**json.loads(raw_body)).dict()), iterations
+        )
+        after: float = cpu_per_call(
+            lambda: build(schema(**get_json_body({"body": raw_body}))), iterations
+        )
+        print(f"{name:<32} {before:>9.3f} ms {after:>9.3f} ms")
+
+    with moto.mock_dynamodb2():
+        create_table()
+        address_id, order_id = create_fixtures()
+        events: dict = {
+            "http_create_customer": lambda index: {
+                "body": json.dumps(
+                    {
+                        **CUSTOMER,
+                        "email": f"fry{index}@planetexpress.com",
+                        "username": f"fry{index}",
+                    }
+                )
+            },
+            "http_add_address_to_customer": lambda index: {
+                "body": json.dumps(ADDRESS),
+                "pathParameters": {"username": "fry"},
+            },
+            "http_create_order": lambda index: {
+                "body": json.dumps(
+                    {
+                        "customer_email": CUSTOMER["email"],
+                        "delivery_address_id": address_id,
+                    }
+                )
+            },
+            "http_add_line_item": lambda index: {
+                "body": json.dumps(LINE_ITEM),
+                "pathParameters": {"order_id": order_id},
+            },
+            "http_add_line_items": lambda index: {
+                "body": json.dumps({"line_items": [LINE_ITEM] * 25}),
+                "pathParameters": {"order_id": order_id},
+            },
+            "http_transition_orders": lambda index: {
+                "body": json.dumps(
+                    {"order_ids": [order_id], "status": OrderStatus.SUBMITTED.value}
+                )
+            },
+        }
+
+        print(f"\n{'handler':<32} {'request':>12}  (moto included)")
+        for name, _, _, _ in POST_REQUESTS:
+            handler: Callable[[dict, object], dict] = getattr(handlers, name)
+            requests: List[dict] = [events[name](index) for index in range(iterations)]
+            started: float = process_time()
+            for event in requests:
+                handler(event, None)
+            request: float = (process_time() - started) / iterations * 1000
+            print(f"{name:<32} {request:>9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
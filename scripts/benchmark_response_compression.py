@@ -0,0 +1,68 @@
+from timeit import timeit
+from typing import List, Tuple
+
+import click
+
+from script_setup import *  # must be imported prior to src imports
+from benchmark_item_serialization import build_order
+from src.apigateway.responses import HttpResponse
+from src.models import Order
+
+# content coding and compression level
+CODINGS: List[Tuple[str, int]] = [
+    ("gzip", 1),
+    ("gzip", 6),
+    ("gzip", 9),
+    ("deflate", 6),
+]
+
+
+@click.command()
+@click.option("-n", "--iterations", default=500, show_default=True)
+@click.option(
+    "--mbps",
+    default=10.0,
+    show_default=True,
+    help="Client bandwidth the transfer times are estimated with, in Mbit/s.",
+)
+def main(iterations: int, mbps: float) -> None:
+    """
+    Compares the response of a GET of Orders with a growing number of
+    line items, uncompressed and compressed with each content coding and
+    level: the size of the body API Gateway sends, the time taken to
+    compress it, including the base64 encoding, and the compression
+    time plus the estimated transfer time at the given bandwidth.
+    """
+    print(
+        f"{'line items':>10} {'coding':>10} {'bytes':>9} {'ratio':>7} "
+        f"{'compress':>12} {'total':>12}"
+    )
+    for line_item_count in (0, 10, 50, 100, 500):
+        order: Order = build_order(line_item_count)
+        body: str = HttpResponse(200, body=order)["body"]
+        transfer_ms: float = len(body) * 8 / (mbps * 1000)
+        print(
+            f"{line_item_count:>10} {'identity':>10} {len(body):>9} {1:>7.2f} "
+            f"{0:>9.3f} ms {transfer_ms:>9.3f} ms"
+        )
+
+        for coding, level in CODINGS:
+            event: dict = {"headers": {"Accept-Encoding": coding}}
+            compress = lambda: HttpResponse(200, body=body).compress(
+                event, min_bytes=0, level=level
+            )
+            response: HttpResponse = compress()
+            # API Gateway decodes the base64 body, the client gets the raw bytes
+            size: int = len(response["body"]) * 3 // 4
+            if not response["isBase64Encoded"]:
+                size = len(body)
+            compress_ms: float = timeit(compress, number=iterations) / iterations * 1000
+            print(
+                f"{'':>10} {f'{coding}-{level}':>10} {size:>9} "
+                f"{size / len(body):>7.2f} {compress_ms:>9.3f} ms "
+                f"{compress_ms + size * 8 / (mbps * 1000):>9.3f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
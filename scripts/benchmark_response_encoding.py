@@ -0,0 +1,45 @@
+from timeit import timeit
+
+import click
+from pydantic import BaseModel
+
+from script_setup import *  # must be imported prior to src imports
+from benchmark_item_serialization import build_order
+from src.apigateway.responses import HttpResponse
+from src.models import Order
+from src.models.encoders import JsonEncoder, OrjsonEncoder, orjson
+from src.models.serialization import get_serializer
+
+
+@click.command()
+@click.option("-n", "--iterations", default=2000, show_default=True)
+def main(iterations: int) -> None:
+    """
+    Compares the response body of a GET of Orders with a growing number
+    of line items: pydantic's json(), each JSON backend encoding the
+    serialized values, and an Order that already holds its document,
+    as a cached GET does.
+    """
+    print(
+        f"{'line items':>10} {'pydantic':>12} {'simplejson':>12} "
+        f"{'orjson':>12} {'reused':>12}"
+    )
+    for line_item_count in (0, 10, 50, 100):
+        order: Order = build_order(line_item_count)
+        values: dict = get_serializer(Order)(order)
+        timings: list = [
+            timeit(lambda: BaseModel.json(order), number=iterations),
+            timeit(lambda: JsonEncoder().dumps(values), number=iterations),
+            timeit(lambda: OrjsonEncoder().dumps(values), number=iterations)
+            if orjson
+            else float("nan"),
+            timeit(lambda: HttpResponse(200, body=order), number=iterations),
+        ]
+        print(
+            f"{line_item_count:>10} "
+            + " ".join(f"{timing / iterations * 1e6:>9.1f} us" for timing in timings)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import os
+
+import boto3
+
+from script_setup import *  # must be imported prior to src imports
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-2")
+os.environ.setdefault("PLNT_EXPRESS_TBL", "benchmark_table")
+
+
+def create_table() -> None:
+    """
+    Creates the benchmark table, must be called within a moto mock.
+    """
+    boto3.client("dynamodb").create_table(
+        TableName=os.environ["PLNT_EXPRESS_TBL"],
+        KeySchema=[
+            {"AttributeName": "pk", "KeyType": "HASH"},
+            {"AttributeName": "sk", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "pk", "AttributeType": "S"},
+            {"AttributeName": "sk", "AttributeType": "S"},
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+
+def print_result(label: str, seconds: float, iterations: int) -> None:
+    print(f"{label:<40} {seconds / iterations * 1000:>10.3f} ms/call")
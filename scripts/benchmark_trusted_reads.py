@@ -0,0 +1,74 @@
+from timeit import timeit
+from typing import List
+
+import click
+import moto
+from boto3.dynamodb.conditions import Key
+
+from benchmark_setup import *  # must be imported prior to src imports
+from benchmark_item_serialization import build_order
+from src.dynamodb.helpers import query_by_key_condition_expression
+from src.models import DynamoOrder, LineItem, Order
+from src.services.order_service import OrderService
+
+
+def validated_get(order_id: str) -> Order:
+    items: List[dict] = query_by_key_condition_expression(
+        Key("pk").eq(f"{DynamoOrder._PK_ENTITY}#{order_id}")
+    )
+    order_dict: dict = next(
+        item for item in items if item["entity"] == DynamoOrder._PK_ENTITY
+    )
+    order_dict["line_items"] = [
+        item for item in items if item["entity"] == LineItem._SK_ENTITY
+    ]
+
+    return Order(**order_dict)
+
+
+@click.command()
+@click.option("-n", "--iterations", default=200, show_default=True)
+def main(iterations: int) -> None:
+    """
+    Compares validating stored Orders with pydantic against the trusted
+    DynamoItem.from_item loader, on its own and for a whole GET through
+    OrderService.get_domain_order_by_id against a moto mocked table.
+    """
+    service: OrderService = OrderService()
+
+    with moto.mock_dynamodb2():
+        create_table()
+        print(f"{'line items':>10} {'step':>12} {'validated':>12} {'trusted':>12}")
+        for line_item_count in (0, 10, 50):
+            order: Order = build_order(line_item_count)
+            stored_item: dict = order.item
+            stored_item["line_items"] = [
+                line_item.item for line_item in order.line_items
+            ]
+            service.save_items(
+                [DynamoOrder(**order.dict(exclude={"line_items"}))] + order.line_items
+            )
+
+            for step, validated, trusted in (
+                (
+                    "model",
+                    lambda: Order(**stored_item),
+                    lambda: Order.from_item(stored_item),
+                ),
+                (
+                    "GET",
+                    lambda: validated_get(order.id),
+                    lambda: service.get_domain_order_by_id(order.id),
+                ),
+            ):
+                before: float = timeit(validated, number=iterations)
+                after: float = timeit(trusted, number=iterations)
+                print(
+                    f"{line_item_count:>10} {step:>12} "
+                    f"{before / iterations * 1000:>9.3f} ms "
+                    f"{after / iterations * 1000:>9.3f} ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+from itertools import chain
+from typing import Iterable
+
+import click
+import simplejson as json
+
+from script_setup import *  # must be imported prior to src imports
+from src.dynamodb.bulk_writer import BulkWriteReport
+from src.models import Customer, DynamoAddress, DynamoOrder, LineItem, Username
+from src.services.base_service import BaseService
+from src.services.order_service import OrderService
+
+MODELS: dict = {
+    "customers": Customer,
+    "addresses": DynamoAddress,
+    "orders": DynamoOrder,
+    "line_items": LineItem,
+}
+
+
+@click.command()
+@click.option("-f", "--file", "file_path", required=True, type=click.Path(exists=True))
+@click.option("-t", "--table_name", envvar="PLNT_EXPRESS_TBL", required=True)
+@click.option("-w", "--write_capacity_units", default=1.0, show_default=True)
+def main(file_path: str, table_name: str, write_capacity_units: float) -> None:
+    """
+    Bulk loads a JSON file of the form
+    {"customers": [...], "addresses": [...], "orders": [...], "line_items": [...]}
+    straight into DynamoDB, paced to the given write capacity units.
+    Orders are written with their status_shard_index attributes.
+    """
+    with open(file_path) as file:
+        data: dict = json.load(file, use_decimal=True)
+
+    models: Iterable = chain.from_iterable(
+        (model(**values) for values in data.get(name, []))
+        for name, model in MODELS.items()
+    )
+    usernames: Iterable = (
+        Username(name=values["username"], email=values["email"])
+        for values in data.get("customers", [])
+    )
+
+    # OrderService saves Orders with their status_shard_index attributes.
+    service: BaseService = OrderService()
+    service.TABLE_NAME = table_name
+    report: BulkWriteReport = service.save_items(
+        chain(models, usernames),
+        write_capacity_units=write_capacity_units,
+    )
+
+    print(f"Items written: {report.items_written}")
+    print(f"Requests: {report.requests}")
+    print(f"Throttles: {report.throttles}")
+    print(f"Retried items: {report.retried_items}")
+    print(f"Consumed capacity: {report.consumed_capacity:.1f} WCU")
+    print(f"Throughput: {report.items_per_second:.1f} items/s")
+
+
+if __name__ == "__main__":
+    main()
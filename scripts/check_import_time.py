@@ -0,0 +1,194 @@
+import ast
+import os
+import re
+import subprocess
+import sys
+from itertools import chain
+from typing import Dict, List, Tuple
+
+import click
+
+ROOT: str = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+HANDLERS_PATH: str = os.path.join(ROOT, "src", "handlers.py")
+HANDLER_PATTERN: re.Pattern = re.compile(r"handler:\s*src\.handlers\.(\w+)")
+IMPORT_TIME_PATTERN: re.Pattern = re.compile(
+    r"import time:\s*(\d+) \|\s*(\d+) \|( *)(\S+)"
+)
+# Modules that must only be imported once a handler is invoked.
+DEFERRED_MODULES: Tuple[str] = (
+    "boto3",
+    "botocore",
+    "email_validator",
+    "ksuid",
+    "mypy_boto3_dynamodb",
+)
+
+
+def get_handlers() -> List[str]:
+    """
+    Returns the name of every handler in serverless.yml.
+    """
+    with open(os.path.join(ROOT, "serverless.yml")) as serverless_yml:
+        return HANDLER_PATTERN.findall(serverless_yml.read())
+
+
+def get_invocation_imports() -> Dict[str, List[str]]:
+    """
+    Returns the modules each function of handlers.py imports in its
+    body, on the handler's first invocation. A handler that dispatches
+    through the ROUTER imports the modules of every handler.
+    """
+    with open(HANDLERS_PATH) as handlers_py:
+        tree: ast.Module = ast.parse(handlers_py.read())
+
+    imports: Dict[str, List[str]] = {}
+    routers: List[str] = []
+    for function in tree.body:
+        if not isinstance(function, ast.FunctionDef):
+            continue
+
+        nodes: List[ast.AST] = list(ast.walk(function))
+        imports[function.name] = sorted(
+            {node.module for node in nodes if isinstance(node, ast.ImportFrom)}
+            | {
+                alias.name
+                for node in nodes
+                if isinstance(node, ast.Import)
+                for alias in node.names
+            }
+        )
+        if any(isinstance(node, ast.Name) and node.id == "ROUTER" for node in nodes):
+            routers.append(function.name)
+
+    for router in routers:
+        imports[router] = sorted(set(chain.from_iterable(imports.values())))
+
+    return imports
+
+
+def measure_import(
+    handler: str,
+    invocation_imports: List[str],
+) -> Tuple[int, int, Dict[str, int], Dict[str, int]]:
+    """
+    Imports a handler the way the Lambda runtime does, in a fresh
+    interpreter with -X importtime, then the modules the handler
+    imports on its first invocation.
+
+    Parameters:
+        handler (str): Name of the handler in src.handlers.
+        invocation_imports (List[str]): Modules the handler imports when invoked.
+
+    Returns:
+        import_time (Tuple[int, int, Dict[str, int], Dict[str, int]]): Cumulative
+            microseconds of importing src.handlers, and of the first invocation's
+            imports, and the self microseconds of the modules each imports.
+    """
+    result: subprocess.CompletedProcess = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "; ".join(
+                [
+                    f"import src.handlers; src.handlers.{handler}",
+                    *(f"import {module}" for module in invocation_imports),
+                ]
+            ),
+        ],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    cumulative: int = 0
+    invocation: int = 0
+    modules: Dict[str, int] = {}
+    invocation_modules: Dict[str, int] = {}
+    # importtime lists a module once its own imports are done, so every
+    # module listed after src.handlers is imported by the invocation.
+    for self_us, cumulative_us, indent, module in IMPORT_TIME_PATTERN.findall(
+        result.stderr
+    ):
+        if cumulative:
+            invocation_modules[module] = int(self_us)
+            if len(indent) == 1:
+                invocation += int(cumulative_us)
+            continue
+
+        modules[module] = int(self_us)
+        if module == "src.handlers" and len(indent) == 1:
+            cumulative = int(cumulative_us)
+
+    return cumulative, invocation, modules, invocation_modules
+
+
+@click.command()
+@click.option(
+    "--budget_ms",
+    envvar="PLNT_EXPRESS_IMPORT_BUDGET_MS",
+    default=150.0,
+    show_default=True,
+    help="Maximum milliseconds importing src.handlers may take.",
+)
+@click.option(
+    "--invocation_budget_ms",
+    envvar="PLNT_EXPRESS_INVOCATION_IMPORT_BUDGET_MS",
+    default=150.0,
+    show_default=True,
+    help="Maximum milliseconds a handler's first invocation may spend importing.",
+)
+@click.option("-n", "--runs", default=5, show_default=True)
+@click.option("--top", default=10, show_default=True)
+def main(budget_ms: float, invocation_budget_ms: float, runs: int, top: int) -> None:
+    """
+    Reports the cold start import cost of every handler in serverless.yml:
+    importing src.handlers, then the modules the handler imports on its
+    first invocation, the best of several fresh interpreters. Exits
+    non-zero when a handler goes over either budget, or imports a module
+    that should be deferred until the handler is invoked.
+    """
+    failed: bool = False
+    slowest: Dict[str, int] = {}
+    slowest_cumulative: int = 0
+    invocation_imports: Dict[str, List[str]] = get_invocation_imports()
+
+    print(f"{'handler':<32} {'import':>11} {'invocation':>11}")
+    for handler in get_handlers():
+        cumulative, invocation, modules, invocation_modules = min(
+            (
+                measure_import(handler, invocation_imports.get(handler, []))
+                for _ in range(runs)
+            ),
+            key=lambda measured: measured[0] + measured[1],
+        )
+        eager: List[str] = sorted(set(DEFERRED_MODULES) & set(modules))
+        over_budget: bool = cumulative / 1000 > budget_ms
+        over_invocation_budget: bool = invocation / 1000 > invocation_budget_ms
+        failed = failed or over_budget or over_invocation_budget or bool(eager)
+        if cumulative + invocation > slowest_cumulative:
+            slowest = {**modules, **invocation_modules}
+            slowest_cumulative = cumulative + invocation
+
+        print(
+            f"{handler:<32} {cumulative / 1000:>8.1f} ms {invocation / 1000:>8.1f} ms"
+            f"{'  OVER BUDGET' if over_budget or over_invocation_budget else ''}"
+        )
+        for module in eager:
+            print(f"    imported eagerly: {module}")
+
+    print(
+        f"\nslowest modules, self time ({budget_ms:.0f} ms import and "
+        f"{invocation_budget_ms:.0f} ms invocation budgets):"
+    )
+    for module, self_us in sorted(slowest.items(), key=lambda m: -m[1])[:top]:
+        print(f"    {module:<40} {self_us / 1000:>8.1f} ms")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+from typing import Generator, Tuple
+
+import click
+from boto3.dynamodb.conditions import Attr
+
+from script_setup import *  # must be imported prior to src imports
+from src.dynamodb.connection import get_table
+from src.models import DynamoOrder
+from src.services import order_service
+from src.services.order_service import OrderService
+
+
+def iter_order_ids(table_name: str) -> Generator[str, None, None]:
+    """
+    Scans the table for Order items and yields their ids.
+    """
+    options: dict = {
+        "FilterExpression": Attr("entity").eq(DynamoOrder._PK_ENTITY),
+        "ProjectionExpression": "#id",
+        "ExpressionAttributeNames": {"#id": "id"},
+    }
+    while True:
+        response: dict = get_table(table_name).scan(**options)
+        for item in response.get("Items", []):
+            yield item["id"]
+
+        if not response.get("LastEvaluatedKey"):
+            return
+
+        options["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+@click.command()
+@click.option("-t", "--table_name", envvar="PLNT_EXPRESS_TBL", required=True)
+@click.option("--to", "layout", type=click.Choice(["embedded", "rows"]), required=True)
+@click.option(
+    "-m",
+    "--max_line_items",
+    envvar="PLNT_EXPRESS_EMBEDDED_LINE_ITEMS_MAX",
+    default=10,
+    show_default=True,
+)
+@click.option("-o", "--order_id", "order_ids", multiple=True)
+def main(
+    table_name: str,
+    layout: str,
+    max_line_items: int,
+    order_ids: Tuple[str],
+) -> None:
+    """
+    Converts Orders between the embedded LineItem layout and one item
+    per LineItem, every Order of the table unless order ids are given.
+    Orders with more than max_line_items LineItems stay in their own
+    items. Each Order is converted in its own transaction, so the
+    migration can be stopped and rerun at any point.
+    """
+    order_service.MAX_EMBEDDED_LINE_ITEMS = min(
+        max_line_items, order_service.TRANSACT_WRITE_ITEMS_LIMIT - 2
+    )
+    service: OrderService = OrderService()
+    service.TABLE_NAME = table_name
+    converted: int = 0
+    skipped: int = 0
+
+    for order_id in order_ids or iter_order_ids(table_name):
+        if service.convert_line_item_layout(order_id, embedded=layout == "embedded"):
+            converted += 1
+        else:
+            skipped += 1
+
+    print(f"Orders converted to {layout}: {converted}")
+    print(f"Orders skipped: {skipped}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,88 +4,62 @@ from typing import Callable
 import simplejson as json
 from pydantic import BaseModel, ValidationError
 
+from src.apigateway.exceptions import (
+    InvalidRequestBodyException,
+    RequestBodyTooLargeException,
+)
+from src.apigateway.requests import get_json_body
 from src.apigateway.responses import HttpResponse
-from src.apigateway.exceptions import UnkownGetItemMethod
-from src.services.base_service import BaseService
-from src.models.base_model import DynamoItem
 
 
-def http_post_request(schema: BaseModel) -> HttpResponse:
+def http_compressed_response(func: Callable) -> Callable:
     """
-    Accepts a Pydantic BaseModel to form from post request data.
+    Compresses the response of a Lambda handler with the content coding
+    the event's Accept-Encoding header accepts, when the body is large
+    enough to be worth it.
 
         Parameters:
-            schema (str): The Pydantic model used for schema validation.
+            func (Callable): The handler the decorator is wrapped on.
 
         Returns:
-            HttpResponse (HttpResponse): Response of 201 or 422.
+            wrapper (Callable): Handler returning the compressed HttpResponse.
     """
 
-    def decorator(func: Callable):
+    @wraps(func)
+    def wrapper(*f_args, **f_kwargs):
         """
-        Decorator accepts a Callable function.
-
-            Parameters:
-                func (Callable): The function the decorator is wrapped on.
+        Decorator wrapper accepts wrapped functions args, and kwargs.
 
             Returns:
-                HttpResponse (HttpResponse): Response of 201 or 422.
+                HttpResponse (HttpResponse): Response of the handler.
         """
+        event: dict = f_args[0] if not f_kwargs.get("event") else f_kwargs.get("event")
 
-        @wraps(func)
-        def wrapper(*f_args, **f_kwargs):
-            """
-            Decorator wrapper accepts wrapped functions args, and kwargs.
-
-                Returns:
-                    HttpResponse (HttpResponse): Response of 201 or 422.
-            """
-            event: dict = (
-                f_args[0] if not f_kwargs.get("event") else f_kwargs.get("event")
-            )
-            path_parametrs: dict = event.get("pathParameters")
-
-            try:
-                raw_data: str = event.get("body")
-                data: dict = json.loads(raw_data)
-                model: BaseModel = schema(**data)
-                if path_parametrs:
-                    return func(model.dict(), **path_parametrs)
-                return func(model.dict())
-
-            except ValidationError as e:
-                return HttpResponse(status_code=422, body=json.dumps(e.errors()))
-
-        return wrapper
+        return func(*f_args, **f_kwargs).compress(event)
 
-    return decorator
+    return wrapper
 
 
-def http_get_pk_sk_from_path_request(
-    entity_service: BaseService,
-    pk_path_parameter: str,
-    sk_path_parameter: str or None = None,
-    model: DynamoItem = DynamoItem,
-    get_item_method: str = "get_item_by_key",
-) -> HttpResponse:
+def http_post_request(schema: BaseModel) -> HttpResponse:
     """
-    Queries DynamoDB to locate an item from path values and return an
-    instaniated Pydantic mode of the item.
+    Accepts a Pydantic BaseModel to form from post request data. The
+    body is decoded once and validated once, and the wrapped function
+    receives the validated schema instance, so services can build their
+    models from it without validating the same fields again.
 
         Parameters:
-            enitity_service (BaseService): The service used to retrieve the DynamoDB item.
-            pk_path_parameter (str): The path parameter that contains the the value of the _PK_FIELD
-            sk_path_parameter (str): The path parameter that contains the the value of the _SK_FIELD
-            model (DynamoItem): The type of Pydantic model to return
-            get_item_method (str): The method on the entity_service to retrieve the DynamoDB item.
+            schema (str): The Pydantic model used for schema validation.
 
         Returns:
-            HttpResponse (HttpResponse): Response of 201 or 422.
+            HttpResponse (HttpResponse): Response of 201, 400, 413 or 422.
     """
 
     def decorator(func: Callable):
         """
-        Decorator wrapper accepts wrapped functions args, and kwargs.
+        Decorator accepts a Callable function.
+
+            Parameters:
+                func (Callable): The function the decorator is wrapped on.
 
             Returns:
                 HttpResponse (HttpResponse): Response of 201 or 422.
@@ -94,10 +68,7 @@ def http_get_pk_sk_from_path_request(
         @wraps(func)
         def wrapper(*f_args, **f_kwargs):
             """
-            Decorator accepts a Callable function.
-
-                Parameters:
-                    func (Callable): The function the decorator is wrapped on.
+            Decorator wrapper accepts wrapped functions args, and kwargs.
 
                 Returns:
                     HttpResponse (HttpResponse): Response of 201 or 422.
@@ -105,23 +76,20 @@ def http_get_pk_sk_from_path_request(
             event: dict = (
                 f_args[0] if not f_kwargs.get("event") else f_kwargs.get("event")
             )
-            pk_value: str = event["pathParameters"].get(pk_path_parameter)
-            sk_value: str = (
-                event["pathParameters"].get(sk_path_parameter)
-                if sk_path_parameter
-                else None
-            )
-
-            key: dict = model.calculate_key(pk_value, sk_value)
-            service: BaseService = entity_service()
+            path_parametrs: dict = event.get("pathParameters")
 
-            method: Callable = getattr(service, get_item_method, None)
-            if not method and not callable(method):
-                raise UnkownGetItemMethod(
-                    f"Unable to locate {get_item_method} on {entity_service.__name__}"
-                )
+            try:
+                model: BaseModel = schema(**get_json_body(event))
+                if path_parametrs:
+                    return func(model, **path_parametrs)
+                return func(model)
 
-            return func(method(key, model))
+            except RequestBodyTooLargeException as e:
+                return HttpResponse(status_code=413, body={"message": str(e)})
+            except InvalidRequestBodyException as e:
+                return HttpResponse(status_code=400, body={"message": str(e)})
+            except ValidationError as e:
+                return HttpResponse(status_code=422, body=json.dumps(e.errors()))
 
         return wrapper
 
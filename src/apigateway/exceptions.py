@@ -5,7 +5,19 @@ class InvalidSchemaException(Exception):
     """
 
 
-class UnkownGetItemMethod:
+class DuplicateRouteException(Exception):
     """
-    Raised when the get_item_method on a parameter is not available in the service.
+    Raised when a method and resource path template is routed twice.
+    """
+
+
+class InvalidRequestBodyException(Exception):
+    """
+    Raised when a request body isn't a JSON object.
+    """
+
+
+class RequestBodyTooLargeException(Exception):
+    """
+    Raised when a request body is larger than the accepted size.
     """
@@ -0,0 +1,152 @@
+from base64 import b64decode
+from binascii import Error as BinasciiError
+from json import JSONDecodeError, loads
+from typing import Dict, List
+
+from src.apigateway.exceptions import (
+    InvalidRequestBodyException,
+    RequestBodyTooLargeException,
+)
+from src.constants import MAX_REQUEST_BODY_BYTES
+
+
+def get_header(
+    event: dict,
+    name: str,
+) -> str or None:
+    """
+    Returns a request header of an API Gateway event, header names
+    are matched case-insensitively.
+
+        Parameters:
+            event (dict): API Gateway event.
+            name (str): Header name.
+
+        Returns:
+            value (str): Header value, None if the header wasn't sent.
+    """
+    name = name.lower()
+    return next(
+        (
+            value
+            for header, value in (event.get("headers") or {}).items()
+            if header.lower() == name
+        ),
+        None,
+    )
+
+
+def get_if_none_match(
+    event: dict,
+) -> List[str]:
+    """
+    Returns the entity tags of an If-None-Match header. Weak tags are
+    returned as their strong counterpart, since If-None-Match uses
+    weak comparison.
+
+        Parameters:
+            event (dict): API Gateway event.
+
+        Returns:
+            etags (List[str]): Quoted entity tags, or ["*"].
+    """
+    header: str or None = get_header(event, "If-None-Match")
+    if not header:
+        return []
+
+    return [
+        etag.strip()[2:] if etag.strip().startswith("W/") else etag.strip()
+        for etag in header.split(",")
+    ]
+
+
+def get_accepted_encodings(
+    event: dict,
+) -> Dict[str, float]:
+    """
+    Returns the content codings of an Accept-Encoding header with their
+    q-values, codings without a q-value are accepted with 1.
+
+        Parameters:
+            event (dict): API Gateway event.
+
+        Returns:
+            encodings (Dict[str, float]): q-value by lowercase content coding.
+    """
+    header: str or None = get_header(event, "Accept-Encoding")
+    if not header:
+        return {}
+
+    encodings: Dict[str, float] = {}
+    for accepted in header.split(","):
+        coding, *parameters = accepted.split(";")
+        quality: float = 1.0
+        for parameter in parameters:
+            name, _, value = parameter.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+
+        if coding.strip():
+            encodings[coding.strip().lower()] = quality
+
+    return encodings
+
+
+def get_fields(
+    event: dict,
+) -> List[str]:
+    """
+    Returns the field names of a comma separated fields query string
+    parameter, such as ?fields=status,item_count.
+
+        Parameters:
+            event (dict): API Gateway event.
+
+        Returns:
+            fields (List[str]): Requested field names, empty if all fields are requested.
+    """
+    fields: str = (event.get("queryStringParameters") or {}).get("fields") or ""
+
+    return [field.strip() for field in fields.split(",") if field.strip()]
+
+
+def get_json_body(
+    event: dict,
+    max_bytes: int = MAX_REQUEST_BODY_BYTES,
+) -> dict:
+    """
+    Decodes the JSON object body of an API Gateway event, once, with the
+    standard library's C decoder. Oversized bodies are rejected before
+    they are decoded, and a missing body decodes to an empty object so
+    the schema reports the missing fields.
+
+        Parameters:
+            event (dict): API Gateway event.
+            max_bytes (int): Largest body accepted, in characters of the decoded body.
+
+        Returns:
+            body (dict): Decoded JSON object.
+
+        Raises:
+            RequestBodyTooLargeException: Occurs if the body is larger than max_bytes.
+            InvalidRequestBodyException: Occurs if the body isn't a JSON object.
+    """
+    body: str or bytes = event.get("body") or "{}"
+    size: int = len(body) * 3 // 4 if event.get("isBase64Encoded") else len(body)
+    if size > max_bytes:
+        raise RequestBodyTooLargeException(f"Body is larger than {max_bytes} bytes.")
+
+    try:
+        if event.get("isBase64Encoded"):
+            body = b64decode(body, validate=True)
+        data: object = loads(body)
+    except (BinasciiError, JSONDecodeError, UnicodeDecodeError):
+        raise InvalidRequestBodyException("Body is not valid JSON.")
+
+    if not isinstance(data, dict):
+        raise InvalidRequestBodyException("Body must be a JSON object.")
+
+    return data
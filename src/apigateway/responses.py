@@ -1,4 +1,14 @@
-import simplejson as json
+import gzip
+import zlib
+from base64 import b64encode
+from typing import Callable, Dict
+
+from pydantic import BaseModel
+
+from src.apigateway.requests import get_accepted_encodings
+from src.constants import COMPRESSION_LEVEL, COMPRESSION_MIN_BYTES
+from src.models.base_model import DynamoItem
+from src.models.encoders import json_encoder
 
 DEFAULT_HEADERS: dict = {
     "Access-Control-Allow-Origin": "*",
@@ -6,27 +16,151 @@ DEFAULT_HEADERS: dict = {
     "Content-Type": "application/json",
 }
 
+# Content codings in order of preference, when accepted with the same q-value.
+CONTENT_ENCODERS: Dict[str, Callable[[bytes, int], bytes]] = {
+    "gzip": lambda data, level: gzip.compress(data, compresslevel=level, mtime=0),
+    "deflate": lambda data, level: zlib.compress(data, level),
+}
+
+
+def encode_body(body: dict or list or BaseModel or str or bytes) -> str:
+    """
+    Returns the JSON document of a response body. Strings and bytes are
+    already encoded and used as is, a DynamoItem reuses the document it
+    keeps of its fields, anything else is encoded with the JSON encoder.
+
+    Parameters:
+        body (dict or list or BaseModel or str or bytes): Response body.
+
+    Returns:
+        document (str): JSON document.
+    """
+    if isinstance(body, str):
+        return body
+
+    if isinstance(body, bytes):
+        return body.decode()
+
+    if isinstance(body, DynamoItem):
+        return body.cached_json()
+
+    if isinstance(body, (dict, list, BaseModel)):
+        return json_encoder.dumps(body)
+
+    raise Exception
+
+
+def negotiate_content_encoding(event: dict) -> str or None:
+    """
+    Returns the content coding to compress the response to an API Gateway
+    event with, the accepted coding with the highest q-value, gzip before
+    deflate on a tie. A * accepts the codings that aren't listed.
+
+    Parameters:
+        event (dict): API Gateway event.
+
+    Returns:
+        content_encoding (str): gzip or deflate, None if neither is accepted.
+    """
+    accepted: Dict[str, float] = get_accepted_encodings(event)
+    content_encoding: str or None = None
+    best_quality: float = 0.0
+    for coding in CONTENT_ENCODERS:
+        quality: float = accepted.get(coding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            content_encoding, best_quality = coding, quality
+
+    return content_encoding
+
 
 class HttpResponse(dict):
+    """
+    API Gateway Lambda proxy response with a JSON body.
+
+    ...
+
+    Methods
+    -------
+    compress(event: dict, min_bytes: int, level: int) -> HttpResponse
+        Compresses the body with the content coding the event accepts.
+    """
+
     def __init__(
         self,
         status_code,
-        body: dict or str,
-        headers=DEFAULT_HEADERS,
+        body: dict or list or BaseModel or str or bytes,
+        headers: dict = None,
+        etag: str = None,
     ) -> dict:
         super().__init__()
 
-        if isinstance(body, dict):
-            response: str = json.dumps(body)
-        elif isinstance(body, str):
-            response: str = body
-        else:
-            raise Exception
+        headers = {**DEFAULT_HEADERS, **(headers or {})}
+        if etag:
+            headers["ETag"] = etag
+            headers["Access-Control-Expose-Headers"] = "ETag"
 
         self.update(
             {
                 "statusCode": str(int(status_code)),
                 "headers": headers,
-                "body": response,
+                "body": encode_body(body),
+                "isBase64Encoded": False,
             }
         )
+
+    def compress(
+        self,
+        event: dict,
+        min_bytes: int = COMPRESSION_MIN_BYTES,
+        level: int = COMPRESSION_LEVEL,
+    ) -> "HttpResponse":
+        """
+        Compresses the body with the content coding negotiated from the
+        event's Accept-Encoding header, and returns it base64 encoded for
+        API Gateway to decode. Bodies smaller than min_bytes aren't worth
+        the CPU time and are returned as is, larger bodies get a Vary
+        header whether or not the client accepts a coding. A compressed
+        body's ETag is made weak, it isn't the same bytes as the JSON body.
+
+        Parameters:
+            event (dict): API Gateway event the response answers.
+            min_bytes (int): Smallest body compressed, in bytes.
+            level (int): Compression level, 1 (fastest) to 9 (smallest).
+
+        Returns:
+            HttpResponse (HttpResponse): The response, compressed in place.
+        """
+        headers: dict = self["headers"]
+        if self["isBase64Encoded"] or "Content-Encoding" in headers:
+            return self
+
+        body: bytes = self["body"].encode()
+        if len(body) < min_bytes:
+            return self
+
+        vary: str or None = headers.get("Vary")
+        if not vary:
+            headers["Vary"] = "Accept-Encoding"
+        elif "accept-encoding" not in vary.lower() and vary != "*":
+            headers["Vary"] = f"{vary}, Accept-Encoding"
+
+        content_encoding: str or None = negotiate_content_encoding(event)
+        if not content_encoding:
+            return self
+
+        compressed: bytes = CONTENT_ENCODERS[content_encoding](body, level)
+        if len(compressed) >= len(body):
+            return self
+
+        headers["Content-Encoding"] = content_encoding
+        if headers.get("ETag") and not headers["ETag"].startswith("W/"):
+            headers["ETag"] = f"W/{headers['ETag']}"
+
+        self.update(
+            {
+                "body": b64encode(compressed).decode(),
+                "isBase64Encoded": True,
+            }
+        )
+
+        return self
@@ -0,0 +1,138 @@
+import re
+from typing import Callable, Dict, Iterable, List, Match, Pattern, Tuple
+
+from src.apigateway.exceptions import DuplicateRouteException
+from src.apigateway.responses import HttpResponse
+
+Handler = Callable[[dict, object], HttpResponse]
+Route = Tuple[str, str, Handler]
+
+PATH_PARAMETER_PATTERN: Pattern = re.compile(r"(\{\w+\})")
+
+
+def compile_path_template(template: str, base_path: str = "") -> Pattern:
+    """
+    Compiles an API Gateway resource path template, such as
+    /v1/order/{order_id}, into a regex whose named groups are the
+    path parameters.
+
+    Parameters:
+        template (str): Resource path template.
+        base_path (str): Prefix the requests' paths start with.
+
+    Returns:
+        pattern (Pattern): Regex matching the request paths of the template.
+    """
+    pattern: str = "".join(
+        f"(?P<{part[1:-1]}>[^/]+)" if part.startswith("{") else re.escape(part)
+        for part in PATH_PARAMETER_PATTERN.split(template)
+    )
+
+    return re.compile(f"{re.escape(base_path.rstrip('/'))}{pattern}/?")
+
+
+class Router:
+    """
+    Dispatches API Gateway proxy events to handlers by httpMethod and
+    resource, so a single Lambda can serve every route from one warm pool.
+
+    ...
+
+    Attributes
+    ----------
+    base_path : str
+        Prefix of the request paths, the path of the router's own proxy resource.
+
+    Methods
+    -------
+    add_route(method: str, template: str, handler: Handler) -> None
+        Registers the handler of a method and resource path template.
+
+    dispatch(event: dict, context: object) -> HttpResponse
+        Calls the handler of the event's route.
+    """
+
+    def __init__(
+        self,
+        routes: Iterable[Route] = (),
+        base_path: str = "",
+    ) -> None:
+        self.base_path: str = base_path
+        self._resources: Dict[Tuple[str, str], Handler] = {}
+        self._templates: List[Tuple[Pattern, Dict[str, Handler]]] = []
+        self._template_methods: Dict[str, Dict[str, Handler]] = {}
+
+        for method, template, handler in routes:
+            self.add_route(method, template, handler)
+
+    def add_route(self, method: str, template: str, handler: Handler) -> None:
+        """
+        Registers the handler of a method and resource path template, the
+        template's regex is compiled once here rather than per request.
+
+        Parameters:
+            method (str): HTTP method.
+            template (str): Resource path template, e.g. /v1/order/{order_id}.
+            handler (Handler): Lambda handler, called with the event and context.
+
+        Returns:
+            None
+
+        Raises:
+            DuplicateRouteException: Occurs if the route already has a handler.
+        """
+        route: Tuple[str, str] = (method.upper(), template)
+        if route in self._resources:
+            raise DuplicateRouteException(
+                f"{method.upper()} {template} is already routed."
+            )
+
+        self._resources[route] = handler
+        if template not in self._template_methods:
+            self._template_methods[template] = {}
+            self._templates.append(
+                (
+                    compile_path_template(template, self.base_path),
+                    self._template_methods[template],
+                )
+            )
+        self._template_methods[template][route[0]] = handler
+
+    def dispatch(self, event: dict, context: object) -> HttpResponse:
+        """
+        Calls the handler of the event's route. Events of a resource that is
+        itself a route are looked up by resource, events of the router's
+        proxy resource are matched on their path, and get the path
+        parameters of the matched template.
+
+        Parameters:
+            event (dict): API Gateway event.
+            context (object): Lambda context.
+
+        Returns:
+            HttpResponse (HttpResponse): Response of the handler, 404 or 405.
+        """
+        method: str = (event.get("httpMethod") or "").upper()
+        handler: Handler or None = self._resources.get((method, event.get("resource")))
+        if handler:
+            return handler(event, context)
+
+        path: str = event.get("path") or ""
+        for pattern, methods in self._templates:
+            match: Match or None = pattern.fullmatch(path)
+            if not match:
+                continue
+
+            if method not in methods:
+                return HttpResponse(
+                    status_code=405,
+                    body={"message": "Method not allowed"},
+                    headers={"Allow": ", ".join(sorted(methods))},
+                )
+
+            return methods[method](
+                {**event, "pathParameters": match.groupdict() or None},
+                context,
+            )
+
+        return HttpResponse(status_code=404, body={"message": "Not found"})
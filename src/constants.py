@@ -1,3 +1,42 @@
 import os
 
 TABLE_NAME = os.environ.get("PLNT_EXPRESS_TBL")
+TABLE_KEY_ATTRIBUTES = ("pk", "sk")
+INDEX_KEY_ATTRIBUTES = {
+    "username_index": ("username",),
+    "customer_email_id_index": ("customer_email", "id"),
+    "status_shard_index": ("status_shard", "status_changed"),
+}
+ORDER_STATUS_SHARDS = int(os.environ.get("PLNT_EXPRESS_ORDER_STATUS_SHARDS", "8"))
+
+DYNAMODB_REGION = os.environ.get("PLNT_EXPRESS_DDB_REGION")
+DYNAMODB_MAX_POOL_CONNECTIONS = int(
+    os.environ.get("PLNT_EXPRESS_DDB_MAX_POOL_CONNECTIONS", "10")
+)
+DYNAMODB_CONNECT_TIMEOUT = float(
+    os.environ.get("PLNT_EXPRESS_DDB_CONNECT_TIMEOUT", "2")
+)
+DYNAMODB_READ_TIMEOUT = float(os.environ.get("PLNT_EXPRESS_DDB_READ_TIMEOUT", "5"))
+DYNAMODB_MAX_ATTEMPTS = int(os.environ.get("PLNT_EXPRESS_DDB_MAX_ATTEMPTS", "3"))
+DYNAMODB_TCP_KEEPALIVE = (
+    os.environ.get("PLNT_EXPRESS_DDB_TCP_KEEPALIVE", "true").lower() == "true"
+)
+
+ITEM_CACHE_MAX_SIZE = int(os.environ.get("PLNT_EXPRESS_ITEM_CACHE_MAX_SIZE", "1024"))
+ITEM_CACHE_TTL_SECONDS = float(
+    os.environ.get("PLNT_EXPRESS_ITEM_CACHE_TTL_SECONDS", "60")
+)
+
+EMBEDDED_LINE_ITEMS_MAX = int(
+    os.environ.get("PLNT_EXPRESS_EMBEDDED_LINE_ITEMS_MAX", "0")
+)
+
+ROUTER_BASE_PATH = os.environ.get("PLNT_EXPRESS_ROUTER_BASE_PATH", "")
+MAX_REQUEST_BODY_BYTES = int(
+    os.environ.get("PLNT_EXPRESS_MAX_REQUEST_BODY_BYTES", "262144")
+)
+JSON_ENCODER = os.environ.get("PLNT_EXPRESS_JSON_ENCODER", "auto")
+COMPRESSION_MIN_BYTES = int(
+    os.environ.get("PLNT_EXPRESS_COMPRESSION_MIN_BYTES", "1024")
+)
+COMPRESSION_LEVEL = int(os.environ.get("PLNT_EXPRESS_COMPRESSION_LEVEL", "6"))
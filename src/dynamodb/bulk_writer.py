@@ -0,0 +1,256 @@
+from math import ceil
+from threading import Lock
+from time import monotonic, sleep
+from typing import TYPE_CHECKING, Dict, Iterable, List
+
+import simplejson as json
+from botocore.exceptions import ClientError
+from pydantic import BaseModel
+
+from src.constants import TABLE_KEY_ATTRIBUTES, TABLE_NAME
+from src.dynamodb.connection import get_client
+from src.dynamodb.exceptions import UnprocessedItemsException
+from src.dynamodb.helpers import BATCH_MAX_ATTEMPTS, backoff
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb.client import DynamoDBClient
+
+BATCH_WRITE_ITEM_LIMIT: int = 25
+WRITE_UNIT_BYTES: int = 1024
+
+
+class BulkWriteReport(BaseModel):
+    """
+    Represents the outcome of a bulk write.
+
+    ...
+
+    Attributes
+    ----------
+    items_written : int
+        Number of items written.
+    requests : int
+        Number of BatchWriteItem requests sent, retries included.
+    throttles : int
+        Number of requests that were throttled or left items unprocessed.
+    retried_items : int
+        Number of items that had to be resent.
+    consumed_capacity : float
+        Write capacity units consumed, estimated when DynamoDB doesn't report it.
+    elapsed_seconds : float
+        Wall clock duration of the bulk write.
+
+    Methods
+    -------
+    items_per_second() -> float
+        Returns the write throughput in items per second.
+
+    capacity_per_second() -> float
+        Returns the consumed write capacity units per second.
+    """
+
+    items_written: int = 0
+    requests: int = 0
+    throttles: int = 0
+    retried_items: int = 0
+    consumed_capacity: float = 0
+    elapsed_seconds: float = 0
+
+    @property
+    def items_per_second(self) -> float:
+        """
+        Returns:
+            items_per_second (float): Items written per second.
+        """
+        if not self.elapsed_seconds:
+            return float(self.items_written)
+
+        return self.items_written / self.elapsed_seconds
+
+    @property
+    def capacity_per_second(self) -> float:
+        """
+        Returns:
+            capacity_per_second (float): Write capacity units consumed per second.
+        """
+        if not self.elapsed_seconds:
+            return self.consumed_capacity
+
+        return self.consumed_capacity / self.elapsed_seconds
+
+
+class CapacityBudget:
+    """
+    Token bucket that limits the write capacity units spent per second.
+
+    ...
+
+    Attributes
+    ----------
+    units_per_second : float
+        Write capacity units refilled every second.
+    burst : float
+        Maximum number of units that can be banked.
+
+    Methods
+    -------
+    acquire(units: float) -> None
+        Blocks until the units are available, then spends them.
+    """
+
+    def __init__(
+        self,
+        units_per_second: float,
+        burst: float = None,
+    ) -> None:
+        self.units_per_second: float = units_per_second
+        self.burst: float = max(burst or units_per_second, 1)
+        self._tokens: float = self.burst
+        self._updated: float = monotonic()
+        self._lock: Lock = Lock()
+
+    def acquire(self, units: float) -> None:
+        """
+        Blocks until the requested units are available, then spends them.
+        Requests larger than the burst go into debt, so they are
+        paid back before the next acquire succeeds.
+
+        Parameters:
+            units (float): Write capacity units to spend.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            now: float = monotonic()
+            self._tokens = min(
+                self.burst,
+                self._tokens + (now - self._updated) * self.units_per_second,
+            )
+            self._updated = now
+
+            if self._tokens < min(units, self.burst):
+                wait: float = (min(units, self.burst) - self._tokens) / (
+                    self.units_per_second
+                )
+                sleep(wait)
+                self._tokens += wait * self.units_per_second
+                self._updated = monotonic()
+
+            self._tokens -= units
+
+
+def estimate_write_units(item: dict) -> int:
+    """
+    Estimates the write capacity units a PutItem of the item consumes,
+    1 unit per started KB of serialized item.
+
+    Parameters:
+        item (dict): DynamoDB item.
+
+    Returns:
+        units (int): Estimated write capacity units.
+    """
+    return max(1, ceil(len(json.dumps(item)) / WRITE_UNIT_BYTES))
+
+
+def _write_batch(
+    client: "DynamoDBClient",
+    items: List[dict],
+    table_name: str,
+    budget: CapacityBudget or None,
+    report: BulkWriteReport,
+) -> None:
+    requests: List[dict] = [{"PutRequest": {"Item": item}} for item in items]
+
+    for attempt in range(BATCH_MAX_ATTEMPTS):
+        estimated_units: int = sum(
+            estimate_write_units(request["PutRequest"]["Item"]) for request in requests
+        )
+        if budget:
+            budget.acquire(estimated_units)
+
+        report.requests += 1
+        try:
+            response: dict = client.batch_write_item(
+                RequestItems={table_name: requests},
+                ReturnConsumedCapacity="TOTAL",
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ProvisionedThroughputExceededException":
+                raise
+
+            report.throttles += 1
+            report.retried_items += len(requests)
+            backoff(attempt)
+            continue
+
+        unprocessed: List[dict] = response.get("UnprocessedItems", {}).get(
+            table_name, []
+        )
+        consumed: List[dict] = response.get("ConsumedCapacity") or []
+        if consumed:
+            report.consumed_capacity += sum(
+                capacity.get("CapacityUnits", 0) for capacity in consumed
+            )
+        else:
+            report.consumed_capacity += estimated_units - sum(
+                estimate_write_units(request["PutRequest"]["Item"])
+                for request in unprocessed
+            )
+        report.items_written += len(requests) - len(unprocessed)
+
+        if not unprocessed:
+            return
+
+        report.throttles += 1
+        report.retried_items += len(unprocessed)
+        requests = unprocessed
+        backoff(attempt)
+
+    raise UnprocessedItemsException(f"{len(requests)} items were left unprocessed.")
+
+
+def bulk_write_items(
+    items: Iterable[dict],
+    table_name: str = TABLE_NAME,
+    write_capacity_units: float = None,
+) -> BulkWriteReport:
+    """
+    Saves items to DynamoDB with 25 item BatchWriteItem requests.
+    UnprocessedItems and throttled requests are retried with jittered
+    backoff. When write_capacity_units is set, requests are paced so
+    that the estimated write capacity spent per second stays within it.
+
+    Parameters:
+        items (Iterable[dict]): Items to save, consumed lazily.
+        table_name (str): DynamoDB table to perform batch_write_item operation.
+        write_capacity_units (float): Write capacity budget per second, None for no limit.
+
+    Returns:
+        report (BulkWriteReport): Throughput and throttling of the bulk write.
+
+    Raises:
+        UnprocessedItemsException: Occurs if items remain unprocessed after every retry.
+    """
+    client: DynamoDBClient = get_client()
+    budget: CapacityBudget or None = (
+        CapacityBudget(write_capacity_units) if write_capacity_units else None
+    )
+    report: BulkWriteReport = BulkWriteReport()
+    started: float = monotonic()
+    batch: Dict[tuple, dict] = {}
+
+    for item in items:
+        # BatchWriteItem rejects duplicate keys, the last write wins like put_item.
+        batch[tuple(item[attribute] for attribute in TABLE_KEY_ATTRIBUTES)] = item
+        if len(batch) == BATCH_WRITE_ITEM_LIMIT:
+            _write_batch(client, list(batch.values()), table_name, budget, report)
+            batch = {}
+
+    if batch:
+        _write_batch(client, list(batch.values()), table_name, budget, report)
+
+    report.elapsed_seconds = monotonic() - started
+
+    return report
@@ -0,0 +1,133 @@
+from threading import Lock
+from typing import TYPE_CHECKING, Dict, Tuple
+
+from src.constants import (
+    DYNAMODB_CONNECT_TIMEOUT,
+    DYNAMODB_MAX_ATTEMPTS,
+    DYNAMODB_MAX_POOL_CONNECTIONS,
+    DYNAMODB_READ_TIMEOUT,
+    DYNAMODB_REGION,
+    DYNAMODB_TCP_KEEPALIVE,
+    TABLE_NAME,
+)
+
+if TYPE_CHECKING:
+    from botocore.config import Config
+    from mypy_boto3_dynamodb.client import DynamoDBClient
+    from mypy_boto3_dynamodb.service_resource import DynamoDBServiceResource, _Table
+
+_lock: Lock = Lock()
+_resources: Dict[str or None, "DynamoDBServiceResource"] = {}
+_tables: Dict[Tuple[str, str or None], "_Table"] = {}
+
+
+def _build_config() -> "Config":
+    """
+    Builds the botocore Config shared by every DynamoDB resource.
+
+    Returns:
+        config (Config): Pool size, timeouts, retries and keep-alive settings.
+    """
+    from botocore.config import Config
+
+    options: dict = {
+        "connect_timeout": DYNAMODB_CONNECT_TIMEOUT,
+        "read_timeout": DYNAMODB_READ_TIMEOUT,
+        "max_pool_connections": DYNAMODB_MAX_POOL_CONNECTIONS,
+        "retries": {"max_attempts": DYNAMODB_MAX_ATTEMPTS, "mode": "standard"},
+    }
+    # tcp_keepalive is only understood by newer botocore releases.
+    if "tcp_keepalive" in Config.OPTION_DEFAULTS:
+        options["tcp_keepalive"] = DYNAMODB_TCP_KEEPALIVE
+
+    return Config(**options)
+
+
+def get_resource(
+    region_name: str or None = DYNAMODB_REGION,
+) -> "DynamoDBServiceResource":
+    """
+    Returns the process-wide DynamoDB resource for a region, creating
+    it on first use. The resource's HTTP connection pool is reused by
+    every caller for the life of the process (a warm Lambda container).
+
+    Parameters:
+        region_name (str): AWS region, None uses the default region chain.
+
+    Returns:
+        resource (DynamoDBServiceResource): Shared boto3 DynamoDB resource.
+    """
+    resource: DynamoDBServiceResource = _resources.get(region_name)
+    if resource:
+        return resource
+
+    with _lock:
+        if region_name not in _resources:
+            # Imported on first use, so only invocations that talk to
+            # DynamoDB pay for loading boto3 and botocore.
+            import boto3
+
+            _resources[region_name] = boto3.session.Session().resource(
+                "dynamodb",
+                region_name=region_name,
+                config=_build_config(),
+            )
+
+        return _resources[region_name]
+
+
+def get_client(
+    region_name: str or None = DYNAMODB_REGION,
+) -> "DynamoDBClient":
+    """
+    Returns the low level client of the shared DynamoDB resource.
+    The client accepts plain Python values, and is safe to share
+    between threads.
+
+    Parameters:
+        region_name (str): AWS region, None uses the default region chain.
+
+    Returns:
+        client (DynamoDBClient): Shared boto3 DynamoDB client.
+    """
+    return get_resource(region_name).meta.client
+
+
+def get_table(
+    table_name: str = TABLE_NAME,
+    region_name: str or None = DYNAMODB_REGION,
+) -> "_Table":
+    """
+    Returns the shared Table for a table name and region.
+
+    Parameters:
+        table_name (str): DynamoDB table name.
+        region_name (str): AWS region, None uses the default region chain.
+
+    Returns:
+        table (_Table): Shared boto3 DynamoDB Table.
+    """
+    table_key: Tuple[str, str or None] = (table_name, region_name)
+    table: _Table = _tables.get(table_key)
+    if table:
+        return table
+
+    resource: DynamoDBServiceResource = get_resource(region_name)
+    with _lock:
+        if table_key not in _tables:
+            _tables[table_key] = resource.Table(table_name)
+
+        return _tables[table_key]
+
+
+def reset_connections() -> None:
+    """
+    Drops every cached resource and Table, the next call
+    creates new ones. Used by tests that swap AWS endpoints or mocks.
+
+    Returns:
+        None
+    """
+    with _lock:
+        _tables.clear()
+        _resources.clear()
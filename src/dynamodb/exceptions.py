@@ -0,0 +1,10 @@
+class InvalidCursorException(Exception):
+    """
+    Raised when a pagination cursor cannot be decoded
+    """
+
+
+class UnprocessedItemsException(Exception):
+    """
+    Raised when a batch operation leaves items unprocessed after every retry
+    """
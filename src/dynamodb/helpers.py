@@ -1,29 +1,77 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from concurrent.futures import ThreadPoolExecutor
 from functools import reduce
-from typing import List
+from random import uniform
+from time import sleep
+from typing import TYPE_CHECKING, Dict, Generator, List, Tuple
 
-import boto3
-from boto3.dynamodb.conditions import Attr, Equals, NotEquals, Or
-from mypy_boto3_dynamodb.service_resource import _Table
+import simplejson as json
+
+from src.constants import INDEX_KEY_ATTRIBUTES, TABLE_KEY_ATTRIBUTES, TABLE_NAME
+from src.dynamodb.connection import get_client, get_table
+from src.dynamodb.exceptions import InvalidCursorException, UnprocessedItemsException
+
+if TYPE_CHECKING:
+    from boto3.dynamodb.conditions import Equals
+    from mypy_boto3_dynamodb.client import DynamoDBClient
+    from mypy_boto3_dynamodb.service_resource import _Table
+
+BATCH_GET_ITEM_LIMIT: int = 100
+BATCH_MAX_ATTEMPTS: int = 8
+BACKOFF_BASE_SECONDS: float = 0.05
+BACKOFF_MAX_SECONDS: float = 2.0
+
+
+def projection_parameters(attributes: List[str] or None) -> dict:
+    """
+    Builds the ProjectionExpression parameters that limit a read to
+    the given attributes. Every attribute gets a #placeholder, so
+    reserved words such as state and status can be projected.
+
+    Parameters:
+        attributes (List[str]): Attribute names to return, None for all.
+
+    Returns:
+        parameters (dict): ProjectionExpression and ExpressionAttributeNames, or {}.
+    """
+    if not attributes:
+        return {}
+
+    names: Dict[str, str] = {
+        f"#p{index}": attribute for index, attribute in enumerate(attributes)
+    }
+    return {
+        "ProjectionExpression": ", ".join(names),
+        "ExpressionAttributeNames": names,
+    }
 
-from src.constants import TABLE_NAME
 
 def get_item(
     key: dict,
     table_name: str = TABLE_NAME,
+    consistent_read: bool = False,
+    attributes: List[str] = None,
 ) -> dict or None:
     """
-    Adds an Address to a Customer entity.
+    Retrieves an Item from DynamoDB by key.
 
     Parameters:
         key (dict): Dictionary representation of DynamoDB key.
         table_name (str): DynamoDB table to perform get_item operation.
+        consistent_read (bool): Indicates whether a strongly consistent read is used.
+        attributes (List[str]): Attributes to return, None for the whole item.
 
     Returns:
-        item (dict): Pydantic DynamoAddress model.
+        item (dict): Dictionary of the item, None if it doesn't exist.
 
     """
-    table: _Table = boto3.resource("dynamodb").Table(table_name)
-    return table.get_item(Key=key).get("Item")
+    table: _Table = get_table(table_name)
+    return table.get_item(
+        Key=key,
+        ConsistentRead=consistent_read,
+        **projection_parameters(attributes),
+    ).get("Item")
 
 
 def put_item(
@@ -41,33 +89,303 @@ def put_item(
         None
 
     """
-    table: _Table = boto3.resource("dynamodb").Table(table_name)
+    table: _Table = get_table(table_name)
     table.put_item(Item=item)
 
 
+def encode_cursor(key: dict or None) -> str or None:
+    """
+    Encodes a DynamoDB key into an opaque, url safe cursor.
+
+    Parameters:
+        key (dict): DynamoDB key, usually a LastEvaluatedKey.
+
+    Returns:
+        cursor (str): Opaque cursor, or None when there is no key.
+    """
+    if not key:
+        return None
+
+    return urlsafe_b64encode(json.dumps(key, sort_keys=True).encode()).decode()
+
+
+def decode_cursor(cursor: str or None) -> dict or None:
+    """
+    Decodes a cursor created by encode_cursor back into a DynamoDB key.
+
+    Parameters:
+        cursor (str): Opaque cursor.
+
+    Returns:
+        key (dict): DynamoDB key usable as an ExclusiveStartKey.
+
+    Raises:
+        InvalidCursorException: Occurs if the cursor cannot be decoded.
+    """
+    if not cursor:
+        return None
+
+    try:
+        key: dict = json.loads(urlsafe_b64decode(cursor.encode()), use_decimal=True)
+    except (BinasciiError, UnicodeError, ValueError):
+        raise InvalidCursorException("Unable to decode cursor.")
+
+    if not isinstance(key, dict):
+        raise InvalidCursorException("Unable to decode cursor.")
+
+    return key
+
+
+class QueryIterator:
+    """
+    Lazily iterates over the items of a DynamoDB query, following
+    LastEvaluatedKey from page to page. A page is only requested
+    once the items of the previous page have been consumed.
+
+    ...
+
+    Attributes
+    ----------
+    cursor : str
+        Opaque cursor positioned after the last yielded item,
+        None once the query is exhausted.
+    pages : int
+        Number of query requests made so far.
+
+    Methods
+    -------
+    __iter__() -> QueryIterator
+        Returns the iterator itself.
+
+    __next__() -> dict
+        Returns the next item, requesting the next page if needed.
+    """
+
+    def __init__(
+        self,
+        key_condition_expression: "Equals",
+        index_name: str = None,
+        table_name: str = TABLE_NAME,
+        limit: int = None,
+        page_size: int = None,
+        scan_index_forward: bool = True,
+        exclusive_start_key: dict = None,
+        cursor: str = None,
+        attributes: List[str] = None,
+    ) -> None:
+        """
+        Parameters:
+            key_condition_expression (Equals): DynamoDB Condition utilized for query.
+            index_name (str): Name of index to query.
+            table_name (str): DynamoDB table to perform query operation.
+            limit (int): Maximum number of items to yield in total.
+            page_size (int): Maximum number of items requested per page.
+            scan_index_forward (bool): False returns items in descending sort key order.
+            exclusive_start_key (dict): DynamoDB key to start after.
+            cursor (str): Opaque cursor to start after, see encode_cursor.
+            attributes (List[str]): Attributes to return, None for whole items.
+                Key attributes are always returned, so cursors keep working.
+        """
+        self._table_name: str = table_name
+        self._limit: int = limit
+        self._page_size: int = page_size
+        self._options: dict = {
+            "KeyConditionExpression": key_condition_expression,
+            "ScanIndexForward": scan_index_forward,
+        }
+        if index_name:
+            self._options["IndexName"] = index_name
+
+        self._key_attributes: Tuple[str] = tuple(
+            dict.fromkeys(
+                TABLE_KEY_ATTRIBUTES + INDEX_KEY_ATTRIBUTES.get(index_name, ())
+            )
+        )
+        if attributes:
+            self._options.update(
+                projection_parameters(
+                    list(dict.fromkeys([*attributes, *self._key_attributes]))
+                )
+            )
+        self._last_key: dict = exclusive_start_key or decode_cursor(cursor)
+        self._items: Generator[dict, None, None] = self._iterate()
+        self.pages: int = 0
+
+    def __iter__(self) -> "QueryIterator":
+        return self
+
+    def __next__(self) -> dict:
+        return next(self._items)
+
+    @property
+    def cursor(self) -> str or None:
+        """
+        Returns:
+            cursor (str): Opaque cursor to resume the query after the
+            last yielded item, None once the query is exhausted.
+        """
+        return encode_cursor(self._last_key)
+
+    def _iterate(self) -> Generator[dict, None, None]:
+        table: _Table = get_table(self._table_name)
+        start_key: dict = self._last_key
+        yielded: int = 0
+
+        while True:
+            options: dict = dict(self._options)
+            if start_key:
+                options["ExclusiveStartKey"] = start_key
+
+            page_limit: int = self._page_size
+            if self._limit:
+                remaining: int = self._limit - yielded
+                page_limit = min(page_limit or remaining, remaining)
+            if page_limit:
+                options["Limit"] = page_limit
+
+            response: dict = table.query(**options)
+            self.pages += 1
+            items: List[dict] = response.get("Items", [])
+            start_key = response.get("LastEvaluatedKey")
+
+            for index, item in enumerate(items):
+                is_last: bool = not start_key and index == len(items) - 1
+                self._last_key = None if is_last else self._key_of(item)
+                yielded += 1
+                yield item
+
+                if self._limit and yielded >= self._limit:
+                    return
+
+            if not start_key:
+                self._last_key = None
+                return
+
+    def _key_of(self, item: dict) -> dict:
+        return {
+            attribute: item[attribute]
+            for attribute in self._key_attributes
+            if attribute in item
+        }
+
+
 def query_by_key_condition_expression(
-    key_condition_expression: Equals,
+    key_condition_expression: "Equals",
     index_name: str = None,
     table_name: str = TABLE_NAME,
+    limit: int = None,
+    scan_index_forward: bool = True,
+    attributes: List[str] = None,
 ) -> List[dict]:
     """
-    Retrieves a list of Dictionary that represents DynamoDB items.
+    Retrieves a list of Dictionary that represents DynamoDB items,
+    following every page of the query.
 
     Parameters:
         key_condition_expression (Equals): DynamoDB Condition utilized for query.
         index_name (str) : Name of index to query
         table_name (str): DynamoDB table to perform query operation.
+        limit (int): Maximum number of items to return.
+        scan_index_forward (bool): False returns items in descending sort key order.
+        attributes (List[str]): Attributes to return along the key attributes, None for whole items.
 
     Returns:
-        None
+        items (List[dict]): Queried DynamoDB items.
+
+    """
+    return list(
+        QueryIterator(
+            key_condition_expression=key_condition_expression,
+            index_name=index_name,
+            table_name=table_name,
+            limit=limit,
+            scan_index_forward=scan_index_forward,
+            attributes=attributes,
+        )
+    )
+
 
+def backoff(attempt: int) -> None:
     """
-    table: _Table = boto3.resource("dynamodb").Table(table_name)
+    Sleeps with full jitter exponential backoff before a retry.
 
-    options: dict = {
-        "KeyConditionExpression": key_condition_expression,
+    Parameters:
+        attempt (int): Zero based number of the retry.
+
+    Returns:
+        None
+    """
+    sleep(uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2**attempt)))
+
+
+def _key_id(key: dict) -> tuple:
+    return tuple(key[attribute] for attribute in TABLE_KEY_ATTRIBUTES)
+
+
+def _batch_get_chunk(
+    keys: List[dict],
+    table_name: str,
+    consistent_read: bool,
+) -> List[dict]:
+    client: DynamoDBClient = get_client()
+    items: List[dict] = []
+    request: dict = {
+        table_name: {"Keys": keys, "ConsistentRead": consistent_read},
     }
-    if index_name:
-        options["IndexName"] = index_name
 
-    return table.query(**options).get("Items", [])
+    for attempt in range(BATCH_MAX_ATTEMPTS):
+        response: dict = client.batch_get_item(RequestItems=request)
+        items.extend(response.get("Responses", {}).get(table_name, []))
+        request = response.get("UnprocessedKeys")
+        if not request:
+            return items
+
+        backoff(attempt)
+
+    raise UnprocessedItemsException(
+        f"{len(request[table_name]['Keys'])} keys were left unprocessed."
+    )
+
+
+def batch_get_items(
+    keys: List[dict],
+    table_name: str = TABLE_NAME,
+    consistent_read: bool = False,
+    max_workers: int = 1,
+) -> List[dict or None]:
+    """
+    Retrieves many items with BatchGetItem. Keys are deduplicated and
+    sent in chunks of 100, UnprocessedKeys are retried with backoff.
+
+    Parameters:
+        keys (List[dict]): Dictionary representations of DynamoDB keys.
+        table_name (str): DynamoDB table to perform batch_get_item operation.
+        consistent_read (bool): Indicates whether strongly consistent reads are used.
+        max_workers (int): Number of chunks requested concurrently.
+
+    Returns:
+        items (List[dict]): Items in the order of keys, None where an item is missing.
+
+    Raises:
+        UnprocessedItemsException: Occurs if keys remain unprocessed after every retry.
+    """
+    unique_keys: List[dict] = list(
+        {_key_id(key): key for key in keys}.values(),
+    )
+    chunks: List[List[dict]] = [
+        unique_keys[index : index + BATCH_GET_ITEM_LIMIT]
+        for index in range(0, len(unique_keys), BATCH_GET_ITEM_LIMIT)
+    ]
+
+    def get_chunk(chunk: List[dict]) -> List[dict]:
+        return _batch_get_chunk(chunk, table_name, consistent_read)
+
+    if max_workers > 1 and len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pages: List[List[dict]] = list(executor.map(get_chunk, chunks))
+    else:
+        pages: List[List[dict]] = [get_chunk(chunk) for chunk in chunks]
+
+    found: Dict[tuple, dict] = {_key_id(item): item for page in pages for item in page}
+
+    return [found.get(_key_id(key)) for key in keys]
@@ -1,45 +1,67 @@
-from typing import List
+from typing import TYPE_CHECKING, List
 
 import simplejson as json
+from pydantic import ValidationError
 
-from src.apigateway.decorators import (
-    http_get_pk_sk_from_path_request,
-    http_post_request,
+from src.apigateway.decorators import http_compressed_response, http_post_request
+from src.apigateway.exceptions import (
+    InvalidRequestBodyException,
+    RequestBodyTooLargeException,
 )
+from src.apigateway.requests import get_fields, get_if_none_match, get_json_body
 from src.apigateway.responses import HttpResponse
-from src.models import (
-    Customer,
-    DynamoAddress,
-    DynamoOrder,
-    Order,
-    OrderStatus,
-)
+from src.apigateway.router import Router
+from src.constants import ROUTER_BASE_PATH
+from src.dynamodb.exceptions import InvalidCursorException
+from src.models.address import DynamoAddress
+from src.models.customer import Customer
+from src.models.order import DeliveryAddress, DynamoOrder, Order
 from src.schemas.address import NewAddressSchema
 from src.schemas.customer import NewCustomerSchema
-from src.schemas.line_item import NewLineItemSchema
-from src.schemas.order import NewOrderSchema
-from src.services.customer_service import CustomerService
-from src.services.exceptions import CreateCustomerException, CustomerLookupException
-from src.services.order_service import OrderService
+from src.schemas.line_item import NewLineItemSchema, NewLineItemsSchema
+from src.schemas.order import (
+    ListOrdersSchema,
+    NewOrderSchema,
+    OrderListSchema,
+    TransitionOrdersSchema,
+    UpdateOrderSchema,
+)
+from src.services.exceptions import (
+    AddLineItemException,
+    CreateCustomerException,
+    CustomerLookupException,
+    InvalidFieldsException,
+    OrderLookupException,
+    OrderStatusException,
+)
+
+# Every Lambda imports this module, the services (and with them boto3
+# and ksuid) are imported by the handlers that use them, on first call.
+if TYPE_CHECKING:
+    from src.services.customer_service import CustomerService
+    from src.services.order_service import BulkTransitionReport, OrderService
 
 
+@http_compressed_response
 @http_post_request(schema=NewCustomerSchema)
 def http_create_customer(
-    new_customer_data: dict,
+    new_customer: NewCustomerSchema,
 ) -> HttpResponse:
     """
-    Accepts a Dictionary formatted in the NewCustomerSchema.
+    Accepts a validated NewCustomerSchema.
 
         Parameters:
-            new_customer_data (dict): Dictionary dump of NewCustomerSchema Pydantic Model.
+            new_customer (NewCustomerSchema): Validated NewCustomerSchema Pydantic Model.
 
         Returns:
             HttpResponse (HttpResponse): Response of 201 for newly created customer.
 
     """
+    from src.services.customer_service import CustomerService
+
     customer_client: CustomerService = CustomerService()
     try:
-        customer: Customer = customer_client.create_customer(new_customer_data)
+        customer: Customer = customer_client.create_customer(new_customer)
     except CreateCustomerException:
         return HttpResponse(
             status_code=422,
@@ -50,20 +72,21 @@ def http_create_customer(
 
     return HttpResponse(
         status_code=201,
-        body=customer.json(),
+        body=customer,
     )
 
 
+@http_compressed_response
 @http_post_request(schema=NewAddressSchema)
 def http_add_address_to_customer(
-    new_address_data: dict,
+    new_address: NewAddressSchema,
     username: str,
 ) -> HttpResponse:
     """
-    Accepts a Dictionary formatted in the NewAddressSchema.
+    Accepts a validated NewAddressSchema.
 
         Parameters:
-            new_address_data (dict): Dictionary dump of NewAddressSchema Pydantic Model.
+            new_address (NewAddressSchema): Validated NewAddressSchema Pydantic Model.
 
         Returns:
             HttpResponse (HttpResponse): Response of 201 for newly created address.
@@ -71,114 +94,364 @@ def http_add_address_to_customer(
         Raises:
             CustomerLookupException
     """
+    from src.services.customer_service import CustomerService
+
     try:
         customer_client: CustomerService = CustomerService()
         address: DynamoAddress = customer_client.add_customer_address(
             username=username,
-            new_address_data=new_address_data,
+            new_address_data=new_address,
         )
     except CustomerLookupException:
         return HttpResponse(status_code=404, body={"message": "Customer not found"})
 
-    return HttpResponse(status_code=201, body=address.json())
+    return HttpResponse(status_code=201, body=address)
 
 
-@http_post_request(schema=NewOrderSchema)
-def http_create_order(
-    new_order_data: dict,
+@http_compressed_response
+def http_list_customer_orders(
+    event: dict,
+    context: object,
 ) -> HttpResponse:
     """
-    Accepts a Dictionary formatted in the NewOrderSchema.
+    Returns a page of a Customer's Orders, newest first. The limit,
+    cursor, created_after, created_before and newest_first query string
+    parameters are validated with the ListOrdersSchema.
 
         Parameters:
-            new_order_data (dict): Dictionary dump of NewOrderSchema Pydantic Model.
+            event (dict): API Gateway event.
+            context (object): Lambda context.
 
         Returns:
-            HttpResponse (HttpResponse): Response of 201 for newly created Order.
+            HttpResponse (HttpResponse): Response of 200, 404 or 422.
 
         Raises:
             CustomerLookupException
+            InvalidCursorException
     """
+    from src.services.customer_service import CustomerService
+    from src.services.order_service import OrderService
+
     try:
-        customer_client: CustomerService = CustomerService()
-        customer_items: List[dict] = customer_client.get_customer_items_by_email(
-            new_order_data["customer_email"]
+        parameters: ListOrdersSchema = ListOrdersSchema(
+            **(event.get("queryStringParameters") or {})
+        )
+    except ValidationError as e:
+        return HttpResponse(status_code=422, body=json.dumps(e.errors()))
+
+    try:
+        email: str = CustomerService().get_customer_email_by_username(
+            event["pathParameters"]["username"]
         )
     except CustomerLookupException:
-        return HttpResponse(status_code=422, body={"message": "Customer not found."})
-
-    delivery_address: dict = next(
-        (
-            item
-            for item in customer_items
-            if item.get("id") == new_order_data["delivery_address_id"]
-        ),
-        None,
+        return HttpResponse(status_code=404, body={"message": "Customer not found"})
+
+    try:
+        orders, cursor = OrderService().list_orders_for_customer(
+            email=email,
+            **parameters.dict(),
+        )
+    except InvalidCursorException:
+        return HttpResponse(status_code=422, body={"message": "Invalid cursor"})
+
+    return HttpResponse(
+        status_code=200,
+        body=OrderListSchema(orders=orders, cursor=cursor),
+    )
+
+
+@http_compressed_response
+@http_post_request(schema=NewOrderSchema)
+def http_create_order(
+    new_order: NewOrderSchema,
+) -> HttpResponse:
+    """
+    Accepts a validated NewOrderSchema.
+
+        Parameters:
+            new_order (NewOrderSchema): Validated NewOrderSchema Pydantic Model.
+
+        Returns:
+            HttpResponse (HttpResponse): Response of 201 for newly created Order.
+
+        Raises:
+            CustomerLookupException
+    """
+    from src.services.customer_service import CustomerService
+    from src.services.order_service import OrderService
+
+    customer_client: CustomerService = CustomerService()
+    delivery_address: dict or None = customer_client.get_customer_address(
+        email=new_order.customer_email,
+        address_id=new_order.delivery_address_id,
+        attributes=list(DeliveryAddress.__fields__),
     )
 
     if not delivery_address:
-        return HttpResponse(422, body={"message": "Invalid delivery_address_id"})
+        try:
+            customer_client.get_customer_items_by_email(
+                new_order.customer_email,
+                limit=1,
+            )
+        except CustomerLookupException:
+            return HttpResponse(
+                status_code=422, body={"message": "Customer not found."}
+            )
 
-    new_order_data["delivery_address"] = delivery_address
-    new_order_data["status"] = OrderStatus.NEW
+        return HttpResponse(422, body={"message": "Invalid delivery_address_id"})
 
     order_client: OrderService = OrderService()
-    order: DynamoOrder = order_client.create_order(new_order_data)
+    order: DynamoOrder = order_client.create_order(
+        new_order,
+        delivery_address=delivery_address,
+    )
 
-    return HttpResponse(status_code=201, body=order.json())
+    return HttpResponse(status_code=201, body=order)
 
 
-@http_get_pk_sk_from_path_request(
-    entity_service=OrderService,
-    pk_path_parameter="order_id",
-    get_item_method="get_domain_order_by_key",
-    model=DynamoOrder,
-)
+@http_compressed_response
 def http_get_domain_order(
-    order: Order,
+    event: dict,
+    context: object,
+) -> HttpResponse:
+    """
+    Returns a Domain Order by the order_id path parameter. The Order's
+    ETag is read first with a projected GetItem, so requests with a
+    matching If-None-Match header get a 304 without loading LineItems.
+    A fields query string parameter limits the response, and the read,
+    to the listed fields.
+
+        Parameters:
+            event (dict): API Gateway event.
+            context (object): Lambda context.
+
+        Returns:
+            HttpResponse (HttpResponse): Response of 200, 304, 404 or 422.
+
+    """
+    from src.services.order_service import OrderService
+
+    order_id: str = event["pathParameters"]["order_id"]
+    order_client: OrderService = OrderService()
+
+    fields: List[str] = get_fields(event)
+    if fields:
+        try:
+            order_fields: dict = order_client.get_domain_order_fields(order_id, fields)
+        except InvalidFieldsException as e:
+            return HttpResponse(status_code=422, body={"message": str(e)})
+
+        if not order_fields:
+            return HttpResponse(status_code=404, body={"message": "Order not found"})
+
+        return HttpResponse(status_code=200, body=order_fields)
+
+    etag: str or None = order_client.get_domain_order_etag(order_id)
+    if not etag:
+        return HttpResponse(status_code=404, body={"message": "Order not found"})
+
+    if_none_match: List[str] = get_if_none_match(event)
+    if etag in if_none_match or "*" in if_none_match:
+        return HttpResponse(status_code=304, body="", etag=etag)
+
+    order, etag = order_client.get_domain_order_by_etag(order_id, etag)
+    if not order:
+        return HttpResponse(status_code=404, body={"message": "Order not found"})
+
+    return HttpResponse(
+        status_code=200,
+        body=order,
+        etag=etag,
+    )
+
+
+@http_compressed_response
+def http_update_order(
+    event: dict,
+    context: object,
 ) -> HttpResponse:
     """
-    Accepts a Domain Order Pydantic Model.
+    Partially updates an Order by the order_id path parameter. Only the
+    fields in the body, validated with the UpdateOrderSchema, are
+    written, without reading the Order first.
 
         Parameters:
-            new_order_data (dict): Dictionary dump of NewOrderSchema Pydantic Model.
+            event (dict): API Gateway event.
+            context (object): Lambda context.
 
         Returns:
-            HttpResponse (HttpResponse): Response of 200 for retrieved Order.
+            HttpResponse (HttpResponse): Response of 200, 400, 404, 409, 413 or 422.
 
+        Raises:
+            OrderLookupException
+            OrderStatusException
     """
+    from src.services.order_service import OrderService, calculate_order_etag
+
+    try:
+        update: UpdateOrderSchema = UpdateOrderSchema(**get_json_body(event))
+    except RequestBodyTooLargeException as e:
+        return HttpResponse(status_code=413, body={"message": str(e)})
+    except InvalidRequestBodyException as e:
+        return HttpResponse(status_code=400, body={"message": str(e)})
+    except ValidationError as e:
+        return HttpResponse(status_code=422, body=json.dumps(e.errors()))
+
+    order: DynamoOrder = DynamoOrder.construct(id=event["pathParameters"]["order_id"])
+    for field in update.__fields_set__:
+        if getattr(update, field) is not None:
+            setattr(order, field, getattr(update, field))
+
+    try:
+        order = OrderService().update_order(order)
+    except OrderLookupException:
+        return HttpResponse(status_code=404, body={"message": "Order not found"})
+    except OrderStatusException as e:
+        return HttpResponse(status_code=409, body={"message": str(e)})
+
     return HttpResponse(
         status_code=200,
-        body=order.json(),
+        body=order,
+        etag=calculate_order_etag(order.item),
+    )
+
+
+@http_compressed_response
+@http_post_request(schema=TransitionOrdersSchema)
+def http_transition_orders(
+    transition: TransitionOrdersSchema,
+) -> HttpResponse:
+    """
+    Accepts a validated TransitionOrdersSchema, and moves every
+    listed Order to its status. Orders that can't move are
+    reported in the body rather than failing the request.
+
+        Parameters:
+            transition (TransitionOrdersSchema): Validated TransitionOrdersSchema Pydantic Model.
+
+        Returns:
+            HttpResponse (HttpResponse): Response of 200 with the outcome of each Order.
+    """
+    from src.services.order_service import OrderService
+
+    report: BulkTransitionReport = OrderService().transition_orders_status(
+        ids=transition.order_ids,
+        status=transition.status,
     )
 
+    return HttpResponse(status_code=200, body=report)
+
 
+@http_compressed_response
 @http_post_request(schema=NewLineItemSchema)
 def http_add_line_item(
-    new_line_item_data: dict,
+    new_line_item: NewLineItemSchema,
     order_id: str,
 ) -> HttpResponse:
     """
-    Accepts a Dictionary formatted in the NewLineItemSchema, and related order_id.
+    Accepts a validated NewLineItemSchema, and related order_id.
 
         Parameters:
             order-id (str): Id of the order to add a LineItem to.
-            new_order_data (dict): Dictionary dump of NewLineItemSchema Pydantic Model.
+            new_line_item (NewLineItemSchema): Validated NewLineItemSchema Pydantic Model.
 
         Returns:
             HttpResponse (HttpResponse): Response of 201 for newly created LineItem.
 
         Raises:
-            CustomerLookupException
+            AddLineItemException
+            OrderLookupException
     """
+    from src.services.order_service import OrderService
+
     order_client: OrderService = OrderService()
-    new_line_item_data["order_id"] = order_id
-    line_item: dict = order_client.add_line_item_to_order(
-        order_key=DynamoOrder.calculate_key(order_id),
-        new_line_item_data=new_line_item_data,
+    try:
+        line_item: dict = order_client.add_line_item_to_order(
+            order_key=DynamoOrder.calculate_key(order_id),
+            new_line_item_data=new_line_item,
+        )
+    except OrderLookupException:
+        return HttpResponse(status_code=404, body={"message": "Order not found"})
+    except AddLineItemException:
+        return HttpResponse(
+            status_code=409,
+            body={"message": "Unable to add line item."},
+        )
+
+    return HttpResponse(
+        status_code=201,
+        body=line_item,
     )
 
+
+@http_compressed_response
+@http_post_request(schema=NewLineItemsSchema)
+def http_add_line_items(
+    new_line_items: NewLineItemsSchema,
+    order_id: str,
+) -> HttpResponse:
+    """
+    Accepts a validated NewLineItemsSchema, and related order_id.
+
+        Parameters:
+            order_id (str): Id of the order to add the LineItems to.
+            new_line_items (NewLineItemsSchema): Validated NewLineItemsSchema Pydantic Model.
+
+        Returns:
+            HttpResponse (HttpResponse): Response of 201 for newly created LineItems.
+
+        Raises:
+            AddLineItemException
+            OrderLookupException
+    """
+    from src.services.order_service import OrderService
+
+    order_client: OrderService = OrderService()
+    try:
+        line_items: List[dict] = order_client.add_line_items_to_order(
+            order_key=DynamoOrder.calculate_key(order_id),
+            new_line_items_data=new_line_items.line_items,
+        )
+    except OrderLookupException:
+        return HttpResponse(status_code=404, body={"message": "Order not found"})
+    except AddLineItemException as e:
+        return HttpResponse(status_code=409, body={"message": str(e)})
+
     return HttpResponse(
         status_code=201,
-        body=json.dumps(line_item),
+        body={"line_items": line_items},
     )
+
+
+ROUTER: Router = Router(
+    [
+        ("POST", "/v1/customer", http_create_customer),
+        ("POST", "/v1/customer/{username}/address", http_add_address_to_customer),
+        ("GET", "/v1/customer/{username}/orders", http_list_customer_orders),
+        ("POST", "/v1/order", http_create_order),
+        ("GET", "/v1/order/{order_id}", http_get_domain_order),
+        ("PATCH", "/v1/order/{order_id}", http_update_order),
+        ("POST", "/v1/order/{order_id}/line_item", http_add_line_item),
+        ("POST", "/v1/order/{order_id}/line_items", http_add_line_items),
+        ("POST", "/v1/orders/status", http_transition_orders),
+    ],
+    base_path=ROUTER_BASE_PATH,
+)
+
+
+def http_router(
+    event: dict,
+    context: object,
+) -> HttpResponse:
+    """
+    Single entry point for every route, deployed beside the per-route
+    functions, so one warm pool of containers serves all of them.
+
+        Parameters:
+            event (dict): API Gateway event.
+            context (object): Lambda context.
+
+        Returns:
+            HttpResponse (HttpResponse): Response of the routed handler, 404 or 405.
+    """
+    return ROUTER.dispatch(event, context)
@@ -1,4 +1,30 @@
-from src.models.address import *
-from src.models.customer import *
-from src.models.order import *
-from src.models.line_item import *
+from importlib import import_module
+from typing import Dict
+
+# Models are imported on first access, so a Lambda only pays for the
+# modules (and validators) its handler actually uses.
+_MODEL_MODULES: Dict[str, str] = {
+    "AddressType": "src.models.address",
+    "Address": "src.models.address",
+    "DynamoAddress": "src.models.address",
+    "Customer": "src.models.customer",
+    "Username": "src.models.customer",
+    "OrderStatus": "src.models.order",
+    "DeliveryAddress": "src.models.order",
+    "DynamoOrder": "src.models.order",
+    "Order": "src.models.order",
+    "LineItem": "src.models.line_item",
+}
+
+__all__ = list(_MODEL_MODULES)
+
+
+def __getattr__(name: str) -> object:
+    if name not in _MODEL_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    return getattr(import_module(_MODEL_MODULES[name]), name)
+
+
+def __dir__() -> list:
+    return sorted(list(globals()) + __all__)
@@ -1,9 +1,8 @@
 from datetime import datetime
 from enum import Enum
 
-from pydantic import EmailStr
-
 from src.models.base_model import DynamoItem
+from src.models.types import EmailStr
 
 
 class AddressType(str, Enum):
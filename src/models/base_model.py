@@ -1,5 +1,9 @@
-import simplejson as json
-from pydantic import BaseModel
+from typing import FrozenSet, Set
+
+from pydantic import BaseModel, PrivateAttr
+
+from src.models.encoders import json_encoder
+from src.models.serialization import get_loader, get_serializer, to_dynamo_value
 
 
 class DynamoItem(BaseModel):
@@ -7,6 +11,8 @@ class DynamoItem(BaseModel):
     _PK_FIELD: str
     _SK_ENTITY: str
     _SK_FIELD: str
+    _dirty_fields: Set[str] = PrivateAttr(default_factory=set)
+    _json: str = PrivateAttr(default=None)
 
     """
     Represents a DynamoItem
@@ -23,10 +29,29 @@ class DynamoItem(BaseModel):
         Entity name of the Sort Key.
     _SK_FIELD: str
         Field with a value used to form the Sort Key.
+    _dirty_fields : Set[str]
+        Fields assigned since the model was built or marked clean.
+    _json : str
+        JSON document of the fields cached_json built, kept until a field is assigned.
 
 
     Methods
     -------
+    cached_json() -> str:
+        Returns the JSON document of the fields, reused until a field is assigned.
+
+    changes() -> dict:
+        Returns the DynamoDB ready values of the dirty fields.
+
+    copy(**kwargs) -> DynamoItem:
+        Returns a copy of the model, with its own dirty fields.
+
+    dirty_fields() -> FrozenSet[str]:
+        Returns the fields assigned since the model was built.
+
+    mark_clean() -> None:
+        Forgets the dirty fields, once they are saved.
+
     entity() -> str:
         Returns the model's calculated entity.
 
@@ -43,8 +68,67 @@ class DynamoItem(BaseModel):
     -------
     calculate_key(pk_value: str, sk_value: str) -> dict:
         Accepts two values and returns a calculated DynamoDB key.
+
+    from_item(item: dict) -> DynamoItem:
+        Builds the model from a stored item without revalidating it.
+
+    from_schema(schema: BaseModel or dict, **values) -> DynamoItem:
+        Builds the model from a validated request schema without revalidating it.
     """
 
+    def copy(self, **kwargs: object) -> "DynamoItem":
+        """
+        Returns a copy of the model, see pydantic's copy. The copy
+        encodes its document again, its fields may differ from the
+        model's. It tracks its own dirty fields: the model's, and those set with
+        update.
+
+        Returns:
+            copy (DynamoItem): Copy of the model.
+        """
+        copy: DynamoItem = super().copy(**kwargs)
+        copy._json = None
+        copy._dirty_fields = {
+            *self._dirty_fields,
+            *(name for name in kwargs.get("update") or {} if name in self.__fields__),
+        }
+
+        return copy
+
+    def __setattr__(self, name: str, value: object) -> None:
+        super().__setattr__(name, value)
+        if name in self.__fields__:
+            self._dirty_fields.add(name)
+            self._json = None
+
+    @property
+    def dirty_fields(self) -> FrozenSet[str]:
+        """
+        Returns:
+            dirty_fields (FrozenSet[str]): Fields assigned since the model was built or marked clean.
+        """
+        return frozenset(self._dirty_fields)
+
+    @property
+    def changes(self) -> dict:
+        """
+        Returns:
+            changes (dict): DynamoDB ready values of the dirty fields, None for a removed value.
+        """
+        return {
+            name: to_dynamo_value(getattr(self, name))
+            for name in sorted(self._dirty_fields)
+        }
+
+    def mark_clean(self) -> None:
+        """
+        Forgets the dirty fields, once their values are saved.
+
+        Returns:
+            None
+        """
+        self._dirty_fields.clear()
+
     @property
     def entity(self) -> str:
         """
@@ -100,15 +184,32 @@ class DynamoItem(BaseModel):
         Returns:
             item (dict) : Saveable DynamoDB Dictionary
         """
-        item: dict = json.loads(self.json())
-        if not item:
+        values: dict = get_serializer(type(self))(self)
+        if not values:
             raise Exception
 
-        item["pk"] = self.pk
-        item["sk"] = self.sk
-        item["entity"] = self.entity
+        return {
+            **values,
+            "pk": self.pk,
+            "sk": self.sk,
+            "entity": self.entity,
+        }
+
+    def cached_json(self) -> str:
+        """
+        Returns the JSON document of the model's fields, encoded with
+        the fastest installed JSON backend and reused until a field is
+        assigned. Changes made in place to nested models and lists
+        aren't seen, so it's only used for models that are done
+        changing, such as response bodies.
+
+        Returns:
+            document (str): JSON document of the fields.
+        """
+        if self._json is None:
+            self._json = json_encoder.dumps(get_serializer(type(self))(self))
 
-        return item
+        return self._json
 
     @classmethod
     def calculate_key(
@@ -135,3 +236,46 @@ class DynamoItem(BaseModel):
         if sk_value is None:
             raise Exception("SK value is required to calculate key on this Item.")
         return {"pk": pk, "sk": f"{cls._SK_ENTITY}#{str(sk_value)}"}
+
+    @classmethod
+    def from_item(
+        cls,
+        item: dict,
+    ) -> "DynamoItem":
+        """
+        Builds the model from an item loaded from DynamoDB, which was
+        validated when it was saved. Each field is converted to its type
+        without running pydantic validation, so it must only be used
+        with items written by this service.
+
+        Arguments:
+            item (dict): DynamoDB item.
+
+        Returns:
+            model (DynamoItem) : Instantiated model.
+        """
+        return get_loader(cls)(item)
+
+    @classmethod
+    def from_schema(
+        cls,
+        schema: BaseModel or dict,
+        **values: object,
+    ) -> "DynamoItem":
+        """
+        Builds the model from a request schema, plus the values the
+        service adds. A schema was already validated when the request was
+        parsed, so its fields are converted like a stored item's instead
+        of being validated a second time. A dictionary is validated.
+
+        Arguments:
+            schema (BaseModel or dict): Validated request schema, or a dictionary of its data.
+            values (object): Fields set by the service, such as ids and timestamps.
+
+        Returns:
+            model (DynamoItem) : Instantiated model.
+        """
+        if isinstance(schema, BaseModel):
+            return get_loader(cls)({**schema.__dict__, **values})
+
+        return cls(**{**schema, **values})
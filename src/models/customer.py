@@ -1,7 +1,7 @@
 from datetime import date
 
-from pydantic import EmailStr
 from src.models.base_model import DynamoItem
+from src.models.types import EmailStr
 
 
 class Customer(DynamoItem):
@@ -62,3 +62,50 @@ class Customer(DynamoItem):
     first_name: str
     last_name: str
     username: str
+
+
+class Username(DynamoItem):
+    """
+    Represents a Username, a sentinel item that reserves a username
+    and maps it to the email of the Customer that holds it.
+
+    ...
+
+    Attributes
+    ----------
+    _PK_ENTITY : str
+        Entity name of the Partition Key.
+    _PK_FIELD : str
+        Field with a value used to form a Partition Key.
+
+    email : EmailStr
+        Email of the Customer that holds the username.
+    name : str
+        The username.
+
+    Methods
+    -------
+    entity() -> str:
+        Returns the model's calculated entity.
+
+    key() -> str:
+        Returns the calculated key of the model.
+
+    pk() -> str:
+        Returns the calculated Partition Key.
+
+    sk() -> str:
+        Returns the calcualted Sort Key.
+
+    Class Methods
+    -------
+    calculate_key(pk_value: str) -> dict:
+        Accepts a username and returns a calculated DynamoDB key.
+    """
+
+    _PK_ENTITY: str = "Username"
+    _PK_FIELD: str = "name"
+    _SK_ENTITY: str = None
+
+    email: EmailStr
+    name: str
@@ -0,0 +1,132 @@
+from decimal import Decimal
+from typing import Dict, Type
+
+import simplejson
+
+from src.constants import JSON_ENCODER
+from src.models.serialization import to_dynamo_value
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+
+def _default(value: object) -> object:
+    """
+    Converts values the JSON backends don't know, such as models,
+    datetimes and enums, the same way they are converted for DynamoDB.
+    """
+    return to_dynamo_value(value)
+
+
+class JsonEncoder:
+    """
+    Encodes DynamoDB ready values, models and API responses as JSON with
+    simplejson, which writes Decimals read from DynamoDB exactly, without
+    a round trip through float.
+
+    ...
+
+    Attributes
+    ----------
+    name : str
+        Name of the backend.
+
+    Methods
+    -------
+    dumps(value: object) -> str
+        Returns the JSON document of a value.
+    """
+
+    name: str = "simplejson"
+
+    def dumps(self, value: object) -> str:
+        """
+        Parameters:
+            value (object): Value to encode, Decimals are written as exact numbers.
+
+        Returns:
+            document (str): JSON document.
+        """
+        return simplejson.dumps(value, default=_default)
+
+
+class OrjsonEncoder(JsonEncoder):
+    """
+    Encodes JSON with orjson, several times faster than simplejson.
+    Integral Decimals are written as integers, other Decimals as raw
+    numbers where orjson supports fragments. Values orjson can't write
+    exactly fall back to simplejson.
+
+    ...
+
+    Attributes
+    ----------
+    name : str
+        Name of the backend.
+
+    Methods
+    -------
+    dumps(value: object) -> str
+        Returns the JSON document of a value.
+    """
+
+    name: str = "orjson"
+
+    @staticmethod
+    def _default(value: object) -> object:
+        if isinstance(value, Decimal):
+            if value == value.to_integral_value():
+                return int(value)
+            if hasattr(orjson, "Fragment"):
+                return orjson.Fragment(str(value))
+
+            raise TypeError("Decimal can't be written exactly.")
+
+        return _default(value)
+
+    def dumps(self, value: object) -> str:
+        """
+        Parameters:
+            value (object): Value to encode, Decimals are written as exact numbers.
+
+        Returns:
+            document (str): JSON document.
+        """
+        try:
+            return orjson.dumps(
+                value,
+                default=self._default,
+                option=orjson.OPT_NON_STR_KEYS,
+            ).decode()
+        except orjson.JSONEncodeError:
+            return super().dumps(value)
+
+
+JSON_ENCODERS: Dict[str, Type[JsonEncoder]] = {
+    JsonEncoder.name: JsonEncoder,
+    OrjsonEncoder.name: OrjsonEncoder,
+}
+
+
+def get_json_encoder(name: str = JSON_ENCODER) -> JsonEncoder:
+    """
+    Returns a JSON encoder by backend name. auto picks orjson when it's
+    installed, and falls back to simplejson otherwise.
+
+    Parameters:
+        name (str): auto, orjson or simplejson.
+
+    Returns:
+        encoder (JsonEncoder): JSON encoder.
+    """
+    if name == "auto":
+        name = OrjsonEncoder.name if orjson else JsonEncoder.name
+    if name == OrjsonEncoder.name and not orjson:
+        name = JsonEncoder.name
+
+    return JSON_ENCODERS[name]()
+
+
+json_encoder: JsonEncoder = get_json_encoder()
@@ -102,6 +102,8 @@ class DynamoOrder(DynamoItem):
         Count of Line Items.
     status : OrderStatus
         Enum value of an Order's Status.
+    version : int
+        Incremented by every write, compared on conditional writes.
 
 
     Methods
@@ -138,6 +140,9 @@ class DynamoOrder(DynamoItem):
     id: str = Field(description="Order id.")
     item_count: int = Field(default=0, description="Total line items in the order")
     status: OrderStatus = Field(description="Order's current status.")
+    version: int = Field(
+        default=0, description="Incremented by every write of the Order."
+    )
 
 
 class Order(DynamoOrder):
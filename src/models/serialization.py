@@ -0,0 +1,287 @@
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Callable, Dict, List, Set, Tuple, Type
+
+from pydantic import BaseModel
+from pydantic.datetime_parse import parse_date, parse_datetime, parse_time
+from pydantic.fields import (
+    SHAPE_LIST,
+    SHAPE_SEQUENCE,
+    SHAPE_SET,
+    SHAPE_SINGLETON,
+    SHAPE_TUPLE_ELLIPSIS,
+    ModelField,
+)
+
+Converter = Callable[[object], object] or None
+Serializer = Callable[[BaseModel], dict]
+Loader = Callable[[dict], BaseModel]
+
+SEQUENCE_SHAPES: Tuple[int] = (
+    SHAPE_LIST,
+    SHAPE_SEQUENCE,
+    SHAPE_SET,
+    SHAPE_TUPLE_ELLIPSIS,
+)
+
+_serializers: Dict[Type[BaseModel], Serializer] = {}
+_loaders: Dict[Type[BaseModel], Loader] = {}
+
+
+def to_dynamo_value(value: object) -> object:
+    """
+    Converts any value into a DynamoDB ready value, the same way
+    pydantic's json encoder would, except floats become Decimals.
+
+    Parameters:
+        value (object): Value to convert.
+
+    Returns:
+        value (object): DynamoDB ready value.
+    """
+    if value is None or isinstance(value, (str, int, Decimal)):
+        return value.value if isinstance(value, Enum) else value
+
+    if isinstance(value, float):
+        return Decimal(str(value))
+
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+
+    if isinstance(value, Enum):
+        return to_dynamo_value(value.value)
+
+    if isinstance(value, BaseModel):
+        return get_serializer(type(value))(value)
+
+    if isinstance(value, dict):
+        return {key: to_dynamo_value(nested) for key, nested in value.items()}
+
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [to_dynamo_value(nested) for nested in value]
+
+    return str(value)
+
+
+def _serialize_model(value: object) -> object:
+    if isinstance(value, BaseModel):
+        return get_serializer(type(value))(value)
+
+    return to_dynamo_value(value)
+
+
+def _optional(converter: Callable[[object], object]) -> Callable[[object], object]:
+    return lambda value: None if value is None else converter(value)
+
+
+def _type_converter(type_: type) -> Converter:
+    """
+    Returns the converter of a field type, None when the
+    validated value is already DynamoDB ready.
+    """
+    if not isinstance(type_, type):
+        return to_dynamo_value
+
+    if issubclass(type_, Enum):
+        return _optional(lambda value: value.value)
+
+    if issubclass(type_, (str, int, Decimal)):
+        return None
+
+    if issubclass(type_, float):
+        return _optional(lambda value: Decimal(str(value)))
+
+    if issubclass(type_, (date, time)):
+        return _optional(lambda value: value.isoformat())
+
+    if issubclass(type_, BaseModel):
+        return _optional(_serialize_model)
+
+    return to_dynamo_value
+
+
+def _field_converter(field: ModelField) -> Converter:
+    if field.shape == SHAPE_SINGLETON and not field.sub_fields:
+        return _type_converter(field.type_)
+
+    if field.shape in SEQUENCE_SHAPES:
+        item_converter: Converter = _type_converter(field.type_)
+        if item_converter is None:
+            return _optional(list)
+
+        return _optional(lambda values: [item_converter(value) for value in values])
+
+    return to_dynamo_value
+
+
+def compile_serializer(model: Type[BaseModel]) -> Serializer:
+    """
+    Compiles a serializer that walks a model's fields once and
+    converts datetimes, dates, enums, floats and nested models
+    straight into DynamoDB ready values.
+
+    Parameters:
+        model (Type[BaseModel]): Pydantic model class.
+
+    Returns:
+        serializer (Callable[[BaseModel], dict]): Model to dictionary serializer.
+    """
+    converters: List[Tuple[str, Converter]] = [
+        (name, _field_converter(field)) for name, field in model.__fields__.items()
+    ]
+
+    def serializer(instance: BaseModel) -> dict:
+        values: dict = instance.__dict__
+        return {
+            name: converter(values[name]) if converter else values[name]
+            for name, converter in converters
+        }
+
+    return serializer
+
+
+def get_serializer(model: Type[BaseModel]) -> Serializer:
+    """
+    Returns the compiled serializer of a model, compiling it on first use.
+
+    Parameters:
+        model (Type[BaseModel]): Pydantic model class.
+
+    Returns:
+        serializer (Callable[[BaseModel], dict]): Model to dictionary serializer.
+    """
+    serializer: Serializer = _serializers.get(model)
+    if not serializer:
+        serializer = _serializers[model] = compile_serializer(model)
+
+    return serializer
+
+
+def _validating_converter(field: ModelField) -> Converter:
+    """
+    Falls back to the field's own pydantic validation, for
+    types without a dedicated trusted converter.
+    """
+
+    def converter(value: object) -> object:
+        validated, errors = field.validate(value, {}, loc=field.name)
+        if errors:
+            raise ValueError(f"Invalid stored value for {field.name}.")
+
+        return validated
+
+    return converter
+
+
+def _trusted_type_converter(
+    type_: type,
+    use_enum_values: bool,
+) -> Tuple[bool, Converter]:
+    """
+    Returns whether a stored value can be trusted to match the field
+    type, and the converter that turns it into the field type
+    (None when the stored value can be used as is).
+    """
+    if not isinstance(type_, type):
+        return False, None
+
+    if issubclass(type_, Enum):
+        return True, None if use_enum_values else _optional(type_)
+
+    if issubclass(type_, str):
+        return True, None
+
+    for target, converter in (
+        (bool, bool),
+        (int, int),
+        (float, float),
+        (Decimal, Decimal),
+        (datetime, parse_datetime),
+        (date, parse_date),
+        (time, parse_time),
+    ):
+        if issubclass(type_, target):
+            return True, _optional(converter)
+
+    if issubclass(type_, BaseModel):
+        return True, _optional(get_loader(type_))
+
+    return False, None
+
+
+def _trusted_field_converter(field: ModelField, use_enum_values: bool) -> Converter:
+    trusted, converter = _trusted_type_converter(field.type_, use_enum_values)
+
+    if trusted and field.shape == SHAPE_SINGLETON and not field.sub_fields:
+        return converter
+
+    if trusted and field.shape == SHAPE_LIST:
+        if converter is None:
+            return _optional(list)
+
+        return _optional(lambda values: [converter(value) for value in values])
+
+    return _validating_converter(field)
+
+
+def compile_loader(model: Type[BaseModel]) -> Loader:
+    """
+    Compiles a loader that builds a model from an item we stored
+    ourselves, converting each field with a dedicated converter instead
+    of running pydantic validation. Attributes that aren't fields, such
+    as pk, sk and entity are dropped. Items missing a required field
+    fall back to full validation.
+
+    Parameters:
+        model (Type[BaseModel]): Pydantic model class.
+
+    Returns:
+        loader (Callable[[dict], BaseModel]): Item to model loader.
+    """
+    use_enum_values: bool = getattr(model.__config__, "use_enum_values", False)
+    converters: List[Tuple[str, Converter, ModelField]] = [
+        (name, _trusted_field_converter(field, use_enum_values), field)
+        for name, field in model.__fields__.items()
+    ]
+
+    def loader(item: dict) -> BaseModel:
+        values: dict = {}
+        fields_set: Set[str] = set()
+
+        for name, converter, field in converters:
+            if name in item:
+                value: object = item[name]
+                values[name] = converter(value) if converter else value
+                fields_set.add(name)
+            elif field.required:
+                return model(**item)
+            else:
+                values[name] = field.get_default()
+
+        # Same as BaseModel.construct, without walking the fields a second time.
+        instance: BaseModel = model.__new__(model)
+        object.__setattr__(instance, "__dict__", values)
+        object.__setattr__(instance, "__fields_set__", fields_set)
+        instance._init_private_attributes()
+
+        return instance
+
+    return loader
+
+
+def get_loader(model: Type[BaseModel]) -> Loader:
+    """
+    Returns the compiled trusted loader of a model, compiling it on first use.
+
+    Parameters:
+        model (Type[BaseModel]): Pydantic model class.
+
+    Returns:
+        loader (Callable[[dict], BaseModel]): Item to model loader.
+    """
+    loader: Loader = _loaders.get(model)
+    if not loader:
+        loader = _loaders[model] = compile_loader(model)
+
+    return loader
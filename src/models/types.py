@@ -0,0 +1,41 @@
+from typing import Callable, Generator
+
+from pydantic.networks import validate_email
+from pydantic.validators import str_validator
+
+
+class EmailStr(str):
+    """
+    Drop-in replacement of pydantic's EmailStr. pydantic imports
+    email-validator as soon as a model with an EmailStr field is
+    defined, this type waits until the first email is validated.
+
+    ...
+
+    Class Methods
+    -------
+    validate(value: str) -> str:
+        Returns the normalized email address.
+    """
+
+    @classmethod
+    def __modify_schema__(cls, field_schema: dict) -> None:
+        field_schema.update(type="string", format="email")
+
+    @classmethod
+    def __get_validators__(cls) -> Generator[Callable, None, None]:
+        yield str_validator
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, value: str) -> str:
+        """
+        Validates an email address, importing email-validator on first use.
+
+        Parameters:
+            value (str): Email address.
+
+        Returns:
+            email (str): Normalized email address.
+        """
+        return validate_email(value)[1]
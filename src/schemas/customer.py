@@ -1,4 +1,6 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel
+
+from src.models.types import EmailStr
 
 
 class NewCustomerSchema(BaseModel):
@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, conlist
+
+MAX_LINE_ITEMS_PER_REQUEST: int = 100
 
 
 class NewLineItemSchema(BaseModel):
@@ -8,3 +10,14 @@ class NewLineItemSchema(BaseModel):
     name: str
     description: str
     quantity: int
+
+
+class NewLineItemsSchema(BaseModel):
+    class Config:
+        extra = "forbid"
+
+    line_items: conlist(
+        NewLineItemSchema,
+        min_items=1,
+        max_items=MAX_LINE_ITEMS_PER_REQUEST,
+    )
@@ -1,5 +1,12 @@
-from pydantic import BaseModel
-from src.models.order import DeliveryAddress
+from datetime import datetime
+from typing import List
+
+from pydantic import BaseModel, conint, conlist, root_validator
+
+from src.models.order import DeliveryAddress, DynamoOrder, OrderStatus
+
+MAX_ORDERS_PER_PAGE: int = 100
+MAX_ORDERS_PER_TRANSITION: int = 500
 
 
 class NewOrderSchema(BaseModel):
@@ -14,5 +21,36 @@ class UpdateOrderSchema(BaseModel):
     class Config:
         extra: str = "forbid"
 
-    status: str
-    delivery_address: DeliveryAddress
+    status: OrderStatus = None
+    delivery_address: DeliveryAddress = None
+
+    @root_validator(skip_on_failure=True)
+    def check_a_field_is_set(cls, values: dict) -> dict:
+        if all(value is None for value in values.values()):
+            raise ValueError("At least one field must be set.")
+
+        return values
+
+
+class TransitionOrdersSchema(BaseModel):
+    class Config:
+        extra: str = "forbid"
+
+    order_ids: conlist(str, min_items=1, max_items=MAX_ORDERS_PER_TRANSITION)
+    status: OrderStatus
+
+
+class ListOrdersSchema(BaseModel):
+    class Config:
+        extra: str = "forbid"
+
+    limit: conint(ge=1, le=MAX_ORDERS_PER_PAGE) = 20
+    cursor: str = None
+    created_after: datetime = None
+    created_before: datetime = None
+    newest_first: bool = True
+
+
+class OrderListSchema(BaseModel):
+    orders: List[DynamoOrder]
+    cursor: str = None
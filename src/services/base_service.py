@@ -1,6 +1,10 @@
+from typing import Callable, Hashable, Iterable, List
+
 from src.constants import TABLE_NAME
-from src.dynamodb.helpers import get_item
+from src.dynamodb.bulk_writer import BulkWriteReport, bulk_write_items
+from src.dynamodb.helpers import batch_get_items, get_item
 from src.models.base_model import DynamoItem
+from src.services.cache import ItemCache
 
 
 class BaseService:
@@ -13,6 +17,8 @@ class BaseService:
     ----------
     TABLE_NAME: str
         DynamoDB Table Name utilized by service.
+    ITEM_CACHE: ItemCache
+        Read-through cache of the service's items, None to always read DynamoDB.
 
 
     Methods
@@ -20,9 +26,17 @@ class BaseService:
     get_item_by_key(key: dict, model: DynamoItem) -> DynamoItem
         Retrieves a specific DynamoDB item and returns a
         instantiated DynamoItem
+
+    get_items_by_keys(keys: List[dict], model: DynamoItem) -> List[DynamoItem]
+        Retrieves many DynamoDB items in batches and returns
+        instantiated DynamoItems
+
+    save_items(models: Iterable[DynamoItem]) -> BulkWriteReport
+        Saves many DynamoItems in batches.
     """
 
     TABLE_NAME = TABLE_NAME
+    ITEM_CACHE: ItemCache or None = None
 
     def get_item_by_key(
         self,
@@ -39,9 +53,99 @@ class BaseService:
         Returns:
             item_factory (ItemFactory): Pydantic Customer model
         """
-        item: dict = get_item(key=key, table_name=self.TABLE_NAME)
+        item: dict = self._get_cached_item(
+            (self.TABLE_NAME, key["pk"], key["sk"]),
+            lambda: get_item(key=key, table_name=self.TABLE_NAME),
+        )
 
         if not item:
             return None
 
-        return model(**item)
+        return model.from_item(item)
+
+    def get_items_by_keys(
+        self,
+        keys: List[dict],
+        model: DynamoItem,
+        max_workers: int = 1,
+    ) -> List[DynamoItem or None]:
+        """
+        Accepts a list of dictionaries that describe DynamoDB keys and
+        returns their corresponding items, read with BatchGetItem.
+
+        Parameters:
+            keys (List[dict]): Dictionaries of Dynamodb keys. {'pk':'value, 'sk': 'value'}
+            model (DynamoItem): The type of Pydantic model to return
+            max_workers (int): Number of 100 key chunks requested concurrently.
+
+        Returns:
+            items (List[DynamoItem]): Models in the order of keys, None where an item is missing.
+        """
+        items: List[dict or None] = batch_get_items(
+            keys=keys,
+            table_name=self.TABLE_NAME,
+            max_workers=max_workers,
+        )
+
+        return [model.from_item(item) if item else None for item in items]
+
+    def save_items(
+        self,
+        models: Iterable[DynamoItem],
+        write_capacity_units: float = None,
+    ) -> BulkWriteReport:
+        """
+        Saves many DynamoItems, such as Customers, Addresses, Orders
+        and LineItems, with 25 item BatchWriteItem requests.
+
+        Parameters:
+            models (Iterable[DynamoItem]): Pydantic models to save.
+            write_capacity_units (float): Write capacity budget per second, None for no limit.
+
+        Returns:
+            report (BulkWriteReport): Throughput and throttling of the bulk write.
+        """
+        return bulk_write_items(
+            items=(self._invalidate_item(self._build_item(model)) for model in models),
+            table_name=self.TABLE_NAME,
+            write_capacity_units=write_capacity_units,
+        )
+
+    def _build_item(
+        self,
+        model: DynamoItem,
+    ) -> dict:
+        """
+        Returns the item save_items writes for a model, services add the
+        attributes they maintain beside the model's fields.
+        """
+        return model.item
+
+    def _get_cached_item(
+        self,
+        cache_key: Hashable,
+        read: Callable[[], dict or None],
+    ) -> dict or None:
+        """
+        Returns the item cached under cache_key, or reads it and caches
+        it when found. Without an ITEM_CACHE the item is always read.
+        """
+        if not self.ITEM_CACHE or not self.ITEM_CACHE.enabled:
+            return read()
+
+        item: dict or None = self.ITEM_CACHE.get(cache_key)
+        if item is None:
+            item = read()
+            if item:
+                self.ITEM_CACHE.set(cache_key, item)
+
+        return item
+
+    def _invalidate_item(self, item: dict) -> dict:
+        """
+        Drops the cached copies of an item that is about to be written.
+        """
+        if self.ITEM_CACHE:
+            self.ITEM_CACHE.invalidate(item["pk"], item["sk"])
+
+        return item
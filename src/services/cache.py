@@ -0,0 +1,166 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Hashable, Tuple
+
+from src.constants import ITEM_CACHE_MAX_SIZE, ITEM_CACHE_TTL_SECONDS
+
+
+class ItemCache:
+    """
+    Bounded LRU cache of DynamoDB items whose entries expire after a
+    TTL. It lives for the life of a warm Lambda container, so items
+    written by other containers are at most ttl_seconds stale.
+
+    ...
+
+    Attributes
+    ----------
+    max_size : int
+        Maximum number of cached items, the least recently used is evicted first.
+    ttl_seconds : float
+        Seconds an item is served from the cache, 0 disables the cache.
+    hits : int
+        Number of lookups served from the cache.
+    misses : int
+        Number of lookups that had to read DynamoDB.
+    evictions : int
+        Number of items evicted to stay within max_size.
+    expirations : int
+        Number of items dropped because their TTL elapsed.
+
+    Methods
+    -------
+    get(key: Hashable) -> dict or None
+        Returns a cached item, None on a miss.
+
+    set(key: Hashable, item: dict) -> None
+        Caches an item.
+
+    invalidate(pk: str, sk: str) -> None
+        Drops the cached copies of an item, or of a whole partition.
+
+    clear() -> None
+        Drops every cached item and resets the counters.
+
+    stats() -> dict
+        Returns the counters and current size.
+    """
+
+    def __init__(
+        self,
+        max_size: int = ITEM_CACHE_MAX_SIZE,
+        ttl_seconds: float = ITEM_CACHE_TTL_SECONDS,
+    ) -> None:
+        self.max_size: int = max_size
+        self.ttl_seconds: float = ttl_seconds
+        self._items: "OrderedDict[Hashable, Tuple[float, dict]]" = OrderedDict()
+        self._lock: Lock = Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Returns:
+            enabled (bool): Whether items are cached at all.
+        """
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get(self, key: Hashable) -> dict or None:
+        """
+        Returns a cached item and marks it as recently used.
+
+        Parameters:
+            key (Hashable): Cache key of the item.
+
+        Returns:
+            item (dict): Cached item, None on a miss or an expired item.
+        """
+        with self._lock:
+            entry: Tuple[float, dict] or None = self._items.get(key)
+            if entry and entry[0] <= monotonic():
+                del self._items[key]
+                self.expirations += 1
+                entry = None
+
+            if not entry:
+                self.misses += 1
+                return None
+
+            self._items.move_to_end(key)
+            self.hits += 1
+
+            return entry[1]
+
+    def set(self, key: Hashable, item: dict) -> None:
+        """
+        Caches an item, evicting the least recently used item when full.
+
+        Parameters:
+            key (Hashable): Cache key of the item.
+            item (dict): DynamoDB item, must not be mutated afterwards.
+
+        Returns:
+            None
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._items[key] = (monotonic() + self.ttl_seconds, item)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, pk: str, sk: str = None) -> None:
+        """
+        Drops every cached copy of the item with the given key, or of
+        every item in the partition when sk is None. Items are matched on
+        their own pk and sk, so lookups cached under any key are dropped.
+
+        Parameters:
+            pk (str): Partition key written to.
+            sk (str): Sort key written to, None for the whole partition.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            for key in [
+                key
+                for key, (_, item) in self._items.items()
+                if item.get("pk") == pk and (sk is None or item.get("sk") == sk)
+            ]:
+                del self._items[key]
+
+    def clear(self) -> None:
+        """
+        Drops every cached item and resets the counters.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._items.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            stats (dict): hits, misses, evictions, expirations and size of the cache.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._items),
+            }
+
+
+item_cache: ItemCache = ItemCache()
@@ -1,20 +1,31 @@
 from datetime import datetime
-from typing import List
+from typing import TYPE_CHECKING, List
 
-import boto3
 from boto3.dynamodb.conditions import Key
 from ksuid import ksuid
-from mypy_boto3_dynamodb.service_resource import _Table
 
-from src.dynamodb.helpers import put_item, query_by_key_condition_expression
-from src.models import Customer, DynamoAddress
+from src.dynamodb.connection import get_table
+from src.dynamodb.helpers import (
+    get_item,
+    put_item,
+    query_by_key_condition_expression,
+)
+from src.models import Customer, DynamoAddress, Username
+from src.schemas.address import NewAddressSchema
+from src.schemas.customer import NewCustomerSchema
 from src.services.base_service import BaseService
+from src.services.cache import ItemCache, item_cache
 from src.services.exceptions import (
     CreateCustomerException,
     CustomerLookupException,
     DuplicateCustomerKeyException,
 )
 
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb.client import DynamoDBClient
+
+CUSTOMER_USERNAME_INDEX: str = "username_index"
+
 
 class CustomerService(BaseService):
     """
@@ -26,6 +37,8 @@ class CustomerService(BaseService):
     ----------
     TABLE_NAME: str
         DynamoDB Table Name utilized by service.
+    ITEM_CACHE: ItemCache
+        Read-through cache of Customers and Addresses.
 
 
     Methods
@@ -34,32 +47,50 @@ class CustomerService(BaseService):
         Retrieves a specific DynamoDB item and returns a
         instantiated DynamoItem
 
-    create_customer(new_customer_data: dict)
+    get_items_by_keys(keys: List[dict], model: DynamoItem) -> List[DynamoItem]
+        Retrieves many DynamoDB items in batches and returns
+        instantiated DynamoItems
+
+    save_items(models: Iterable[DynamoItem]) -> BulkWriteReport
+        Saves many DynamoItems in batches.
+
+    create_customer(new_customer_data: NewCustomerSchema or dict)
         Saves a new customer to DynamoDB
 
-    add_Customer_address(username: str, new_address_data)
+    add_Customer_address(username: str, new_address_data: NewAddressSchema or dict)
         Adds an Address to a Customer.
 
+    get_customer_address(email: str, address_id: str, attributes: List[str])
+        Retrieves a single Address of a Customer by key.
+
     get_customer_by_email(email: str)
         Retrieves a Customer by email.
 
-    get_customer_items_by_email(email: str)
+    get_customer_by_username(username: str)
+        Retrieves a Customer by username.
+
+    get_customer_email_by_username(username: str)
+        Retrieves the email of a Customer by username.
+
+    get_customer_items_by_email(email: str, limit: int)
         Retrieves a list of Customer and Address entities
         as dictionaries associated with the email.
 
     """
 
+    ITEM_CACHE: ItemCache = item_cache
+
     def add_customer_address(
         self,
         username: str,
-        new_address_data: dict,
+        new_address_data: NewAddressSchema or dict,
     ) -> DynamoAddress:
         """
         Adds an Address to a Customer entity.
 
         Parameters:
             username (str): username of the Customer.
-            new_address_data(dict): Dictionary of address data (NewAddresssSchema).
+            new_address_data(NewAddressSchema or dict): Validated NewAddressSchema, or a dictionary of its data.
 
         Returns:
             dynamo_address (DynamoAddress): Pydantic DynamoAddress model.
@@ -68,31 +99,18 @@ class CustomerService(BaseService):
             CustomerLookupException (Exception): Occurs if username is not saved in DynamoDB
             DuplicateCustomerKeyException (Exception): Occurs if there are multiple of the same username.
         """
-        customer_items: List[dict] = query_by_key_condition_expression(
-            key_condition_expression=Key("sk").eq(f"{Customer._SK_ENTITY}#{username}")
-            & Key("pk").begins_with("Customer#"),
-            index_name="sk_pk_index",
-            table_name=self.TABLE_NAME,
-        )
-
-        if not customer_items:
-            raise CustomerLookupException("Unable to locate Customer.")
-
-        if len(customer_items) > 1:
-            raise DuplicateCustomerKeyException
-
-        customer: dict = customer_items[0]
+        email: str = self.get_customer_email_by_username(username)
         address_id: ksuid = ksuid()
 
-        new_address_data["id"] = str(address_id)
-        new_address_data["email"] = customer["email"]
-        new_address_data["datetime_created"] = address_id.getDatetime().strftime(
-            "%Y-%m-%dT%H:%M:%SZ"
+        address: DynamoAddress = DynamoAddress.from_schema(
+            new_address_data,
+            id=str(address_id),
+            email=email,
+            datetime_created=address_id.getDatetime().strftime("%Y-%m-%dT%H:%M:%SZ"),
         )
-        address: DynamoAddress = DynamoAddress(**new_address_data)
 
         put_item(
-            item=address.item,
+            item=self._invalidate_item(address.item),
             table_name=self.TABLE_NAME,
         )
 
@@ -100,36 +118,94 @@ class CustomerService(BaseService):
 
     def create_customer(
         self,
-        new_customer_data: dict,
+        new_customer_data: NewCustomerSchema or dict,
     ) -> Customer:
         """
         Accepts a new Customer payload and creates a new
-        customer if the username is not already in use.
+        customer if the username is not already in use. The Customer
+        and its Username sentinel are written in one transaction, the
+        sentinel's condition keeps usernames unique across emails.
 
         Parameters:
-            new_customer_data (dict): Dictionary of customer data (NewCustomerSchema).
+            new_customer_data (NewCustomerSchema or dict): Validated NewCustomerSchema, or a dictionary of its data.
 
         Returns:
             customer (Customer): Pydantic Customer model
         """
-        new_customer_data["date_created"] = datetime.now().date().isoformat()
-        customer: Customer = Customer(**new_customer_data)
-        client: _Table = boto3.resource("dynamodb")
-        table: _Table = client.Table(self.TABLE_NAME)
+        customer: Customer = Customer.from_schema(
+            new_customer_data,
+            date_created=datetime.now().date(),
+        )
+        username: Username = Username(name=customer.username, email=customer.email)
+        client: DynamoDBClient = get_table(self.TABLE_NAME).meta.client
         try:
-            table.put_item(
-                Item=customer.item,
-                ConditionExpression="attribute_not_exists(#username)",
-                ExpressionAttributeNames={
-                    "#username": "username",
-                },
+            client.transact_write_items(
+                TransactItems=[
+                    {
+                        "Put": {
+                            "TableName": self.TABLE_NAME,
+                            "Item": self._invalidate_item(customer.item),
+                            "ConditionExpression": "attribute_not_exists(#username)",
+                            "ExpressionAttributeNames": {
+                                "#username": "username",
+                            },
+                        },
+                    },
+                    {
+                        "Put": {
+                            "TableName": self.TABLE_NAME,
+                            "Item": self._invalidate_item(username.item),
+                            "ConditionExpression": "attribute_not_exists(pk)",
+                        },
+                    },
+                ],
             )
-
-        except client.meta.client.exceptions.ConditionalCheckFailedException:
+        except client.exceptions.TransactionCanceledException:
             raise CreateCustomerException("Account already exists")
 
         return customer
 
+    def get_customer_address(
+        self,
+        email: str,
+        address_id: str,
+        attributes: List[str] = None,
+    ) -> dict or None:
+        """
+        Returns an Address dictionary item with a single GetItem,
+        regardless of how many Addresses the Customer has. Addresses
+        are served from the ITEM_CACHE while they are cached.
+
+        Parameters:
+            email (str): email of the Customer.
+            address_id (str): id of the Address.
+            attributes (List[str]): Attributes to return, None for the whole item.
+
+        Returns:
+            address_item (dict): Address Dictionary, None if it doesn't exist.
+        """
+        key: dict = DynamoAddress.calculate_key(email, address_id)
+        if not self.ITEM_CACHE.enabled:
+            return get_item(
+                key=key,
+                table_name=self.TABLE_NAME,
+                attributes=attributes,
+            )
+
+        # Projections don't lower the read cost, so the whole item is cached.
+        address_item: dict or None = self._get_cached_item(
+            (self.TABLE_NAME, key["pk"], key["sk"]),
+            lambda: get_item(key=key, table_name=self.TABLE_NAME),
+        )
+        if not address_item:
+            return None
+
+        return {
+            attribute: value
+            for attribute, value in address_item.items()
+            if not attributes or attribute in attributes
+        }
+
     def get_customer_by_email(
         self,
         email: str,
@@ -146,26 +222,102 @@ class CustomerService(BaseService):
         Rasies:
             CustomerLookupException (Exception): Occurs if username is not saved in DynamoDB
         """
-        customer_items: List[dict] = query_by_key_condition_expression(
-            key_condition_expression=Key(f"{Customer._PK_ENTITY}#{email}")
-            & Key("sk").begins_with(f"{Customer._SK_ENTITY}#"),
-            table_name=self.TABLE_NAME,
+        pk: str = f"{Customer._PK_ENTITY}#{email}"
+        customer_item: dict or None = self._get_cached_item(
+            (self.TABLE_NAME, pk, f"{Customer._SK_ENTITY}#"),
+            lambda: next(
+                iter(
+                    query_by_key_condition_expression(
+                        key_condition_expression=Key("pk").eq(pk)
+                        & Key("sk").begins_with(f"{Customer._SK_ENTITY}#"),
+                        table_name=self.TABLE_NAME,
+                        limit=1,
+                    )
+                ),
+                None,
+            ),
         )
 
-        if not customer_items:
+        if not customer_item:
+            raise CustomerLookupException("Unable to locate Customer.")
+
+        return Customer.from_item(customer_item)
+
+    def get_customer_by_username(
+        self,
+        username: str,
+    ) -> Customer:
+        """
+        Returns a Customer Model by username.
+
+        Parameters:
+            username (str): username of the Customer.
+
+        Returns:
+            customer (Customer): Pydantic Customer model.
+
+        Rasies:
+            CustomerLookupException (Exception): Occurs if username is not saved in DynamoDB
+        """
+        customer: Customer or None = self.get_item_by_key(
+            Customer.calculate_key(
+                self.get_customer_email_by_username(username),
+                username,
+            ),
+            Customer,
+        )
+
+        if not customer:
             raise CustomerLookupException("Unable to locate Customer.")
 
-        return Customer(**customer_items[0])
+        return customer
+
+    def get_customer_email_by_username(
+        self,
+        username: str,
+    ) -> str:
+        """
+        Returns the email of the Customer holding a username, read
+        from the Username sentinel with one strongly consistent GetItem.
+        Customers created before the sentinels existed are looked up in
+        the username_index instead.
+
+        Parameters:
+            username (str): username of the Customer.
+
+        Returns:
+            email (str): email of the Customer.
+
+        Rasies:
+            CustomerLookupException (Exception): Occurs if username is not saved in DynamoDB
+            DuplicateCustomerKeyException (Exception): Occurs if there are multiple of the same username.
+        """
+        key: dict = Username.calculate_key(username)
+        username_item: dict or None = self._get_cached_item(
+            (self.TABLE_NAME, key["pk"], key["sk"]),
+            lambda: get_item(
+                key=key,
+                table_name=self.TABLE_NAME,
+                consistent_read=True,
+            ),
+        )
+
+        if username_item:
+            return username_item["email"]
+
+        return self._query_customer_by_username(username)["email"]
 
     def get_customer_items_by_email(
         self,
         email: str,
+        limit: int = None,
     ) -> List[dict]:
         """
         Returns a list of Customer and Address dictionary items by email.
 
         Parameters:
             email (str): email of the Customer.
+            limit (int): Maximum number of items to return, None for all.
 
         Returns:
             customer_items (List[dict]): List of Customer and Address Dictionaries.
@@ -176,9 +328,39 @@ class CustomerService(BaseService):
         customer_items: List[dict] = query_by_key_condition_expression(
             key_condition_expression=Key("pk").eq(f"{Customer._PK_ENTITY}#{email}"),
             table_name=self.TABLE_NAME,
+            limit=limit,
         )
 
         if not customer_items:
             raise CustomerLookupException("Unable to locate Customer.")
 
         return customer_items
+
+    def _query_customer_by_username(
+        self,
+        username: str,
+    ) -> dict:
+        """
+        Returns the Customer dictionary item of a username from the
+        username_index. Only Customer items have a username attribute,
+        so no other entity is written to the index. It resolves the
+        usernames of Customers that don't have a Username sentinel yet.
+
+        Rasies:
+            CustomerLookupException (Exception): Occurs if username is not saved in DynamoDB
+            DuplicateCustomerKeyException (Exception): Occurs if there are multiple of the same username.
+        """
+        customer_items: List[dict] = query_by_key_condition_expression(
+            key_condition_expression=Key("username").eq(username),
+            index_name=CUSTOMER_USERNAME_INDEX,
+            table_name=self.TABLE_NAME,
+            limit=2,
+        )
+
+        if not customer_items:
+            raise CustomerLookupException("Unable to locate Customer.")
+
+        if len(customer_items) > 1:
+            raise DuplicateCustomerKeyException
+
+        return customer_items[0]
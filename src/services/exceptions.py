@@ -1,3 +1,9 @@
+class AddLineItemException(Exception):
+    """
+    Raised when a LineItem cannot be added to an Order
+    """
+
+
 class RemoveLineItemException(Exception):
     """
     Raised when a LineItem cannot be removed from an Order
@@ -20,3 +26,27 @@ class CustomerLookupException(Exception):
     """
     Raised when a queried customer is not found
     """
+
+
+class OrderLookupException(Exception):
+    """
+    Raised when a queried order is not found
+    """
+
+
+class InvalidFieldsException(Exception):
+    """
+    Raised when requested fields are not fields of the entity
+    """
+
+
+class OrderStatusException(Exception):
+    """
+    Raised when an order status can't be used for the requested operation
+    """
+
+
+class VersionConflictException(Exception):
+    """
+    Raised when an order was written since the version a write expected
+    """
@@ -1,20 +1,411 @@
-from decimal import Decimal
-from typing import List
+from collections import OrderedDict
+from datetime import datetime, timezone
+from heapq import merge
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Tuple,
+    TypeVar,
+)
+from zlib import crc32
 
-import boto3
 from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
 from ksuid import ksuid
-from mypy_boto3_dynamodb.service_resource import _Table
+from ksuid.ksuid import epochTime as KSUID_EPOCH
+from pydantic import BaseModel
 
-from src.dynamodb.helpers import get_item, put_item, query_by_key_condition_expression
+from src.constants import EMBEDDED_LINE_ITEMS_MAX, ORDER_STATUS_SHARDS
+from src.dynamodb.connection import get_table
+from src.dynamodb.helpers import (
+    BATCH_MAX_ATTEMPTS,
+    QueryIterator,
+    backoff,
+    get_item,
+    projection_parameters,
+    put_item,
+)
 from src.models import (
     DynamoOrder,
     LineItem,
     Order,
     OrderStatus,
 )
+from src.models.base_model import DynamoItem
+from src.models.serialization import to_dynamo_value
+from src.schemas.line_item import NewLineItemSchema
+from src.schemas.order import NewOrderSchema
 from src.services.base_service import BaseService
-from src.services.exceptions import RemoveLineItemException
+from src.services.exceptions import (
+    AddLineItemException,
+    InvalidFieldsException,
+    OrderLookupException,
+    OrderStatusException,
+    RemoveLineItemException,
+    VersionConflictException,
+)
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb.client import DynamoDBClient
+    from mypy_boto3_dynamodb.service_resource import _Table
+
+ADD_LINE_ITEM_MAX_ATTEMPTS: int = 5
+CONFLICT_MAX_ATTEMPTS: int = 5
+ITEM_COUNT_HINTS_MAX_SIZE: int = 1024
+DOMAIN_ORDER_CACHE_MAX_SIZE: int = 256
+CUSTOMER_ORDERS_INDEX: str = "customer_email_id_index"
+STATUS_INDEX: str = "status_shard_index"
+TERMINAL_ORDER_STATUSES: Tuple[OrderStatus] = (OrderStatus.DELIVERED,)
+ORDER_STATUS_TRANSITIONS: Dict[OrderStatus, Tuple[OrderStatus]] = {
+    OrderStatus.NEW: (OrderStatus.SUBMITTED,),
+    OrderStatus.SUBMITTED: (OrderStatus.IN_PROGRESS,),
+    OrderStatus.IN_PROGRESS: (OrderStatus.FULFILLED,),
+    OrderStatus.FULFILLED: (OrderStatus.SHIPPED,),
+    OrderStatus.SHIPPED: (OrderStatus.OUT_FOR_DELIVERY,),
+    OrderStatus.OUT_FOR_DELIVERY: (OrderStatus.DELIVERED,),
+    OrderStatus.DELIVERED: (),
+}
+TRANSITION_MAX_WORKERS: int = 8
+THROTTLING_ERROR_CODES: Tuple[str] = (
+    "ProvisionedThroughputExceededException",
+    "RequestLimitExceeded",
+    "ThrottlingException",
+)
+ORDER_VERSION_ATTRIBUTES: List[str] = ["version", "item_count", "status"]
+# Maintained by the OrderService itself, compare_and_swap_order can't set them.
+READ_ONLY_ORDER_FIELDS: Tuple[str] = ("id", "datetime_created", "item_count", "version")
+TRANSACT_WRITE_ITEMS_LIMIT: int = 25
+# LineItems put in one transaction with their Order's update.
+ADD_LINE_ITEMS_CHUNK_SIZE: int = TRANSACT_WRITE_ITEMS_LIMIT - 1
+# Spilling an Order's embedded LineItems, plus the one being added,
+# must fit in a single transaction with the Order's update.
+MAX_EMBEDDED_LINE_ITEMS: int = min(
+    EMBEDDED_LINE_ITEMS_MAX, TRANSACT_WRITE_ITEMS_LIMIT - 2
+)
+
+T = TypeVar("T")
+
+# Last item_count and next_line_item_id this container wrote for each
+# Order pk, and whether the Order's LineItems are embedded. It lets
+# add_line_item_to_order guess the next LineItem id and the Order's
+# layout without a read.
+_item_count_hints: "OrderedDict[str, Tuple[int, int, bool]]" = OrderedDict()
+
+
+def _remember_item_count(
+    order_pk: str,
+    item_count: int,
+    embedded: bool = False,
+    next_line_item_id: int = None,
+) -> None:
+    if next_line_item_id is None:
+        next_line_item_id = item_count + 1
+    _item_count_hints[order_pk] = (item_count, next_line_item_id, embedded)
+    _item_count_hints.move_to_end(order_pk)
+    if len(_item_count_hints) > ITEM_COUNT_HINTS_MAX_SIZE:
+        _item_count_hints.popitem(last=False)
+
+
+def _forget_item_count(order_pk: str) -> None:
+    _item_count_hints.pop(order_pk, None)
+
+
+# Last Order aggregate this container built for each Order pk, with its
+# ETag. A cached Order is only served while its ETag is still current.
+_domain_orders: "OrderedDict[str, Tuple[str, Order]]" = OrderedDict()
+
+
+def _remember_domain_order(order_pk: str, etag: str, order: Order) -> None:
+    _domain_orders[order_pk] = (etag, order)
+    _domain_orders.move_to_end(order_pk)
+    if len(_domain_orders) > DOMAIN_ORDER_CACHE_MAX_SIZE:
+        _domain_orders.popitem(last=False)
+
+
+def calculate_order_etag(order_item: dict) -> str:
+    """
+    Returns the ETag of an Order aggregate. Every write through the
+    OrderService adds 1 to the Order's version, item_count and status
+    are included for Orders written without one.
+
+    Parameters:
+        order_item (dict): Order header item, or its ORDER_VERSION_ATTRIBUTES.
+
+    Returns:
+        etag (str): Quoted entity tag.
+    """
+    return '"{}.{}.{}"'.format(
+        order_item.get("version", 0),
+        order_item["item_count"],
+        order_item["status"],
+    )
+
+
+def _to_embedded_line_item(line_item: dict) -> dict:
+    """
+    Returns the fields of a LineItem item, as stored in the line_items
+    map of an Order item. The key attributes are left out, they are
+    derived again when LineItems spill over to their own items.
+    """
+    return {field: line_item[field] for field in LineItem.__fields__}
+
+
+def _get_embedded_line_items(order_item: dict) -> List[dict]:
+    """
+    Returns the LineItems embedded in an Order item, in id order.
+    """
+    return sorted(
+        order_item.get("line_items", {}).values(),
+        key=lambda line_item: line_item["id"],
+    )
+
+
+def _next_line_item_id_condition(
+    next_line_item_id: int,
+    stored: bool or None = True,
+) -> Tuple[str, dict]:
+    """
+    Returns a ConditionExpression, and its values, that only holds
+    while the Order's next_line_item_id is the given one. Orders written
+    before they had one only match while they still don't. When it's
+    not known which the Order is, either matches, an Order without one
+    while its item_count is just below next_line_item_id.
+    """
+    if stored is None:
+        return (
+            "(#next_line_item_id = :expected_next_line_item_id OR "
+            "(attribute_not_exists(#next_line_item_id) AND "
+            "#item_count = :expected_item_count))",
+            {
+                ":expected_next_line_item_id": next_line_item_id,
+                ":expected_item_count": next_line_item_id - 1,
+            },
+        )
+
+    if stored is False:
+        return (
+            "attribute_exists(#item_count) AND attribute_not_exists(#next_line_item_id)",
+            {},
+        )
+
+    return "#next_line_item_id = :expected_next_line_item_id", {
+        ":expected_next_line_item_id": next_line_item_id
+    }
+
+
+def _version_condition(version: int) -> Tuple[str, dict]:
+    """
+    Returns a ConditionExpression, and its values, that only holds
+    while the Order's version is the given one. Orders written before
+    they had a version are at version 0.
+    """
+    if not version:
+        return "(attribute_not_exists(#version) OR #version = :version)", {
+            ":version": 0
+        }
+
+    return "#version = :version", {":version": version}
+
+
+def previous_order_statuses(status: OrderStatus) -> Tuple[OrderStatus]:
+    """
+    Returns the statuses an Order can move to status from.
+
+    Parameters:
+        status (OrderStatus): Status the Order moves to.
+
+    Returns:
+        statuses (Tuple[OrderStatus]): Allowed previous statuses, empty for NEW.
+    """
+    return tuple(
+        previous
+        for previous, statuses in ORDER_STATUS_TRANSITIONS.items()
+        if OrderStatus(status) in statuses
+    )
+
+
+class OrderTransitionResult(BaseModel):
+    """
+    Represents the outcome of one Order's status transition.
+
+    ...
+
+    Attributes
+    ----------
+    id : str
+        id of the Order.
+    succeeded : bool
+        Whether the Order moved to the new status.
+    error : str
+        Why the transition failed, None when it succeeded.
+    version : int
+        Version of the updated Order, None when the transition failed.
+    attempts : int
+        Number of UpdateItem requests sent, throttled retries included.
+    """
+
+    id: str
+    succeeded: bool
+    error: str = None
+    version: int = None
+    attempts: int = 1
+
+
+class BulkTransitionReport(BaseModel):
+    """
+    Represents the outcome of a batch of status transitions.
+
+    ...
+
+    Attributes
+    ----------
+    status : OrderStatus
+        Status the Orders were moved to.
+    succeeded : int
+        Number of Orders moved.
+    failed : int
+        Number of Orders that weren't moved.
+    retries : int
+        Number of throttled requests that were retried.
+    elapsed_seconds : float
+        Wall clock duration of the batch.
+    results : List[OrderTransitionResult]
+        Outcome of each Order, in request order.
+    """
+
+    status: OrderStatus
+    succeeded: int = 0
+    failed: int = 0
+    retries: int = 0
+    elapsed_seconds: float = 0
+    results: List[OrderTransitionResult] = []
+
+
+def _check_order_changes(changes: dict) -> None:
+    """
+    Raises InvalidFieldsException unless every change sets a field of
+    an Order the OrderService doesn't maintain itself, and only
+    optional fields are removed.
+    """
+    invalid_fields: List[str] = [
+        field
+        for field, value in changes.items()
+        if field not in DynamoOrder.__fields__
+        or field in READ_ONLY_ORDER_FIELDS
+        or (value is None and DynamoOrder.__fields__[field].required)
+    ]
+    if invalid_fields:
+        raise InvalidFieldsException(f"Invalid fields: {', '.join(invalid_fields)}")
+
+
+def _is_transaction_conflict(error: ClientError) -> bool:
+    """
+    Returns whether a transaction was canceled because another request
+    was writing one of its items, rather than by a failed condition.
+    """
+    return any(
+        reason.get("Code") == "TransactionConflict"
+        for reason in error.response.get("CancellationReasons", [])
+    )
+
+
+def retry_on_conflict(
+    operation: Callable[[], T],
+    max_attempts: int = CONFLICT_MAX_ATTEMPTS,
+) -> T:
+    """
+    Runs a read-modify-write operation, and runs it again with jittered
+    backoff while it raises VersionConflictException. The operation
+    must read the version it expects on every run.
+
+    Parameters:
+        operation (Callable[[], T]): Reads an Order, then writes it with compare_and_swap_order.
+        max_attempts (int): Maximum number of runs.
+
+    Returns:
+        result (T): Result of the first run without a conflict.
+
+    Raises:
+        VersionConflictException: Occurs if every run conflicts.
+    """
+    for attempt in range(max_attempts):
+        try:
+            return operation()
+        except VersionConflictException:
+            if attempt + 1 == max_attempts:
+                raise
+
+            backoff(attempt)
+
+
+def _to_utc(moment: datetime) -> datetime:
+    """
+    Returns moment in UTC. A naive datetime is taken to be in UTC,
+    rather than in the Lambda host's local time.
+    """
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+
+    return moment.astimezone(timezone.utc)
+
+
+def _ksuid_bound(moment: datetime, upper: bool = False) -> str:
+    """
+    Returns the lowest, or highest, Order id that could have been
+    generated at the second of moment, a naive moment being in UTC.
+    KSUIDs start with their timestamp, so ids sort in creation order.
+    """
+    timestamp: str = format(int(_to_utc(moment).timestamp()) - KSUID_EPOCH, "08x")
+
+    return timestamp + ("f" if upper else "0") * 32
+
+
+def calculate_status_shard(order_id: str, status: OrderStatus) -> str:
+    """
+    Returns the status_shard_index partition key of an Order. Orders
+    of a status are spread over ORDER_STATUS_SHARDS partitions by a
+    hash of their id, so a busy status doesn't create a hot partition.
+
+    Parameters:
+        order_id (str): id of the Order.
+        status (OrderStatus): Status of the Order.
+
+    Returns:
+        status_shard (str): Partition key, such as new#3.
+    """
+    return (
+        f"{OrderStatus(status).value}#{crc32(order_id.encode()) % ORDER_STATUS_SHARDS}"
+    )
+
+
+def _status_changed() -> str:
+    return datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def get_status_index_attributes(order_id: str, status: OrderStatus) -> dict:
+    """
+    Returns the status_shard_index attributes of an Order whose status
+    is written now. Terminal statuses get no status_shard, so the Order
+    stays out of the sparse index.
+
+    Parameters:
+        order_id (str): id of the Order.
+        status (OrderStatus): Status of the Order.
+
+    Returns:
+        attributes (dict): status_changed, and status_shard unless the status is terminal.
+    """
+    attributes: dict = {"status_changed": _status_changed()}
+    if OrderStatus(status) not in TERMINAL_ORDER_STATUSES:
+        attributes["status_shard"] = calculate_status_shard(order_id, status)
+
+    return attributes
 
 
 class OrderService(BaseService):
@@ -35,10 +426,20 @@ class OrderService(BaseService):
         Retrieves a specific DynamoDB item and returns a
         instantiated DynamoItem
 
-    add_line_item_to_order(order_key: dict, new_line_item_data: dict) -> dict
-        Adds a LineItem to an Order.
+    get_items_by_keys(keys: List[dict], model: DynamoItem) -> List[DynamoItem]
+        Retrieves many DynamoDB items in batches and returns
+        instantiated DynamoItems
+
+    save_items(models: Iterable[DynamoItem]) -> BulkWriteReport
+        Saves many DynamoItems in batches, Orders with their status_shard_index attributes.
+
+    add_line_item_to_order(order_key: dict, new_line_item_data: NewLineItemSchema or dict, expected_item_count: int) -> dict
+        Adds a LineItem to an Order in a single request.
 
-    create_order(new_order_data: dict) -> DynamoOrder
+    add_line_items_to_order(order_key: dict, new_line_items_data: List[NewLineItemSchema or dict]) -> List[dict]
+        Adds many LineItems to an Order in transactional chunks.
+
+    create_order(new_order_data: NewOrderSchema or dict, delivery_address: dict) -> DynamoOrder
         Creates and returns the DynamoDB representation of an Order.
 
     get_domain_order_by_id(id: str, deserialize: bool=true) -> List[dict] or Order
@@ -46,6 +447,43 @@ class OrderService(BaseService):
         Order and return the list or utilize the list to instantiate a
         pydantic Order.
 
+    get_domain_order_etag(id: str) -> str
+        Returns the current ETag of an Order with a projected GetItem.
+
+    get_domain_order_by_etag(id: str, etag: str) -> Tuple[Order, str]
+        Returns an Order and its ETag, from this container's cache
+        while the ETag is current.
+
+    get_domain_order_fields(id: str, fields: List[str]) -> dict
+        Returns only the requested fields of an Order, reading
+        LineItems only when line_items is requested.
+
+    list_orders_for_customer(email: str, limit: int, cursor: str, ...) -> Tuple[List[DynamoOrder], str]
+        Returns a page of a Customer's Orders, newest first, and
+        the cursor of the next page.
+
+    update_order_status(id: str, status: OrderStatus, expected_version: int) -> None
+        Sets an Order's status, keeping the status_shard_index current.
+
+    compare_and_swap_order(id: str, expected_version: int, changes: dict) -> DynamoOrder
+        Sets fields of an Order only if it's still at expected_version.
+
+    update_order(order: DynamoOrder, expected_version: int) -> DynamoOrder
+        Saves only the fields of an Order that were assigned.
+
+    transition_order_status(id: str, status: OrderStatus) -> DynamoOrder
+        Moves an Order to a status its current status allows.
+
+    transition_orders_status(ids: List[str], status: OrderStatus) -> BulkTransitionReport
+        Moves many Orders to a status concurrently, reporting each outcome.
+
+    mutate_order(id: str, mutation: Callable[[DynamoOrder], dict]) -> DynamoOrder
+        Reads, changes and compare-and-swaps an Order, retrying on conflicts.
+
+    iter_orders_by_status(status: OrderStatus, since: datetime) -> Generator[DynamoOrder]
+        Yields the Orders of a non-terminal status from every shard
+        of the status_shard_index.
+
     get_domain_order_by_key(key: dict, deserialize: bool) -> True
         Retrieves the aggregate list of entities that makeup a domain
         Order and return the list or utilize the list to instantiate a
@@ -60,68 +498,507 @@ class OrderService(BaseService):
         Returns an Order from its DyanmoDb key as either a dict or instantiated
         DynamoOrder
 
-    remove_line_item_from_order(order_id: str, line_item_id: int) -> None
+    remove_line_item_from_order(order_id: str, line_item_id: int, expected_version: int) -> None
         Deletes an Order's LineItem.
 
+    convert_line_item_layout(id: str, embedded: bool) -> bool
+        Moves an Order's LineItems into, or out of, the Order item.
+
     """
 
     def add_line_item_to_order(
         self,
         order_key: dict,
-        new_line_item_data: dict,
+        new_line_item_data: NewLineItemSchema or dict,
+        expected_item_count: int = None,
     ) -> dict:
         """
         Adds a LineItem to an Order entity, and imcrements
-        an Order's item_count by 1
+        an Order's item_count by 1 in a single request.
+
+        While the Order holds fewer than MAX_EMBEDDED_LINE_ITEMS, the
+        LineItem is embedded in the Order item with one UpdateItem.
+        Adding to a full Order moves its embedded LineItems to their own
+        items, in the transaction that puts the new one. Otherwise the
+        LineItem is put in a transaction with the Order's update.
+
+        LineItem ids come from the Order's next_line_item_id, which only
+        ever goes up, so the id of a removed LineItem is never handed out
+        again. The write only succeeds if next_line_item_id still holds
+        the value the id was taken from, and the LineItem doesn't exist
+        yet. That value is the last one this container wrote, or follows
+        expected_item_count, which also holds for an Order written before
+        next_line_item_id, so the common case is one round trip.
+        Without either, or after a conflict, the Order is read with a
+        consistent GetItem first.
 
         Parameters:
             order_key (dict): DyanamoDB key of order {'pk':'value', 'sk':'value'}.
-            new_line_item_data: (dict): Dictionary of LineItem data (NewLineItemSchema).
+            new_line_item_data: (NewLineItemSchema or dict): Validated NewLineItemSchema, or a dictionary of its data.
+            expected_item_count (int): The Order's current item_count, if known and no LineItem was removed.
 
         Returns:
             line_item_dict (dict): A Dictionary that represents the saved LineItem.
+
+        Raises:
+            AddLineItemException: Occurs if the Order stays contended.
+            OrderLookupException: Occurs if the Order doesn't exist.
+        """
+        return self._add_line_items(
+            order_key,
+            [new_line_item_data],
+            expected_item_count,
+        )[0]
+
+    def add_line_items_to_order(
+        self,
+        order_key: dict,
+        new_line_items_data: List[NewLineItemSchema or dict],
+    ) -> List[dict]:
+        """
+        Adds many LineItems to an Order entity, in chunks of up to
+        ADD_LINE_ITEMS_CHUNK_SIZE. Each chunk is written like a single
+        LineItem: embedded with one UpdateItem while the Order has room
+        for it, otherwise put in one transaction with the item_count
+        increment, so a chunk's ids are never reserved without its
+        LineItems being written. If a chunk can't be written, the
+        LineItems of the chunks before it stay added.
+
+        Parameters:
+            order_key (dict): DyanamoDB key of order {'pk':'value', 'sk':'value'}.
+            new_line_items_data: (List[NewLineItemSchema or dict]): Validated NewLineItemSchemas, or dictionaries of their data.
+
+        Returns:
+            line_item_dicts (List[dict]): Dictionaries that represent the saved LineItems.
+
+        Raises:
+            AddLineItemException: Occurs if the Order stays contended, after
+                the LineItems of the chunks before are added.
+            OrderLookupException: Occurs if the Order doesn't exist.
+        """
+        line_items: List[dict] = []
+        for start in range(0, len(new_line_items_data), ADD_LINE_ITEMS_CHUNK_SIZE):
+            try:
+                line_items.extend(
+                    self._add_line_items(
+                        order_key,
+                        new_line_items_data[start : start + ADD_LINE_ITEMS_CHUNK_SIZE],
+                    )
+                )
+            except AddLineItemException:
+                raise AddLineItemException(
+                    f"Unable to add line_items to Order, {len(line_items)} "
+                    f"of {len(new_line_items_data)} were added."
+                )
+
+        return line_items
+
+    def _add_line_items(
+        self,
+        order_key: dict,
+        new_line_items_data: List[NewLineItemSchema or dict],
+        expected_item_count: int = None,
+    ) -> List[dict]:
+        """
+        Adds up to ADD_LINE_ITEMS_CHUNK_SIZE LineItems to an Order, and
+        increments its item_count by their number, in a single request,
+        see add_line_item_to_order. When an Order's embedded LineItems
+        and the new ones don't fit in one transaction, the embedded
+        LineItems are moved to their own items first.
+
+        Raises:
+            AddLineItemException: Occurs if the Order stays contended.
+            OrderLookupException: Occurs if the Order doesn't exist.
+        """
+        client: DynamoDBClient = get_table(self.TABLE_NAME).meta.client
+        order_pk: str = order_key["pk"]
+        item_count, next_line_item_id, embedded = _item_count_hints.get(
+            order_pk, (None, None, None)
+        )
+        # Without a hint, the Order may predate next_line_item_id.
+        stored: bool or None = True if item_count is not None else None
+        if expected_item_count is not None:
+            item_count, next_line_item_id = expected_item_count, expected_item_count + 1
+            embedded = bool(MAX_EMBEDDED_LINE_ITEMS) if embedded is None else embedded
+        order_id: str = order_pk.replace(f"{DynamoOrder._PK_ENTITY}#", "")
+        count: int = len(new_line_items_data)
+
+        for _ in range(ADD_LINE_ITEM_MAX_ATTEMPTS):
+            order_item: dict or None = None
+            if item_count is None or (
+                embedded and item_count + count > MAX_EMBEDDED_LINE_ITEMS
+            ):
+                order_item = self._get_order_item(order_key)
+                item_count = int(order_item["item_count"])
+                next_line_item_id = self._get_next_line_item_id(order_key, order_item)
+                stored = "next_line_item_id" in order_item
+                embedded = "line_items" in order_item
+
+            line_items: List[dict] = [
+                LineItem.from_schema(
+                    new_line_item_data,
+                    id=str(next_line_item_id + index).zfill(2),
+                    order_id=order_id,
+                ).item
+                for index, new_line_item_data in enumerate(new_line_items_data)
+            ]
+            fits: bool = item_count + count <= MAX_EMBEDDED_LINE_ITEMS
+
+            try:
+                if not embedded:
+                    self._put_line_items(
+                        order_key, line_items, next_line_item_id, stored
+                    )
+                elif fits:
+                    self._embed_line_items(
+                        order_key, line_items, next_line_item_id, stored
+                    )
+                elif len(order_item["line_items"]) + count < TRANSACT_WRITE_ITEMS_LIMIT:
+                    self._spill_line_items(order_key, order_item, line_items)
+                else:
+                    self._spill_line_items(order_key, order_item)
+                    embedded = False
+                    continue
+            except (
+                client.exceptions.ConditionalCheckFailedException,
+                client.exceptions.TransactionCanceledException,
+            ):
+                _forget_item_count(order_pk)
+                item_count = None
+                continue
+
+            _remember_item_count(
+                order_pk,
+                item_count + count,
+                embedded and fits,
+                next_line_item_id + count,
+            )
+            return line_items
+
+        raise AddLineItemException("Unable to add line_item to Order")
+
+    def _put_line_items(
+        self,
+        order_key: dict,
+        line_items: List[dict],
+        next_line_item_id: int,
+        stored: bool or None = True,
+    ) -> None:
         """
-        table: _Table = boto3.resource("dynamodb").Table(self.TABLE_NAME)
+        Puts LineItems in their own items, in a transaction that adds
+        their number to the item_count of an Order that doesn't embed
+        LineItems, and moves its next_line_item_id past them. It only
+        succeeds if next_line_item_id is still the expected one, see
+        _next_line_item_id_condition, and none of the LineItems exist.
 
-        response: dict = table.update_item(
+        Raises:
+            TransactionCanceledException: Occurs if a condition fails.
+        """
+        (
+            condition_expression,
+            expression_attribute_values,
+        ) = _next_line_item_id_condition(next_line_item_id, stored)
+
+        self._transact_write_items(
+            [
+                {
+                    "Update": {
+                        "TableName": self.TABLE_NAME,
+                        "Key": order_key,
+                        "UpdateExpression": "SET #item_count = #item_count + :incr, #next_line_item_id = :next_line_item_id ADD #version :one",
+                        "ConditionExpression": f"{condition_expression} AND attribute_not_exists(#line_items)",
+                        "ExpressionAttributeNames": {
+                            "#item_count": "item_count",
+                            "#line_items": "line_items",
+                            "#next_line_item_id": "next_line_item_id",
+                            "#version": "version",
+                        },
+                        "ExpressionAttributeValues": {
+                            **expression_attribute_values,
+                            ":incr": len(line_items),
+                            ":next_line_item_id": next_line_item_id + len(line_items),
+                            ":one": 1,
+                        },
+                    },
+                },
+                *(
+                    {
+                        "Put": {
+                            "TableName": self.TABLE_NAME,
+                            "Item": line_item,
+                            "ConditionExpression": "attribute_not_exists(sk)",
+                        }
+                    }
+                    for line_item in line_items
+                ),
+            ],
+        )
+
+    def _embed_line_items(
+        self,
+        order_key: dict,
+        line_items: List[dict],
+        next_line_item_id: int,
+        stored: bool or None = True,
+    ) -> None:
+        """
+        Embeds LineItems in the line_items map of an Order item, with
+        one UpdateItem that adds their number to item_count and moves
+        next_line_item_id past them. It only succeeds if the Order
+        embeds LineItems, next_line_item_id is still the expected one,
+        see _next_line_item_id_condition, and none of the LineItems are
+        embedded yet.
+
+        Raises:
+            ConditionalCheckFailedException: Occurs if the condition fails.
+        """
+        (
+            condition_expression,
+            expression_attribute_values,
+        ) = _next_line_item_id_condition(next_line_item_id, stored)
+        expression_attribute_names: dict = {
+            "#item_count": "item_count",
+            "#line_items": "line_items",
+            "#next_line_item_id": "next_line_item_id",
+            "#version": "version",
+        }
+        expression_attribute_values.update(
+            {
+                ":incr": len(line_items),
+                ":next_line_item_id": next_line_item_id + len(line_items),
+                ":one": 1,
+            }
+        )
+        assignments: List[str] = [
+            "#item_count = #item_count + :incr",
+            "#next_line_item_id = :next_line_item_id",
+        ]
+        conditions: List[str] = [condition_expression, "attribute_exists(#line_items)"]
+        for index, line_item in enumerate(line_items):
+            expression_attribute_names[f"#l{index}"] = line_item["id"]
+            expression_attribute_values[f":l{index}"] = _to_embedded_line_item(
+                line_item
+            )
+            assignments.append(f"#line_items.#l{index} = :l{index}")
+            conditions.append(f"attribute_not_exists(#line_items.#l{index})")
+
+        get_table(self.TABLE_NAME).update_item(
             Key=order_key,
-            UpdateExpression="SET #item_count = #item_count + :incr",
-            ExpressionAttributeNames={"#item_count": "item_count"},
-            ExpressionAttributeValues={":incr": 1},
-            ReturnValues="UPDATED_NEW",
+            UpdateExpression=f"SET {', '.join(assignments)} ADD #version :one",
+            ConditionExpression=" AND ".join(conditions),
+            ExpressionAttributeNames=expression_attribute_names,
+            ExpressionAttributeValues=expression_attribute_values,
+        )
+
+    def _spill_line_items(
+        self,
+        order_key: dict,
+        order_item: dict,
+        line_items: List[dict] = (),
+    ) -> None:
+        """
+        Moves the LineItems embedded in order_item to their own items,
+        and puts any new line_items, in a transaction that removes the
+        Order's line_items map and moves next_line_item_id past the new
+        line_items. The transaction only succeeds while the Order's
+        version is still the one of order_item, and none of the new
+        line_items exist.
+
+        Raises:
+            TransactionCanceledException: Occurs if a condition fails.
+        """
+        condition_expression, expression_attribute_values = _version_condition(
+            order_item.get("version", 0)
+        )
+        expression_attribute_names: dict = {
+            "#item_count": "item_count",
+            "#line_items": "line_items",
+            "#version": "version",
+        }
+        expression_attribute_values.update({":incr": len(line_items), ":one": 1})
+        assignments: List[str] = ["#item_count = #item_count + :incr"]
+        if line_items:
+            expression_attribute_names["#next_line_item_id"] = "next_line_item_id"
+            expression_attribute_values[":next_line_item_id"] = (
+                int(line_items[-1]["id"]) + 1
+            )
+            assignments.append("#next_line_item_id = :next_line_item_id")
+        spilled_line_items: List[dict] = [
+            LineItem.from_item(line_item).item
+            for line_item in order_item.get("line_items", {}).values()
+        ]
+
+        self._transact_write_items(
+            [
+                {
+                    "Update": {
+                        "TableName": self.TABLE_NAME,
+                        "Key": order_key,
+                        "UpdateExpression": f"SET {', '.join(assignments)} REMOVE #line_items ADD #version :one",
+                        "ConditionExpression": f"attribute_exists(#line_items) AND {condition_expression}",
+                        "ExpressionAttributeNames": expression_attribute_names,
+                        "ExpressionAttributeValues": expression_attribute_values,
+                    },
+                },
+                *(
+                    {"Put": {"TableName": self.TABLE_NAME, "Item": line_item}}
+                    for line_item in spilled_line_items
+                ),
+                *(
+                    {
+                        "Put": {
+                            "TableName": self.TABLE_NAME,
+                            "Item": line_item,
+                            "ConditionExpression": "attribute_not_exists(sk)",
+                        }
+                    }
+                    for line_item in line_items
+                ),
+            ],
         )
 
-        item_count: Decimal = response["Attributes"]["item_count"]
-        new_line_item_data["id"] = str(item_count).zfill(2)
-        new_line_item_data["order_id"] = order_key["pk"].replace(
-            f"{DynamoOrder._PK_ENTITY}#", ""
+    def _transact_write_items(
+        self,
+        transact_items: List[dict],
+    ) -> None:
+        """
+        Runs a transaction, running it again with jittered backoff while
+        it's canceled by a TransactionConflict with another request. A
+        transaction canceled by a failed condition isn't retried.
+
+        Raises:
+            TransactionCanceledException: Occurs if a condition fails, or the conflicts persist.
+        """
+        client: DynamoDBClient = get_table(self.TABLE_NAME).meta.client
+
+        for attempt in range(CONFLICT_MAX_ATTEMPTS):
+            try:
+                client.transact_write_items(TransactItems=transact_items)
+                return
+            except client.exceptions.TransactionCanceledException as error:
+                if (
+                    not _is_transaction_conflict(error)
+                    or attempt + 1 == CONFLICT_MAX_ATTEMPTS
+                ):
+                    raise
+
+                backoff(attempt)
+
+    def _build_item(
+        self,
+        model: DynamoItem,
+    ) -> dict:
+        """
+        Returns the item save_items writes for a model. Orders get the
+        status_shard_index attributes create_order writes, so bulk saved
+        Orders are found by iter_orders_by_status.
+        """
+        if not isinstance(model, DynamoOrder):
+            return model.item
+
+        return {**model.item, **get_status_index_attributes(model.id, model.status)}
+
+    def _get_order_item(
+        self,
+        order_key: dict,
+    ) -> dict:
+        """
+        Reads an Order item, with any embedded LineItems, with a
+        consistent GetItem.
+
+        Parameters:
+            order_key (dict): DyanamoDB key of order {'pk':'value', 'sk':'value'}.
+
+        Returns:
+            order_item (dict): The Order item.
+
+        Raises:
+            OrderLookupException: Occurs if the Order doesn't exist.
+        """
+        order: dict = get_item(
+            key=order_key,
+            table_name=self.TABLE_NAME,
+            consistent_read=True,
         )
-        line_item: dict = LineItem(**new_line_item_data).item
-        table.put_item(Item=line_item)
-        return line_item
+        if not order:
+            raise OrderLookupException("Unable to locate Order.")
+
+        return order
+
+    def _get_next_line_item_id(
+        self,
+        order_key: dict,
+        order_item: dict,
+    ) -> int:
+        """
+        Returns the id of an Order's next LineItem. Orders written before
+        they had a next_line_item_id continue after their item_count, or
+        their highest LineItem id if one is higher, as LineItems may have
+        been removed since.
+
+        Parameters:
+            order_key (dict): DyanamoDB key of order {'pk':'value', 'sk':'value'}.
+            order_item (dict): The Order item, with any embedded LineItems.
+
+        Returns:
+            next_line_item_id (int): id of the next LineItem.
+        """
+        if "next_line_item_id" in order_item:
+            return int(order_item["next_line_item_id"])
+
+        if "line_items" in order_item:
+            ids: List[str] = list(order_item["line_items"])
+        else:
+            ids = [
+                line_item["id"]
+                for line_item in QueryIterator(
+                    Key("pk").eq(order_key["pk"])
+                    & Key("sk").begins_with(f"{LineItem._SK_ENTITY}#"),
+                    table_name=self.TABLE_NAME,
+                    attributes=["id"],
+                )
+            ]
+
+        return max([int(order_item["item_count"]), *map(int, ids)]) + 1
 
     def create_order(
         self,
-        new_order_data: dict,
+        new_order_data: NewOrderSchema or dict,
+        delivery_address: dict = None,
     ) -> DynamoOrder:
         """
         Accepts a new order payload and creates a new
-        order.
+        order. While MAX_EMBEDDED_LINE_ITEMS is set, the Order embeds
+        its first LineItems.
 
         Parameters:
-            new_order_data (dict): Dictionary of customer data (NewOrderSchema).
+            new_order_data (NewOrderSchema or dict): Validated NewOrderSchema, or a dictionary of order data.
+            delivery_address (dict): Stored DeliveryAddress fields, None if new_order_data holds them.
 
         Returns:
             order (DynamoOrder): Pydantic DynamoOrder model
         """
         id: ksuid = ksuid()
-        new_order_data["id"] = str(id)
-        new_order_data["datetime_created"] = id.getDatetime().strftime(
-            "%Y-%m-%dT%H:%M:%SZ"
+        values: dict = {
+            "id": str(id),
+            "datetime_created": id.getDatetime().strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "status": OrderStatus.NEW,
+        }
+        if delivery_address is not None:
+            values["delivery_address"] = delivery_address
+        order: DynamoOrder = DynamoOrder.from_schema(new_order_data, **values)
+        order_item: dict = {
+            **order.item,
+            "next_line_item_id": order.item_count + 1,
+            **get_status_index_attributes(order.id, order.status),
+        }
+        if MAX_EMBEDDED_LINE_ITEMS:
+            order_item["line_items"] = {}
+
+        put_item(order_item, self.TABLE_NAME)
+        _remember_item_count(
+            order.pk, order.item_count, embedded=bool(MAX_EMBEDDED_LINE_ITEMS)
         )
-        new_order_data["status"] = OrderStatus.NEW
-        order: DynamoOrder = DynamoOrder(**new_order_data)
-        put_item(order.item, self.TABLE_NAME)
 
         return order
 
@@ -130,10 +1007,6 @@ class OrderService(BaseService):
         id: str,
         deserialize=True,
     ) -> List[dict] or Order:
-        items: List[dict] = query_by_key_condition_expression(
-            Key("pk").eq(f"{DynamoOrder._PK_ENTITY}#{id}"),
-            table_name=self.TABLE_NAME,
-        )
         """
         Return an aggregate List of Dictionary items that make up a
         Domain Order, or an instantiated Order.
@@ -146,12 +1019,646 @@ class OrderService(BaseService):
             order (DyanmoOrder): Pydantic DynamoOrder model
             order (List[dict]): A list of Dictionary items that compose an Order
         """
-        if not items:
-            return None
+        items: QueryIterator = QueryIterator(
+            Key("pk").eq(f"{DynamoOrder._PK_ENTITY}#{id}"),
+            table_name=self.TABLE_NAME,
+        )
 
         if not deserialize:
-            return items
+            return list(items) or None
 
+        return self._build_domain_order(items)
+
+    def get_domain_order_etag(
+        self,
+        id: str,
+    ) -> str or None:
+        """
+        Returns the current ETag of an Order aggregate, read with a
+        GetItem of the Order's version attributes only.
+
+        Parameters:
+            id (str): Order id.
+
+        Returns:
+            etag (str): Quoted entity tag, None if no Order is found.
+        """
+        order_item: dict or None = get_item(
+            key=DynamoOrder.calculate_key(id),
+            table_name=self.TABLE_NAME,
+            attributes=ORDER_VERSION_ATTRIBUTES,
+        )
+
+        return calculate_order_etag(order_item) if order_item else None
+
+    def get_domain_order_by_etag(
+        self,
+        id: str,
+        etag: str = None,
+    ) -> Tuple[Order or None, str or None]:
+        """
+        Returns an Order aggregate and its ETag. When the aggregate this
+        container last built still has the given etag, it's returned
+        without querying the Order's partition.
+
+        Parameters:
+            id (str): Order id to retrieve.
+            etag (str): Current ETag of the Order, see get_domain_order_etag.
+
+        Returns:
+            order (Order): Pydantic Order model, None if no Order is found.
+            etag (str): ETag of the returned Order.
+        """
+        order_pk: str = f"{DynamoOrder._PK_ENTITY}#{id}"
+        cached_etag, order = _domain_orders.get(order_pk, (None, None))
+        if etag and cached_etag == etag:
+            _domain_orders.move_to_end(order_pk)
+            return order, etag
+
+        items: List[dict] = list(
+            QueryIterator(Key("pk").eq(order_pk), table_name=self.TABLE_NAME)
+        )
+        order_item: dict or None = next(
+            (item for item in items if item["entity"] == DynamoOrder._PK_ENTITY),
+            None,
+        )
+        if not order_item:
+            return None, None
+
+        etag = calculate_order_etag(order_item)
+        order = self._build_domain_order(items)
+        _remember_domain_order(order_pk, etag, order)
+
+        return order, etag
+
+    def get_domain_order_fields(
+        self,
+        id: str,
+        fields: List[str],
+    ) -> dict or None:
+        """
+        Returns a Dictionary of the requested fields of an Order. Only
+        the requested attributes are read, with a GetItem of the Order
+        item unless line_items is requested, in which case the partition
+        is queried.
+
+        Parameters:
+            id (str): Order id to retrieve.
+            fields (List[str]): Fields of the Order to return.
+
+        Returns:
+            order_fields (dict): Requested fields of the Order, None if no Order is found.
+
+        Raises:
+            InvalidFieldsException: Occurs if a field isn't a field of an Order.
+        """
+        fields = list(dict.fromkeys(fields))
+        invalid_fields: List[str] = [
+            field for field in fields if field not in Order.__fields__
+        ]
+        if invalid_fields:
+            raise InvalidFieldsException(f"Invalid fields: {', '.join(invalid_fields)}")
+
+        order_fields: List[str] = [field for field in fields if field != "line_items"]
+        if len(order_fields) == len(fields):
+            order_item: dict or None = get_item(
+                key=DynamoOrder.calculate_key(id),
+                table_name=self.TABLE_NAME,
+                attributes=[*order_fields, "pk"],
+            )
+            line_item_items: List[dict] = []
+        else:
+            items: List[dict] = list(
+                QueryIterator(
+                    Key("pk").eq(f"{DynamoOrder._PK_ENTITY}#{id}"),
+                    table_name=self.TABLE_NAME,
+                    attributes=list(
+                        dict.fromkeys(
+                            [
+                                *order_fields,
+                                *LineItem.__fields__,
+                                "entity",
+                                "line_items",
+                            ]
+                        )
+                    ),
+                )
+            )
+            order_item = next(
+                (item for item in items if item["entity"] == DynamoOrder._PK_ENTITY),
+                None,
+            )
+            line_item_items = [
+                item for item in items if item["entity"] == LineItem._SK_ENTITY
+            ]
+            if order_item:
+                line_item_items[:0] = _get_embedded_line_items(order_item)
+
+        if not order_item:
+            return None
+
+        order_dict: dict = {field: order_item.get(field) for field in order_fields}
+        if len(order_fields) != len(fields):
+            order_dict["line_items"] = [
+                {field: item.get(field) for field in LineItem.__fields__}
+                for item in line_item_items
+            ]
+
+        return order_dict
+
+    def list_orders_for_customer(
+        self,
+        email: str,
+        limit: int = 20,
+        cursor: str = None,
+        created_after: datetime = None,
+        created_before: datetime = None,
+        newest_first: bool = True,
+    ) -> Tuple[List[DynamoOrder], str or None]:
+        """
+        Returns a page of a Customer's Orders from the
+        customer_email_id_index. Order ids are KSUIDs, so the index
+        keeps each Customer's Orders in creation order, and created_after
+        and created_before become a range on the id.
+
+        Parameters:
+            email (str): email of the Customer.
+            limit (int): Maximum number of Orders to return.
+            cursor (str): Cursor returned with the previous page.
+            created_after (datetime): Only Orders created at or after this moment, naive is UTC.
+            created_before (datetime): Only Orders created at or before this moment, naive is UTC.
+            newest_first (bool): False returns the oldest Orders first.
+
+        Returns:
+            orders (List[DynamoOrder]): Pydantic DynamoOrder models.
+            cursor (str): Cursor of the next page, None on the last page.
+
+        Raises:
+            InvalidCursorException: Occurs if the cursor can't be decoded.
+        """
+        key_condition_expression = Key("customer_email").eq(email)
+        if created_after and created_before:
+            key_condition_expression &= Key("id").between(
+                _ksuid_bound(created_after),
+                _ksuid_bound(created_before, upper=True),
+            )
+        elif created_after:
+            key_condition_expression &= Key("id").gte(_ksuid_bound(created_after))
+        elif created_before:
+            key_condition_expression &= Key("id").lte(
+                _ksuid_bound(created_before, upper=True)
+            )
+
+        items: QueryIterator = QueryIterator(
+            key_condition_expression,
+            index_name=CUSTOMER_ORDERS_INDEX,
+            table_name=self.TABLE_NAME,
+            limit=limit,
+            scan_index_forward=not newest_first,
+            cursor=cursor,
+        )
+        orders: List[DynamoOrder] = [DynamoOrder.from_item(item) for item in items]
+
+        return orders, items.cursor
+
+    def update_order_status(
+        self,
+        id: str,
+        status: OrderStatus,
+        expected_version: int = None,
+    ) -> None:
+        """
+        Sets an Order's status with a single UpdateItem. Non-terminal
+        statuses move the Order to the matching status_shard_index
+        partition, terminal statuses remove status_shard so the Order
+        leaves the sparse index.
+
+        Parameters:
+            id (str): id of the Order.
+            status (OrderStatus): New status of the Order.
+            expected_version (int): Only update the Order while it's at this version.
+
+        Returns:
+            None
+
+        Raises:
+            OrderLookupException: Occurs if the Order doesn't exist.
+            VersionConflictException: Occurs if the Order isn't at expected_version.
+        """
+        self._update_order(id, {"status": status}, expected_version)
+
+    def compare_and_swap_order(
+        self,
+        id: str,
+        expected_version: int,
+        changes: dict,
+    ) -> DynamoOrder:
+        """
+        Sets fields of an Order with a single UpdateItem, only if the
+        Order is still at expected_version. Setting status keeps the
+        status_shard_index current, as update_order_status does.
+
+        Parameters:
+            id (str): id of the Order.
+            expected_version (int): Version of the Order the changes were made from.
+            changes (dict): New values of the Order's fields.
+
+        Returns:
+            order (DynamoOrder): Pydantic DynamoOrder model of the updated Order.
+
+        Raises:
+            InvalidFieldsException: Occurs if a field can't be set.
+            OrderLookupException: Occurs if the Order doesn't exist.
+            VersionConflictException: Occurs if the Order isn't at expected_version.
+        """
+        _check_order_changes(changes)
+
+        return DynamoOrder.from_item(self._update_order(id, changes, expected_version))
+
+    def update_order(
+        self,
+        order: DynamoOrder,
+        expected_version: int = None,
+    ) -> DynamoOrder:
+        """
+        Saves the fields of an Order assigned since it was built, with
+        an UpdateItem that only SETs, or REMOVEs, those fields instead of
+        putting the whole item. The Order doesn't need to be read first,
+        a DynamoOrder.construct(id=id) with the changed fields assigned
+        is enough. A new status must be allowed by ORDER_STATUS_TRANSITIONS.
+
+        Parameters:
+            order (DynamoOrder): Order with dirty fields.
+            expected_version (int): Only update the Order while it's at this version.
+
+        Returns:
+            order (DynamoOrder): Pydantic DynamoOrder model of the updated Order.
+
+        Raises:
+            InvalidFieldsException: Occurs if a dirty field can't be set.
+            OrderLookupException: Occurs if the Order doesn't exist.
+            OrderStatusException: Occurs if the Order can't move to the new status.
+            VersionConflictException: Occurs if the Order isn't at expected_version.
+        """
+        changes: dict = order.changes
+        if not changes:
+            return order
+
+        _check_order_changes(changes)
+        updated_order: DynamoOrder = DynamoOrder.from_item(
+            self._update_order(
+                order.id,
+                changes,
+                expected_version,
+                previous_order_statuses(changes["status"])
+                if "status" in changes
+                else None,
+            )
+        )
+        order.mark_clean()
+
+        return updated_order
+
+    def mutate_order(
+        self,
+        id: str,
+        mutation: Callable[[DynamoOrder], dict],
+        max_attempts: int = CONFLICT_MAX_ATTEMPTS,
+    ) -> DynamoOrder:
+        """
+        Reads an Order with a consistent GetItem, and writes the changes
+        mutation returns for it with compare_and_swap_order. When the
+        Order is written in between, it's read and mutated again.
+
+        Parameters:
+            id (str): id of the Order.
+            mutation (Callable[[DynamoOrder], dict]): Returns the changes to make to the Order.
+            max_attempts (int): Maximum number of read and write attempts.
+
+        Returns:
+            order (DynamoOrder): Pydantic DynamoOrder model of the updated Order.
+
+        Raises:
+            InvalidFieldsException: Occurs if a field can't be set.
+            OrderLookupException: Occurs if the Order doesn't exist.
+            VersionConflictException: Occurs if every attempt conflicts.
+        """
+
+        def attempt() -> DynamoOrder:
+            order: DynamoOrder = DynamoOrder.from_item(
+                self._get_order_item(DynamoOrder.calculate_key(id))
+            )
+            changes: dict = mutation(order)
+            if not changes:
+                return order
+
+            return self.compare_and_swap_order(id, order.version, changes)
+
+        return retry_on_conflict(attempt, max_attempts)
+
+    def transition_order_status(
+        self,
+        id: str,
+        status: OrderStatus,
+        expected_version: int = None,
+    ) -> DynamoOrder:
+        """
+        Moves an Order to a status, with a single UpdateItem conditioned
+        on the Order being in a status ORDER_STATUS_TRANSITIONS allows
+        moving from.
+
+        Parameters:
+            id (str): id of the Order.
+            status (OrderStatus): New status of the Order.
+            expected_version (int): Only update the Order while it's at this version.
+
+        Returns:
+            order (DynamoOrder): Pydantic DynamoOrder model of the updated Order.
+
+        Raises:
+            OrderLookupException: Occurs if the Order doesn't exist.
+            OrderStatusException: Occurs if the Order can't move to status.
+            VersionConflictException: Occurs if the Order isn't at expected_version.
+        """
+        status = OrderStatus(status)
+
+        return DynamoOrder.from_item(
+            self._update_order(
+                id,
+                {"status": status},
+                expected_version,
+                previous_order_statuses(status),
+            )
+        )
+
+    def transition_orders_status(
+        self,
+        ids: List[str],
+        status: OrderStatus,
+        max_workers: int = TRANSITION_MAX_WORKERS,
+    ) -> BulkTransitionReport:
+        """
+        Moves many Orders to a status with transition_order_status, at
+        most max_workers at a time. Throttled requests are retried with
+        jittered backoff. An Order that fails doesn't stop the others,
+        each one's outcome is reported.
+
+        Parameters:
+            ids (List[str]): ids of the Orders, duplicates are moved once.
+            status (OrderStatus): New status of the Orders.
+            max_workers (int): Maximum number of concurrent requests.
+
+        Returns:
+            report (BulkTransitionReport): Outcome of each Order.
+        """
+        status = OrderStatus(status)
+        started: float = monotonic()
+
+        def transition(id: str) -> OrderTransitionResult:
+            for attempt in range(BATCH_MAX_ATTEMPTS):
+                try:
+                    order: DynamoOrder = self.transition_order_status(id, status)
+                except ClientError as e:
+                    if (
+                        e.response["Error"]["Code"] not in THROTTLING_ERROR_CODES
+                        or attempt + 1 == BATCH_MAX_ATTEMPTS
+                    ):
+                        return OrderTransitionResult(
+                            id=id,
+                            succeeded=False,
+                            error=e.response["Error"]["Code"],
+                            attempts=attempt + 1,
+                        )
+
+                    backoff(attempt)
+                    continue
+                except (
+                    OrderLookupException,
+                    OrderStatusException,
+                    VersionConflictException,
+                ) as e:
+                    return OrderTransitionResult(
+                        id=id, succeeded=False, error=str(e), attempts=attempt + 1
+                    )
+
+                return OrderTransitionResult(
+                    id=id, succeeded=True, version=order.version, attempts=attempt + 1
+                )
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results: List[OrderTransitionResult] = list(
+                executor.map(transition, dict.fromkeys(ids))
+            )
+
+        succeeded: int = sum(result.succeeded for result in results)
+        return BulkTransitionReport(
+            status=status,
+            succeeded=succeeded,
+            failed=len(results) - succeeded,
+            retries=sum(result.attempts - 1 for result in results),
+            elapsed_seconds=monotonic() - started,
+            results=results,
+        )
+
+    def _update_order(
+        self,
+        id: str,
+        changes: dict,
+        expected_version: int = None,
+        from_statuses: Tuple[OrderStatus] = None,
+    ) -> dict:
+        """
+        Sets fields of an Order with a single UpdateItem that adds 1 to
+        its version, and returns the updated Order item. Fields changed
+        to None are removed. With from_statuses, the Order is only
+        updated while it's in one of them. An empty from_statuses is
+        raised before any request, DynamoDB rejects an empty IN ().
+
+        Raises:
+            OrderLookupException: Occurs if the Order doesn't exist.
+            OrderStatusException: Occurs if the Order isn't in one of from_statuses.
+            VersionConflictException: Occurs if the Order isn't at expected_version.
+        """
+        if from_statuses is not None and not from_statuses:
+            raise OrderStatusException(
+                f"Orders can't move to {OrderStatus(changes['status']).value}."
+            )
+
+        expression_attribute_names: dict = {"#version": "version"}
+        expression_attribute_values: dict = {":one": 1}
+        assignments: List[str] = []
+        removals: List[str] = []
+
+        for index, (field, value) in enumerate(changes.items()):
+            expression_attribute_names[f"#f{index}"] = field
+            if value is None:
+                removals.append(f"#f{index}")
+                continue
+
+            if field == "status":
+                value = OrderStatus(value)
+
+            expression_attribute_values[f":f{index}"] = to_dynamo_value(value)
+            assignments.append(f"#f{index} = :f{index}")
+
+        if "status" in changes:
+            status: OrderStatus = OrderStatus(changes["status"])
+            expression_attribute_names["#status_changed"] = "status_changed"
+            expression_attribute_names["#status_shard"] = "status_shard"
+            expression_attribute_values[":status_changed"] = _status_changed()
+            assignments.append("#status_changed = :status_changed")
+
+            if status in TERMINAL_ORDER_STATUSES:
+                removals.append("#status_shard")
+            else:
+                expression_attribute_values[":status_shard"] = calculate_status_shard(
+                    id, status
+                )
+                assignments.append("#status_shard = :status_shard")
+
+        update_expression: str = ""
+        if assignments:
+            update_expression += f"SET {', '.join(assignments)} "
+        if removals:
+            update_expression += f"REMOVE {', '.join(removals)} "
+        update_expression += "ADD #version :one"
+
+        condition_expression: str = "attribute_exists(pk)"
+        if expected_version is not None:
+            version_condition, version_values = _version_condition(expected_version)
+            condition_expression += f" AND {version_condition}"
+            expression_attribute_values.update(version_values)
+
+        if from_statuses is not None:
+            expression_attribute_names["#current_status"] = "status"
+            expression_attribute_values.update(
+                {
+                    f":from{index}": OrderStatus(from_status).value
+                    for index, from_status in enumerate(from_statuses)
+                }
+            )
+            condition_expression += " AND #current_status IN ({})".format(
+                ", ".join(f":from{index}" for index in range(len(from_statuses)))
+            )
+
+        # The resource's client is thread safe, unlike the resource.
+        client: DynamoDBClient = get_table(self.TABLE_NAME).meta.client
+        try:
+            response: dict = client.update_item(
+                TableName=self.TABLE_NAME,
+                Key=DynamoOrder.calculate_key(id),
+                UpdateExpression=update_expression,
+                ConditionExpression=condition_expression,
+                ExpressionAttributeNames=expression_attribute_names,
+                ExpressionAttributeValues=expression_attribute_values,
+                ReturnValues="ALL_NEW",
+            )
+        except client.exceptions.ConditionalCheckFailedException:
+            self._raise_condition_failure(id, expected_version, from_statuses)
+            raise OrderLookupException("Unable to locate Order.")
+
+        return response["Attributes"]
+
+    def _raise_condition_failure(
+        self,
+        id: str,
+        expected_version: int = None,
+        from_statuses: Tuple[OrderStatus] = None,
+    ) -> None:
+        """
+        Reads an Order after a conditional write of it failed, and
+        raises the exception of the condition it doesn't meet. Nothing
+        is raised if the Order doesn't exist, or now meets them all.
+
+        Raises:
+            VersionConflictException: Occurs if the Order exists at another version.
+            OrderStatusException: Occurs if the Order's status can't move to the new one.
+        """
+        if expected_version is None and from_statuses is None:
+            return
+
+        # Read with the client, transition_orders_status calls this from threads.
+        client: DynamoDBClient = get_table(self.TABLE_NAME).meta.client
+        order_item: dict or None = client.get_item(
+            TableName=self.TABLE_NAME,
+            Key=DynamoOrder.calculate_key(id),
+            ConsistentRead=True,
+            **projection_parameters(["version", "status"]),
+        ).get("Item")
+        if order_item is None:
+            return
+
+        if (
+            expected_version is not None
+            and order_item.get("version", 0) != expected_version
+        ):
+            raise VersionConflictException(
+                f"Order is at version {order_item.get('version', 0)}, "
+                f"not {expected_version}."
+            )
+
+        if from_statuses is not None and order_item["status"] not in from_statuses:
+            raise OrderStatusException(
+                f"A {order_item['status']} Order can't move to this status."
+            )
+
+    def iter_orders_by_status(
+        self,
+        status: OrderStatus,
+        since: datetime = None,
+        page_size: int = 100,
+    ) -> Generator[DynamoOrder, None, None]:
+        """
+        Lazily yields the Orders that are in a non-terminal status,
+        oldest status change first. Every shard of the status is queried
+        page by page, and the shards are merged on status_changed. A
+        worker can resume with the status_changed of the last Order it
+        handled as since.
+
+        Parameters:
+            status (OrderStatus): Non-terminal status of the Orders.
+            since (datetime): Only Orders whose status changed after this moment, naive is UTC.
+            page_size (int): Maximum number of items requested per page and shard.
+
+        Returns:
+            orders (Generator[DynamoOrder]): Pydantic DynamoOrder models.
+
+        Raises:
+            OrderStatusException: Occurs if the status is terminal, and so isn't indexed.
+        """
+        status = OrderStatus(status)
+        if status in TERMINAL_ORDER_STATUSES:
+            raise OrderStatusException(f"{status.value} Orders aren't indexed.")
+
+        shards: List[QueryIterator] = []
+        for shard in range(ORDER_STATUS_SHARDS):
+            key_condition_expression = Key("status_shard").eq(f"{status.value}#{shard}")
+            if since:
+                key_condition_expression &= Key("status_changed").gt(
+                    _to_utc(since).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+                )
+
+            shards.append(
+                QueryIterator(
+                    key_condition_expression,
+                    index_name=STATUS_INDEX,
+                    table_name=self.TABLE_NAME,
+                    page_size=page_size,
+                )
+            )
+
+        for item in merge(*shards, key=lambda item: item["status_changed"]):
+            yield DynamoOrder.from_item(item)
+
+    def _build_domain_order(
+        self,
+        items: Iterable[dict],
+    ) -> Order or None:
+        """
+        Instantiates an Order from the items of its partition, None
+        if there is no Order item among them. Embedded LineItems come
+        first, an Order only has both while it's being converted.
+        """
         order_dict: dict = {}
         line_items: List[dict] = []
 
@@ -162,9 +1669,15 @@ class OrderService(BaseService):
             if item["entity"] == LineItem._SK_ENTITY:
                 line_items.append(item)
 
-        order_dict["line_items"] = line_items
+        if not order_dict:
+            return None
+
+        order_dict["line_items"] = [
+            *_get_embedded_line_items(order_dict),
+            *line_items,
+        ]
 
-        return Order(**order_dict)
+        return Order.from_item(order_dict)
 
     def get_domain_order_by_key(
         self,
@@ -227,48 +1740,90 @@ class OrderService(BaseService):
         if not deserialize or not item:
             return item
 
-        return DynamoOrder(**item)
+        return DynamoOrder.from_item(item)
 
     def remove_line_from_order(
         self,
         order_id: str,
         line_item_id: int,
+        expected_version: int = None,
     ) -> None:
         """
-        Removes a LineItem from an Order.
+        Removes a LineItem from an Order. An embedded LineItem is
+        removed from the Order item with one UpdateItem, a LineItem in
+        its own item is deleted in a transaction with the Order's update.
+        The UpdateItem is tried first while MAX_EMBEDDED_LINE_ITEMS is
+        set, unless this container knows the Order doesn't embed LineItems.
+        Only LineItems in their own items need a transaction, as the
+        removal spans two items.
 
         Parameters:
             order_id (dict): id of the Order.
             line_item_id (int): id of the LineItem to remove.
+            expected_version (int): Only remove the LineItem while the Order is at this version.
 
         Returns:
             None
 
         Raises:
             RemoveLineItemException.
+            VersionConflictException: Occurs if the Order isn't at expected_version.
         """
         order_key: dict = DynamoOrder.calculate_key(order_id)
         line_item_key: dict = LineItem.calculate_key(order_id, line_item_id)
+        _, _, embedded = _item_count_hints.get(
+            order_key["pk"], (None, None, bool(MAX_EMBEDDED_LINE_ITEMS))
+        )
 
-        client: _Table = boto3.resource("dynamodb").Table(self.TABLE_NAME)
+        condition_expression: str = "#status IN (:new)"
+        expression_attribute_values: dict = {":inc": 1, ":new": OrderStatus.NEW}
+        if expected_version is not None:
+            version_condition, version_values = _version_condition(expected_version)
+            condition_expression += f" AND {version_condition}"
+            expression_attribute_values.update(version_values)
+
+        client: _Table = get_table(self.TABLE_NAME)
 
         try:
-            client.meta.client.transact_write_items(
-                TransactItems=[
+            if embedded:
+                try:
+                    client.update_item(
+                        Key=order_key,
+                        UpdateExpression=(
+                            "SET #item_count = #item_count - :inc "
+                            "REMOVE #line_items.#line_item_id ADD #version :inc"
+                        ),
+                        ConditionExpression=(
+                            f"{condition_expression} "
+                            "AND attribute_exists(#line_items.#line_item_id)"
+                        ),
+                        ExpressionAttributeNames={
+                            "#item_count": "item_count",
+                            "#line_items": "line_items",
+                            "#line_item_id": str(line_item_id),
+                            "#status": "status",
+                            "#version": "version",
+                        },
+                        ExpressionAttributeValues=expression_attribute_values,
+                    )
+                    return
+                except client.meta.client.exceptions.ConditionalCheckFailedException:
+                    pass
+
+            self._transact_write_items(
+                [
                     {
                         "Update": {
                             "TableName": self.TABLE_NAME,
                             "Key": order_key,
-                            "UpdateExpression": "SET #item_count = #item_count - :inc",
+                            "UpdateExpression": "SET #item_count = #item_count - :inc ADD #version :inc",
                             "ExpressionAttributeNames": {
                                 "#item_count": "item_count",
                                 "#status": "status",
+                                "#version": "version",
                             },
-                            "ExpressionAttributeValues": {
-                                ":inc": 1,
-                                ":new": OrderStatus.NEW,
-                            },
-                            "ConditionExpression": "#status IN (:new)",
+                            "ExpressionAttributeValues": expression_attribute_values,
+                            "ConditionExpression": condition_expression,
                         },
                     },
                     {
@@ -281,4 +1836,105 @@ class OrderService(BaseService):
                 ],
             )
         except client.meta.client.exceptions.TransactionCanceledException:
+            self._raise_condition_failure(order_id, expected_version)
             raise RemoveLineItemException("Unable to remove line_item from Order")
+        finally:
+            _forget_item_count(order_key["pk"])
+
+    def convert_line_item_layout(
+        self,
+        id: str,
+        embedded: bool,
+    ) -> bool:
+        """
+        Converts an Order to the given LineItem layout, in a single
+        transaction. Embedding deletes the LineItem items and writes
+        them to the Order's line_items map, it's skipped when the Order
+        holds more than MAX_EMBEDDED_LINE_ITEMS. The transaction only
+        succeeds if the Order isn't written in the meantime.
+
+        Parameters:
+            id (str): id of the Order.
+            embedded (bool): True to embed the LineItems, False to move them to their own items.
+
+        Returns:
+            converted (bool): Whether the Order was converted, False if it already
+                had the layout, holds too many LineItems or was written concurrently.
+
+        Raises:
+            OrderLookupException: Occurs if the Order doesn't exist.
+        """
+        order_key: dict = DynamoOrder.calculate_key(id)
+        client: DynamoDBClient = get_table(self.TABLE_NAME).meta.client
+        _forget_item_count(order_key["pk"])
+
+        if not embedded:
+            order_item: dict = self._get_order_item(order_key)
+            if "line_items" not in order_item:
+                return False
+
+            try:
+                self._spill_line_items(order_key, order_item)
+            except client.exceptions.TransactionCanceledException:
+                return False
+
+            return True
+
+        items: List[dict] = list(
+            QueryIterator(Key("pk").eq(order_key["pk"]), table_name=self.TABLE_NAME)
+        )
+        order_item = next(
+            (item for item in items if item["entity"] == DynamoOrder._PK_ENTITY),
+            None,
+        )
+        if not order_item:
+            raise OrderLookupException("Unable to locate Order.")
+
+        line_items: List[dict] = [
+            item for item in items if item["entity"] == LineItem._SK_ENTITY
+        ]
+        if "line_items" in order_item or len(line_items) > MAX_EMBEDDED_LINE_ITEMS:
+            return False
+
+        condition_expression, expression_attribute_values = _version_condition(
+            order_item.get("version", 0)
+        )
+        try:
+            self._transact_write_items(
+                [
+                    {
+                        "Update": {
+                            "TableName": self.TABLE_NAME,
+                            "Key": order_key,
+                            "UpdateExpression": "SET #line_items = :line_items ADD #version :one",
+                            "ConditionExpression": f"attribute_not_exists(#line_items) AND {condition_expression}",
+                            "ExpressionAttributeNames": {
+                                "#line_items": "line_items",
+                                "#version": "version",
+                            },
+                            "ExpressionAttributeValues": {
+                                **expression_attribute_values,
+                                ":line_items": {
+                                    line_item["id"]: _to_embedded_line_item(line_item)
+                                    for line_item in line_items
+                                },
+                                ":one": 1,
+                            },
+                        },
+                    },
+                    *(
+                        {
+                            "Delete": {
+                                "TableName": self.TABLE_NAME,
+                                "Key": {"pk": line_item["pk"], "sk": line_item["sk"]},
+                                "ConditionExpression": "attribute_exists(sk)",
+                            },
+                        }
+                        for line_item in line_items
+                    ),
+                ],
+            )
+        except client.exceptions.TransactionCanceledException:
+            return False
+
+        return True
@@ -3,6 +3,8 @@ import moto
 import pytest
 
 from src.constants import TABLE_NAME
+from src.dynamodb.connection import reset_connections
+from src.services.cache import item_cache
 from tests.fixtures import *
 
 
@@ -13,6 +15,8 @@ def secret_key():
 
 @pytest.fixture(scope="function", autouse=True)
 def mock_aws_table():
+    reset_connections()
+    item_cache.clear()
     with moto.mock_dynamodb2():
         boto3.client("dynamodb").create_table(
             TableName=TABLE_NAME,
@@ -23,16 +27,37 @@ def mock_aws_table():
             AttributeDefinitions=[
                 {"AttributeName": "pk", "AttributeType": "S"},
                 {"AttributeName": "sk", "AttributeType": "S"},
+                {"AttributeName": "username", "AttributeType": "S"},
+                {"AttributeName": "customer_email", "AttributeType": "S"},
+                {"AttributeName": "id", "AttributeType": "S"},
+                {"AttributeName": "status_shard", "AttributeType": "S"},
+                {"AttributeName": "status_changed", "AttributeType": "S"},
             ],
             GlobalSecondaryIndexes=[
                 {
-                    "IndexName": "sk_pk_index",
+                    "IndexName": "username_index",
                     "Projection": {"ProjectionType": "ALL"},
                     "KeySchema": [
-                        {"AttributeName": "sk", "KeyType": "HASH"},
-                        {"AttributeName": "pk", "KeyType": "RANGE"},
+                        {"AttributeName": "username", "KeyType": "HASH"},
                     ],
-                }
+                },
+                {
+                    "IndexName": "customer_email_id_index",
+                    "Projection": {"ProjectionType": "ALL"},
+                    "KeySchema": [
+                        {"AttributeName": "customer_email", "KeyType": "HASH"},
+                        {"AttributeName": "id", "KeyType": "RANGE"},
+                    ],
+                },
+                {
+                    "IndexName": "status_shard_index",
+                    "Projection": {"ProjectionType": "ALL"},
+                    "KeySchema": [
+                        {"AttributeName": "status_shard", "KeyType": "HASH"},
+                        {"AttributeName": "status_changed", "KeyType": "RANGE"},
+                    ],
+                },
             ],
         )
         yield
+    reset_connections()
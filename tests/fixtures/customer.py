@@ -4,7 +4,7 @@ from copy import deepcopy
 import pytest
 
 from src.dynamodb.helpers import put_item
-from src.models.customer import Customer
+from src.models.customer import Customer, Username
 
 
 @pytest.fixture
@@ -26,6 +26,12 @@ def persisted_customer_ddb_dict(
     customer_ddb_dict: dict,
 ) -> dict:
     put_item(customer_ddb_dict)
+    put_item(
+        Username(
+            name=customer_ddb_dict["username"],
+            email=customer_ddb_dict["email"],
+        ).item
+    )
 
     return customer_ddb_dict
 
@@ -0,0 +1,118 @@
+import gzip
+import zlib
+from base64 import b64decode
+
+import pytest
+
+from src.apigateway.responses import HttpResponse, negotiate_content_encoding
+
+BODY: dict = {"line_items": [{"name": "Popplers", "quantity": 100}] * 50}
+
+
+def accepting(accept_encoding: str) -> dict:
+    return {"headers": {"Accept-Encoding": accept_encoding}}
+
+
+@pytest.mark.parametrize(
+    "accept_encoding,content_encoding",
+    [
+        ("gzip, deflate, br", "gzip"),
+        ("deflate, gzip", "gzip"),
+        ("gzip;q=0.5, deflate", "deflate"),
+        ("GZIP ; Q=0.8", "gzip"),
+        ("br", None),
+        ("gzip;q=0, deflate;q=0", None),
+        ("*", "gzip"),
+        ("gzip;q=0, *;q=0.1", "deflate"),
+        ("gzip;q=invalid", None),
+        ("", None),
+    ],
+)
+def test_negotiate_content_encoding(
+    accept_encoding: str,
+    content_encoding: str or None,
+) -> None:
+    assert negotiate_content_encoding(accepting(accept_encoding)) == content_encoding
+
+
+def test_negotiate_content_encoding_without_header() -> None:
+    assert negotiate_content_encoding({"headers": None}) is None
+
+
+class TestHttpResponseCompress:
+    def test_compress_gzip(self) -> None:
+        response: HttpResponse = HttpResponse(status_code=200, body=BODY)
+        body: str = response["body"]
+
+        assert response.compress(accepting("gzip"), min_bytes=1) is response
+        assert response["isBase64Encoded"]
+        assert response["headers"]["Content-Encoding"] == "gzip"
+        assert response["headers"]["Vary"] == "Accept-Encoding"
+        assert gzip.decompress(b64decode(response["body"])).decode() == body
+
+    def test_compress_deflate(self) -> None:
+        response: HttpResponse = HttpResponse(status_code=200, body=BODY)
+        body: str = response["body"]
+
+        response.compress(accepting("deflate"), min_bytes=1)
+
+        assert response["headers"]["Content-Encoding"] == "deflate"
+        assert zlib.decompress(b64decode(response["body"])).decode() == body
+
+    def test_compress_skips_small_bodies(self) -> None:
+        response: HttpResponse = HttpResponse(status_code=200, body=BODY)
+        body: str = response["body"]
+
+        response.compress(accepting("gzip"), min_bytes=len(body) + 1)
+
+        assert response["body"] == body
+        assert not response["isBase64Encoded"]
+        assert "Content-Encoding" not in response["headers"]
+        assert "Vary" not in response["headers"]
+
+    def test_compress_varies_without_accepted_encoding(self) -> None:
+        response: HttpResponse = HttpResponse(status_code=200, body=BODY)
+        body: str = response["body"]
+
+        response.compress({}, min_bytes=1)
+
+        assert response["body"] == body
+        assert not response["isBase64Encoded"]
+        assert "Content-Encoding" not in response["headers"]
+        assert response["headers"]["Vary"] == "Accept-Encoding"
+
+    def test_compress_extends_vary(self) -> None:
+        response: HttpResponse = HttpResponse(
+            status_code=200, body=BODY, headers={"Vary": "Origin"}
+        )
+
+        response.compress(accepting("gzip"), min_bytes=1)
+
+        assert response["headers"]["Vary"] == "Origin, Accept-Encoding"
+
+    def test_compress_weakens_etag(self) -> None:
+        response: HttpResponse = HttpResponse(
+            status_code=200, body=BODY, etag='"1.0.1"'
+        )
+
+        response.compress(accepting("gzip"), min_bytes=1)
+
+        assert response["headers"]["ETag"] == 'W/"1.0.1"'
+
+    def test_compress_skips_incompressible_bodies(self) -> None:
+        response: HttpResponse = HttpResponse(status_code=200, body='"a"')
+
+        response.compress(accepting("gzip"), min_bytes=1)
+
+        assert response["body"] == '"a"'
+        assert not response["isBase64Encoded"]
+        assert "Content-Encoding" not in response["headers"]
+
+    def test_compress_once(self) -> None:
+        response: HttpResponse = HttpResponse(status_code=200, body=BODY)
+        response.compress(accepting("gzip"), min_bytes=1)
+        body: str = response["body"]
+
+        response.compress(accepting("gzip"), min_bytes=1)
+
+        assert response["body"] == body
@@ -0,0 +1,85 @@
+import pytest
+import simplejson as json
+
+from src.apigateway.exceptions import DuplicateRouteException
+from src.apigateway.responses import HttpResponse
+from src.apigateway.router import Router, compile_path_template
+
+
+def echo(event: dict, context: object) -> HttpResponse:
+    return HttpResponse(
+        status_code=200, body={"pathParameters": event["pathParameters"]}
+    )
+
+
+@pytest.fixture
+def router() -> Router:
+    return Router(
+        [
+            ("GET", "/v1/order/{order_id}", echo),
+            ("PATCH", "/v1/order/{order_id}", echo),
+            ("POST", "/v1/order/{order_id}/line_item", echo),
+        ],
+        base_path="/router",
+    )
+
+
+def test_compile_path_template() -> None:
+    pattern = compile_path_template("/v1/order/{order_id}/line_item", "/router/")
+
+    assert pattern.fullmatch("/router/v1/order/1/line_item").groupdict() == {
+        "order_id": "1"
+    }
+    assert not pattern.fullmatch("/router/v1/order/1/2/line_item")
+    assert not pattern.fullmatch("/v1/order/1/line_item")
+
+
+class TestRouter:
+    def test_dispatch_by_resource(self, router: Router) -> None:
+        response: dict = router.dispatch(
+            {
+                "httpMethod": "GET",
+                "resource": "/v1/order/{order_id}",
+                "path": "/v1/order/1",
+                "pathParameters": {"order_id": "1"},
+            },
+            None,
+        )
+
+        assert response["statusCode"] == "200"
+        assert json.loads(response["body"]) == {"pathParameters": {"order_id": "1"}}
+
+    def test_dispatch_by_path_sets_path_parameters(self, router: Router) -> None:
+        response: dict = router.dispatch(
+            {
+                "httpMethod": "POST",
+                "resource": "/router/{proxy+}",
+                "path": "/router/v1/order/2/line_item",
+                "pathParameters": {"proxy": "v1/order/2/line_item"},
+            },
+            None,
+        )
+
+        assert response["statusCode"] == "200"
+        assert json.loads(response["body"]) == {"pathParameters": {"order_id": "2"}}
+
+    def test_dispatch_returns_405_for_unrouted_method(self, router: Router) -> None:
+        response: dict = router.dispatch(
+            {"httpMethod": "DELETE", "path": "/router/v1/order/1"},
+            None,
+        )
+
+        assert response["statusCode"] == "405"
+        assert response["headers"]["Allow"] == "GET, PATCH"
+
+    def test_dispatch_returns_404_for_unrouted_path(self, router: Router) -> None:
+        response: dict = router.dispatch(
+            {"httpMethod": "GET", "path": "/router/v1/customers"},
+            None,
+        )
+
+        assert response["statusCode"] == "404"
+
+    def test_add_route_rejects_duplicate_route(self, router: Router) -> None:
+        with pytest.raises(DuplicateRouteException):
+            router.add_route("get", "/v1/order/{order_id}", echo)
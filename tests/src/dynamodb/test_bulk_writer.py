@@ -0,0 +1,111 @@
+from typing import List
+
+import pytest
+from boto3.dynamodb.conditions import Key
+
+from src.constants import TABLE_NAME
+from src.dynamodb.bulk_writer import (
+    BulkWriteReport,
+    CapacityBudget,
+    bulk_write_items,
+)
+from src.dynamodb.connection import get_client
+from src.dynamodb.exceptions import UnprocessedItemsException
+from src.dynamodb.helpers import query_by_key_condition_expression
+
+
+@pytest.fixture
+def bulk_items() -> List[dict]:
+    return [
+        {"pk": "Order#bulk", "sk": f"LineItem#{str(index).zfill(2)}"}
+        for index in range(1, 61)
+    ]
+
+
+class TestBulkWriteItems:
+    def test_bulk_write_items(
+        self,
+        bulk_items: List[dict],
+        mocker,
+    ) -> None:
+        spy = mocker.spy(get_client(), "batch_write_item")
+
+        report: BulkWriteReport = bulk_write_items(iter(bulk_items))
+
+        assert spy.call_count == 3
+        assert report.items_written == len(bulk_items)
+        assert report.requests == 3
+        assert report.throttles == 0
+        assert report.consumed_capacity
+        assert (
+            query_by_key_condition_expression(Key("pk").eq("Order#bulk")) == bulk_items
+        )
+
+    def test_bulk_write_items_keeps_last_duplicate(self) -> None:
+        items: List[dict] = [
+            {"pk": "Order#bulk", "sk": "Order#bulk", "status": "new"},
+            {"pk": "Order#bulk", "sk": "Order#bulk", "status": "submitted"},
+        ]
+
+        report: BulkWriteReport = bulk_write_items(items)
+
+        assert report.items_written == 1
+        assert query_by_key_condition_expression(Key("pk").eq("Order#bulk")) == [
+            items[1]
+        ]
+
+    def test_bulk_write_items_retries_unprocessed_items(
+        self,
+        bulk_items: List[dict],
+        mocker,
+    ) -> None:
+        mocker.patch("src.dynamodb.helpers.sleep")
+        unprocessed: List[dict] = [{"PutRequest": {"Item": bulk_items[0]}}]
+        batch_write_item = mocker.patch.object(
+            get_client(),
+            "batch_write_item",
+            side_effect=[
+                {"UnprocessedItems": {TABLE_NAME: unprocessed}},
+                {"UnprocessedItems": {}},
+            ],
+        )
+
+        report: BulkWriteReport = bulk_write_items(bulk_items[:2])
+
+        assert batch_write_item.call_args.kwargs["RequestItems"] == {
+            TABLE_NAME: unprocessed
+        }
+        assert report.items_written == 2
+        assert report.throttles == 1
+        assert report.retried_items == 1
+
+    def test_bulk_write_items_raises_exception_when_items_stay_unprocessed(
+        self,
+        bulk_items: List[dict],
+        mocker,
+    ) -> None:
+        mocker.patch("src.dynamodb.helpers.sleep")
+        mocker.patch.object(
+            get_client(),
+            "batch_write_item",
+            return_value={
+                "UnprocessedItems": {
+                    TABLE_NAME: [{"PutRequest": {"Item": bulk_items[0]}}]
+                }
+            },
+        )
+
+        with pytest.raises(UnprocessedItemsException):
+            bulk_write_items(bulk_items[:1])
+
+
+class TestCapacityBudget:
+    def test_capacity_budget_waits_for_capacity(self, mocker) -> None:
+        sleep = mocker.patch("src.dynamodb.bulk_writer.sleep")
+        budget: CapacityBudget = CapacityBudget(units_per_second=10)
+
+        budget.acquire(10)
+        assert not sleep.called
+
+        budget.acquire(5)
+        assert sleep.call_args.args[0] == pytest.approx(0.5, abs=0.01)
@@ -0,0 +1,37 @@
+from src.constants import DYNAMODB_MAX_POOL_CONNECTIONS, TABLE_NAME
+from src.dynamodb.connection import (
+    get_client,
+    get_resource,
+    get_table,
+    reset_connections,
+)
+
+
+class TestGetTable:
+    def test_get_table_reuses_table(self) -> None:
+        assert get_table(TABLE_NAME) is get_table(TABLE_NAME)
+
+    def test_get_table_shares_resource_between_tables(self) -> None:
+        table = get_table(TABLE_NAME)
+        other_table = get_table("other_table")
+
+        assert table is not other_table
+        assert table.meta.client is other_table.meta.client
+        assert get_client() is table.meta.client
+
+    def test_get_resource_is_keyed_by_region(self) -> None:
+        assert get_resource("us-east-1") is get_resource("us-east-1")
+        assert get_resource("us-east-1") is not get_resource("us-west-2")
+
+    def test_get_resource_applies_pool_settings(self) -> None:
+        config = get_client().meta.config
+
+        assert config.max_pool_connections == DYNAMODB_MAX_POOL_CONNECTIONS
+
+
+class TestResetConnections:
+    def test_reset_connections(self) -> None:
+        table = get_table(TABLE_NAME)
+        reset_connections()
+
+        assert get_table(TABLE_NAME) is not table
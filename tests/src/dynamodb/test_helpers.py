@@ -1,17 +1,36 @@
 from typing import List
 
 import boto3
+import pytest
 from boto3.dynamodb.conditions import Key
 from mypy_boto3_dynamodb.service_resource import _Table
 
 from src.constants import TABLE_NAME
+from src.dynamodb.connection import get_client
+from src.dynamodb.exceptions import InvalidCursorException, UnprocessedItemsException
 from src.dynamodb.helpers import (
+    QueryIterator,
+    batch_get_items,
+    decode_cursor,
+    encode_cursor,
     get_item,
     put_item,
     query_by_key_condition_expression,
 )
 
 
+@pytest.fixture
+def persisted_partition_items() -> List[dict]:
+    items: List[dict] = [
+        {"pk": "Order#paginated", "sk": f"LineItem#{str(index).zfill(2)}"}
+        for index in range(1, 6)
+    ]
+    for item in items:
+        put_item(item)
+
+    return items
+
+
 class TestPutItem:
     def test_put_item(
         self,
@@ -46,6 +65,23 @@ class TestGetItem:
         assert item
         assert item == persisted_order_ddb_dict
 
+    def test_get_item_with_attributes(
+        self,
+        persisted_order_ddb_dict: dict,
+    ) -> None:
+        item: dict = get_item(
+            {
+                "pk": persisted_order_ddb_dict["pk"],
+                "sk": persisted_order_ddb_dict["sk"],
+            },
+            attributes=["status", "item_count"],
+        )
+
+        assert item == {
+            "status": persisted_order_ddb_dict["status"],
+            "item_count": persisted_order_ddb_dict["item_count"],
+        }
+
 
 class TestQueryByKeyConditionExpression:
     def test_query_by_key_condition_expression(
@@ -60,3 +96,194 @@ class TestQueryByKeyConditionExpression:
         assert items
         assert isinstance(items, list)
         assert persisted_order_ddb_dict in items
+
+    def test_query_by_key_condition_expression_with_limit(
+        self,
+        persisted_partition_items: List[dict],
+    ) -> None:
+        items: List[dict] = query_by_key_condition_expression(
+            key_condition_expression=Key("pk").eq("Order#paginated"),
+            limit=2,
+        )
+
+        assert items == persisted_partition_items[:2]
+
+    def test_query_by_key_condition_expression_with_attributes(
+        self,
+        persisted_order_ddb_dict: dict,
+    ) -> None:
+        items: List[dict] = query_by_key_condition_expression(
+            key_condition_expression=Key("pk").eq(persisted_order_ddb_dict["pk"]),
+            attributes=["status"],
+        )
+
+        assert items == [
+            {
+                "pk": persisted_order_ddb_dict["pk"],
+                "sk": persisted_order_ddb_dict["sk"],
+                "status": persisted_order_ddb_dict["status"],
+            }
+        ]
+
+
+class TestQueryIterator:
+    def test_query_iterator_follows_last_evaluated_key(
+        self,
+        persisted_partition_items: List[dict],
+    ) -> None:
+        iterator: QueryIterator = QueryIterator(
+            Key("pk").eq("Order#paginated"),
+            page_size=2,
+        )
+
+        assert list(iterator) == persisted_partition_items
+        assert iterator.pages == 3
+        assert iterator.cursor is None
+
+    def test_query_iterator_stops_at_limit(
+        self,
+        persisted_partition_items: List[dict],
+    ) -> None:
+        iterator: QueryIterator = QueryIterator(
+            Key("pk").eq("Order#paginated"),
+            limit=3,
+            page_size=2,
+        )
+
+        assert list(iterator) == persisted_partition_items[:3]
+        assert iterator.pages == 2
+        assert iterator.cursor
+
+    def test_query_iterator_is_lazy(
+        self,
+        persisted_partition_items: List[dict],
+    ) -> None:
+        iterator: QueryIterator = QueryIterator(
+            Key("pk").eq("Order#paginated"),
+            page_size=2,
+        )
+
+        assert iterator.pages == 0
+        assert next(iterator) == persisted_partition_items[0]
+        assert iterator.pages == 1
+
+    def test_query_iterator_resumes_from_cursor(
+        self,
+        persisted_partition_items: List[dict],
+    ) -> None:
+        first_page: QueryIterator = QueryIterator(
+            Key("pk").eq("Order#paginated"),
+            limit=2,
+        )
+        first_items: List[dict] = list(first_page)
+
+        second_page: QueryIterator = QueryIterator(
+            Key("pk").eq("Order#paginated"),
+            cursor=first_page.cursor,
+        )
+
+        assert first_items + list(second_page) == persisted_partition_items
+
+    def test_query_iterator_scans_backwards(
+        self,
+        persisted_partition_items: List[dict],
+    ) -> None:
+        iterator: QueryIterator = QueryIterator(
+            Key("pk").eq("Order#paginated"),
+            scan_index_forward=False,
+            limit=2,
+        )
+
+        assert list(iterator) == persisted_partition_items[::-1][:2]
+
+
+class TestCursor:
+    def test_cursor_round_trip(self) -> None:
+        key: dict = {"pk": "Order#1", "sk": "LineItem#01"}
+
+        assert decode_cursor(encode_cursor(key)) == key
+
+    def test_decode_cursor_raises_exception_with_bad_cursor(self) -> None:
+        with pytest.raises(InvalidCursorException):
+            decode_cursor("definately not a cursor")
+
+
+class TestBatchGetItems:
+    def test_batch_get_items_keeps_key_order(
+        self,
+        persisted_partition_items: List[dict],
+    ) -> None:
+        missing_key: dict = {"pk": "Order#paginated", "sk": "LineItem#99"}
+        keys: List[dict] = [
+            persisted_partition_items[3],
+            missing_key,
+            persisted_partition_items[0],
+            persisted_partition_items[3],
+        ]
+
+        items: List[dict] = batch_get_items(keys)
+
+        assert items == [
+            persisted_partition_items[3],
+            None,
+            persisted_partition_items[0],
+            persisted_partition_items[3],
+        ]
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_batch_get_items_chunks_keys(
+        self,
+        max_workers: int,
+        mocker,
+    ) -> None:
+        items: List[dict] = [
+            {"pk": f"Order#{index}", "sk": f"Order#{index}"} for index in range(250)
+        ]
+        for item in items:
+            put_item(item)
+        spy = mocker.spy(get_client(), "batch_get_item")
+
+        fetched_items: List[dict] = batch_get_items(items, max_workers=max_workers)
+
+        assert fetched_items == items
+        assert spy.call_count == 3
+
+    def test_batch_get_items_retries_unprocessed_keys(
+        self,
+        persisted_partition_items: List[dict],
+        mocker,
+    ) -> None:
+        first_key, second_key = persisted_partition_items[:2]
+        mocker.patch("src.dynamodb.helpers.sleep")
+        mocker.patch.object(
+            get_client(),
+            "batch_get_item",
+            side_effect=[
+                {
+                    "Responses": {TABLE_NAME: [first_key]},
+                    "UnprocessedKeys": {TABLE_NAME: {"Keys": [second_key]}},
+                },
+                {"Responses": {TABLE_NAME: [second_key]}},
+            ],
+        )
+
+        assert batch_get_items([first_key, second_key]) == [first_key, second_key]
+
+    def test_batch_get_items_raises_exception_when_keys_stay_unprocessed(
+        self,
+        persisted_partition_items: List[dict],
+        mocker,
+    ) -> None:
+        key: dict = persisted_partition_items[0]
+        mocker.patch("src.dynamodb.helpers.sleep")
+        mocker.patch.object(
+            get_client(),
+            "batch_get_item",
+            return_value={
+                "Responses": {},
+                "UnprocessedKeys": {TABLE_NAME: {"Keys": [key]}},
+            },
+        )
+
+        with pytest.raises(UnprocessedItemsException):
+            batch_get_items([key])
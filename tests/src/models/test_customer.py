@@ -1,4 +1,11 @@
+from datetime import date
+
+import pytest
+from pydantic import ValidationError
+
+from src.models import types
 from src.models.customer import Customer
+from src.schemas.customer import NewCustomerSchema
 
 
 class TestCustomer:
@@ -13,3 +20,31 @@ class TestCustomer:
         assert customer.email == customer_data_dict["email"]
         assert customer.first_name == customer_data_dict["first_name"]
         assert customer.last_name == customer_data_dict["last_name"]
+
+    def test_customer_from_schema(
+        self,
+        customer_data_dict: dict,
+        new_customer_data_dict: dict,
+        mocker,
+    ) -> None:
+        schema: NewCustomerSchema = NewCustomerSchema(**new_customer_data_dict)
+        validate_spy = mocker.spy(types, "validate_email")
+
+        customer: Customer = Customer.from_schema(
+            schema,
+            date_created=date.fromisoformat(customer_data_dict["date_created"]),
+        )
+
+        assert not validate_spy.called
+        assert customer == Customer(**customer_data_dict)
+        assert customer.item == Customer(**customer_data_dict).item
+        assert validate_spy.called
+
+    def test_customer_from_schema_validates_dictionaries(
+        self,
+        new_customer_data_dict: dict,
+    ) -> None:
+        new_customer_data_dict["email"] = "definately not an email"
+
+        with pytest.raises(ValidationError):
+            Customer.from_schema(new_customer_data_dict, date_created=date.today())
@@ -0,0 +1,95 @@
+from decimal import Decimal
+
+import pytest
+import simplejson as json
+from pydantic import BaseModel
+
+from src.models import encoders
+from src.models.encoders import JsonEncoder, OrjsonEncoder, get_json_encoder
+from src.models.line_item import LineItem
+from src.models.order import DynamoOrder, Order, OrderStatus
+
+DECIMALS: dict = {
+    "quantity": Decimal("12345678901234567890"),
+    "price": Decimal("0.1"),
+}
+
+
+@pytest.mark.parametrize(
+    "encoder",
+    [
+        JsonEncoder(),
+        pytest.param(
+            OrjsonEncoder(),
+            marks=pytest.mark.skipif(not encoders.orjson, reason="orjson is optional"),
+        ),
+    ],
+)
+def test_encoder_writes_decimals_exactly(encoder: JsonEncoder) -> None:
+    document: str = encoder.dumps(DECIMALS)
+
+    assert json.loads(document, use_decimal=True) == DECIMALS
+    assert "12345678901234567890" in document
+
+
+def test_get_json_encoder_falls_back_to_simplejson(monkeypatch) -> None:
+    monkeypatch.setattr(encoders, "orjson", None)
+
+    assert get_json_encoder("auto").name == "simplejson"
+    assert get_json_encoder("orjson").name == "simplejson"
+
+
+class TestDynamoItemJson:
+    def test_json_is_pydantics(self, order_data_dict: dict) -> None:
+        order: DynamoOrder = DynamoOrder(**order_data_dict)
+
+        assert order.json() == BaseModel.json(order)
+
+    def test_cached_json_matches_pydantic(self, order_data_dict: dict) -> None:
+        order: DynamoOrder = DynamoOrder(**order_data_dict)
+
+        assert json.loads(order.cached_json()) == json.loads(BaseModel.json(order))
+
+    def test_cached_json_is_reused(self, order_data_dict: dict, mocker) -> None:
+        order: DynamoOrder = DynamoOrder(**order_data_dict)
+        dumps_spy = mocker.spy(encoders.json_encoder, "dumps")
+
+        assert order.cached_json() is order.cached_json()
+        assert dumps_spy.call_count == 1
+
+    def test_cached_json_is_rebuilt_after_assignment(
+        self, order_data_dict: dict
+    ) -> None:
+        order: DynamoOrder = DynamoOrder(**order_data_dict)
+        order.cached_json()
+
+        order.status = OrderStatus.SUBMITTED
+
+        assert json.loads(order.cached_json())["status"] == (
+            OrderStatus.SUBMITTED.value
+        )
+
+    def test_item_sees_in_place_changes(
+        self,
+        order_data_dict: dict,
+        line_item_data_dict: dict,
+    ) -> None:
+        order: Order = Order(**order_data_dict, line_items=[line_item_data_dict])
+        order.item
+        order.cached_json()
+
+        order.line_items.append(LineItem(**{**line_item_data_dict, "id": "2"}))
+
+        assert [line_item["id"] for line_item in order.item["line_items"]] == [
+            line_item.id for line_item in order.line_items
+        ]
+
+    def test_copy_is_encoded_again(self, order_data_dict: dict) -> None:
+        order: DynamoOrder = DynamoOrder(**order_data_dict)
+        order.cached_json()
+
+        copy: DynamoOrder = order.copy(update={"status": OrderStatus.SUBMITTED})
+
+        assert copy.item["status"] == OrderStatus.SUBMITTED.value
+        assert json.loads(copy.cached_json())["status"] == (OrderStatus.SUBMITTED.value)
+        assert json.loads(order.cached_json())["status"] == order_data_dict["status"]
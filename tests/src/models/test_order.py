@@ -1,4 +1,4 @@
-from src.models.order import DynamoOrder, Order
+from src.models.order import DynamoOrder, Order, OrderStatus
 
 
 class TestDynamoOrder:
@@ -20,8 +20,40 @@ class TestDynamoOrder:
             dynamo_order.delivery_address.dict() == order_data_dict["delivery_address"]
         )
 
+    def test_dynamo_order_tracks_dirty_fields(
+        self,
+        order_ddb_dict: dict,
+    ) -> None:
+        dynamo_order: DynamoOrder = DynamoOrder.from_item(order_ddb_dict)
+        assert not dynamo_order.dirty_fields
+
+        dynamo_order.status = OrderStatus.SUBMITTED
+        dynamo_order.delivery_address.line2 = "Apt 1"
+
+        assert dynamo_order.dirty_fields == {"status"}
+        assert dynamo_order.changes == {"status": "submitted"}
+
+        dynamo_order.mark_clean()
+
+        assert not dynamo_order.changes
+
 
 class TestOrder:
+    def test_dynamo_order_copy_tracks_its_own_dirty_fields(
+        self,
+        order_ddb_dict: dict,
+    ) -> None:
+        dynamo_order: DynamoOrder = DynamoOrder.from_item(order_ddb_dict)
+        dynamo_order.customer_email = "kif.kroker@dop.com"
+
+        copy: DynamoOrder = dynamo_order.copy()
+        copy.status = OrderStatus.SUBMITTED
+        updated_copy: DynamoOrder = dynamo_order.copy(update={"item_count": 1})
+
+        assert dynamo_order.dirty_fields == {"customer_email"}
+        assert copy.dirty_fields == {"customer_email", "status"}
+        assert updated_copy.dirty_fields == {"customer_email", "item_count"}
+
     def test_order(
         self,
         order_data_dict: dict,
@@ -0,0 +1,165 @@
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import List
+
+import pytest
+import simplejson as json
+from pydantic import BaseModel, ValidationError
+
+from src.models import (
+    AddressType,
+    Customer,
+    DynamoAddress,
+    DynamoOrder,
+    LineItem,
+    Order,
+    OrderStatus,
+)
+from src.models.serialization import get_loader, get_serializer, to_dynamo_value
+
+
+class Color(str, Enum):
+    RED: str = "red"
+
+
+class Measurement(BaseModel):
+    color: Color
+    weight: float
+    taken: List[date]
+
+
+@pytest.fixture
+def order_with_line_items(order_data_dict: dict, line_item_data_dict: dict) -> Order:
+    line_items: List[dict] = [
+        {**line_item_data_dict, "id": str(index).zfill(2)} for index in range(1, 51)
+    ]
+
+    return Order(**order_data_dict, line_items=line_items)
+
+
+class TestGetSerializer:
+    @pytest.mark.parametrize(
+        "model, data",
+        [
+            (Customer, "customer_data_dict"),
+            (DynamoAddress, "address_data_dict"),
+            (Order, "order_data_dict"),
+            (LineItem, "line_item_data_dict"),
+        ],
+    )
+    def test_serializer_matches_json_round_trip(
+        self,
+        request,
+        model: type,
+        data: str,
+    ) -> None:
+        values: dict = request.getfixturevalue(data)
+        if model is DynamoAddress:
+            values["email"] = "zapp.brannigan@decomcraticorderofplanets.com"
+        instance = model(**values)
+
+        assert get_serializer(model)(instance) == json.loads(instance.json())
+
+    def test_serializer_matches_json_round_trip_with_line_items(
+        self,
+        order_with_line_items: Order,
+    ) -> None:
+        item: dict = order_with_line_items.item
+
+        for key in ("pk", "sk", "entity"):
+            item.pop(key)
+        assert item == json.loads(order_with_line_items.json())
+
+    def test_serializer_converts_floats_to_decimal(self) -> None:
+        measurement: Measurement = Measurement(
+            color="red",
+            weight=1.1,
+            taken=[date(2021, 10, 4)],
+        )
+
+        assert get_serializer(Measurement)(measurement) == {
+            "color": "red",
+            "weight": Decimal("1.1"),
+            "taken": ["2021-10-04"],
+        }
+
+
+class TestToDynamoValue:
+    def test_to_dynamo_value(self) -> None:
+        assert to_dynamo_value(
+            {
+                "datetime": datetime(2021, 10, 4),
+                "enum": Color.RED,
+                "floats": (0.5,),
+                "none": None,
+            }
+        ) == {
+            "datetime": "2021-10-04T00:00:00",
+            "enum": "red",
+            "floats": [Decimal("0.5")],
+            "none": None,
+        }
+
+
+class TestGetLoader:
+    @pytest.mark.parametrize(
+        "model, item",
+        [
+            (Customer, "customer_ddb_dict"),
+            (DynamoAddress, "address_ddb_dict"),
+            (DynamoOrder, "order_ddb_dict"),
+            (LineItem, "line_item_ddb_dict"),
+        ],
+    )
+    def test_loader_matches_validated_model(
+        self,
+        request,
+        model: type,
+        item: str,
+    ) -> None:
+        stored_item: dict = request.getfixturevalue(item)
+        if model is DynamoAddress:
+            stored_item["email"] = "zapp.brannigan@decomcraticorderofplanets.com"
+
+        trusted = model.from_item(stored_item)
+        validated = model(**stored_item)
+
+        assert trusted == validated
+        assert trusted.item == validated.item
+        assert trusted.__fields_set__ == validated.__fields_set__
+
+    def test_loader_builds_domain_order(
+        self,
+        order_with_line_items: Order,
+    ) -> None:
+        item: dict = order_with_line_items.item
+        item["line_items"] = [
+            line_item.item for line_item in order_with_line_items.line_items
+        ]
+
+        order: Order = Order.from_item(item)
+
+        assert order == order_with_line_items
+        assert isinstance(order.line_items[0], LineItem)
+        assert isinstance(order.line_items[0].quantity, int)
+        assert order.status is OrderStatus.NEW
+        assert order.datetime_created == order_with_line_items.datetime_created
+
+    def test_loader_converts_enums(self, address_ddb_dict: dict) -> None:
+        address_ddb_dict["email"] = "zapp.brannigan@decomcraticorderofplanets.com"
+        address_ddb_dict["type"] = "delivery"
+
+        address: DynamoAddress = get_loader(DynamoAddress)(address_ddb_dict)
+
+        assert address.type is AddressType.DELIVERY
+        assert "pk" not in address.__dict__
+
+    def test_loader_validates_items_missing_required_fields(
+        self,
+        customer_ddb_dict: dict,
+    ) -> None:
+        customer_ddb_dict.pop("username")
+
+        with pytest.raises(ValidationError):
+            Customer.from_item(customer_ddb_dict)
@@ -0,0 +1,35 @@
+from typing import List
+
+from src.models.order import DynamoOrder
+from src.services.base_service import BaseService
+
+
+class TestBaseService:
+    def test_get_item_by_key(
+        self,
+        persisted_order_ddb_dict: dict,
+        persisted_dynamo_order: DynamoOrder,
+    ) -> None:
+        service: BaseService = BaseService()
+        order: DynamoOrder = service.get_item_by_key(
+            DynamoOrder.calculate_key(persisted_order_ddb_dict["id"]),
+            DynamoOrder,
+        )
+
+        assert order == persisted_dynamo_order
+
+    def test_get_items_by_keys(
+        self,
+        persisted_order_ddb_dict: dict,
+        persisted_dynamo_order: DynamoOrder,
+    ) -> None:
+        service: BaseService = BaseService()
+        orders: List[DynamoOrder] = service.get_items_by_keys(
+            [
+                DynamoOrder.calculate_key("missing"),
+                DynamoOrder.calculate_key(persisted_order_ddb_dict["id"]),
+            ],
+            DynamoOrder,
+        )
+
+        assert orders == [None, persisted_dynamo_order]
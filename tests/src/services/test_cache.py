@@ -0,0 +1,68 @@
+from src.services.cache import ItemCache
+
+
+class TestItemCache:
+    def test_item_cache_counts_hits_and_misses(self) -> None:
+        cache: ItemCache = ItemCache(max_size=2, ttl_seconds=60)
+
+        assert cache.get("a") is None
+        cache.set("a", {"pk": "A", "sk": "A"})
+
+        assert cache.get("a") == {"pk": "A", "sk": "A"}
+        assert cache.stats() == {
+            "hits": 1,
+            "misses": 1,
+            "evictions": 0,
+            "expirations": 0,
+            "size": 1,
+        }
+
+    def test_item_cache_evicts_least_recently_used(self) -> None:
+        cache: ItemCache = ItemCache(max_size=2, ttl_seconds=60)
+        cache.set("a", {"pk": "A", "sk": "A"})
+        cache.set("b", {"pk": "B", "sk": "B"})
+        cache.get("a")
+        cache.set("c", {"pk": "C", "sk": "C"})
+
+        assert cache.get("b") is None
+        assert cache.get("a")
+        assert cache.get("c")
+        assert cache.evictions == 1
+
+    def test_item_cache_expires_items(
+        self,
+        mocker,
+    ) -> None:
+        monotonic = mocker.patch("src.services.cache.monotonic", return_value=100)
+        cache: ItemCache = ItemCache(max_size=2, ttl_seconds=60)
+        cache.set("a", {"pk": "A", "sk": "A"})
+
+        monotonic.return_value = 159
+        assert cache.get("a")
+
+        monotonic.return_value = 160
+        assert cache.get("a") is None
+        assert cache.expirations == 1
+
+    def test_item_cache_invalidates_items_and_partitions(self) -> None:
+        cache: ItemCache = ItemCache(max_size=4, ttl_seconds=60)
+        cache.set("a1", {"pk": "A", "sk": "1"})
+        cache.set("a2", {"pk": "A", "sk": "2"})
+        cache.set("lookup", {"pk": "A", "sk": "1"})
+        cache.set("b1", {"pk": "B", "sk": "1"})
+
+        cache.invalidate("A", "1")
+        assert cache.get("a1") is None
+        assert cache.get("lookup") is None
+        assert cache.get("a2")
+
+        cache.invalidate("A")
+        assert cache.get("a2") is None
+        assert cache.get("b1")
+
+    def test_item_cache_disabled_with_no_ttl(self) -> None:
+        cache: ItemCache = ItemCache(max_size=2, ttl_seconds=0)
+        cache.set("a", {"pk": "A", "sk": "A"})
+
+        assert not cache.enabled
+        assert cache.get("a") is None
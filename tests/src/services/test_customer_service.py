@@ -3,9 +3,17 @@ from typing import List
 
 import pytest
 from boto3.dynamodb.conditions import Key
+from ksuid import ksuid
 
-from src.dynamodb.helpers import get_item, query_by_key_condition_expression
-from src.models.customer import Customer
+from src.dynamodb.connection import get_client
+from src.dynamodb.helpers import (
+    get_item,
+    put_item,
+    query_by_key_condition_expression,
+)
+from src.models.address import DynamoAddress
+from src.models.customer import Customer, Username
+from src.services.cache import item_cache
 from src.services.customer_service import CustomerService
 from src.services.exceptions import CreateCustomerException
 
@@ -31,6 +39,62 @@ class TestCustomerService:
 
         assert fetched_customer == customer_ddb_dict
         assert isinstance(customer_model, Customer)
+        assert get_item(Username.calculate_key(customer.username)) == {
+            "pk": f"Username#{customer.username}",
+            "sk": f"Username#{customer.username}",
+            "entity": "Username",
+            "name": customer.username,
+            "email": customer.email,
+        }
+
+    def test_create_customer_raises_exception_if_username_is_taken(
+        self,
+        new_customer_data_dict: dict,
+        persisted_customer_ddb_dict: dict,
+    ) -> None:
+        customer_client: CustomerService = CustomerService()
+        new_customer_data_dict["email"] = "kif.kroker@decomcraticorderofplanets.com"
+
+        with pytest.raises(CreateCustomerException):
+            customer_client.create_customer(new_customer_data_dict)
+
+        assert not get_item(
+            Customer.calculate_key(
+                new_customer_data_dict["email"],
+                new_customer_data_dict["username"],
+            )
+        )
+
+    def test_get_customer_email_by_username_reads_sentinel(
+        self,
+        persisted_customer_ddb_dict: dict,
+        mocker,
+    ) -> None:
+        customer_client: CustomerService = CustomerService()
+        query_spy = mocker.spy(get_client(), "query")
+        get_item_spy = mocker.spy(get_client(), "get_item")
+
+        email: str = customer_client.get_customer_email_by_username(
+            persisted_customer_ddb_dict["username"]
+        )
+
+        assert email == persisted_customer_ddb_dict["email"]
+        assert not query_spy.called
+        assert get_item_spy.call_args.kwargs["ConsistentRead"]
+
+    def test_get_customer_email_by_username_without_sentinel(
+        self,
+        customer_ddb_dict: dict,
+    ) -> None:
+        put_item(customer_ddb_dict)
+        customer_client: CustomerService = CustomerService()
+
+        assert (
+            customer_client.get_customer_email_by_username(
+                customer_ddb_dict["username"]
+            )
+            == customer_ddb_dict["email"]
+        )
 
     def test_create_customer_raises_exception(
         self,
@@ -60,3 +124,107 @@ class TestCustomerService:
         )
 
         assert len(customer_items) == 2
+
+    def test_get_customer_address_reads_one_item(
+        self,
+        persisted_customer_ddb_dict: dict,
+        persisted_address_ddb_dict: dict,
+        mocker,
+    ) -> None:
+        customer_client: CustomerService = CustomerService()
+        query_spy = mocker.spy(get_client(), "query")
+
+        address: dict = customer_client.get_customer_address(
+            persisted_customer_ddb_dict["email"],
+            persisted_address_ddb_dict["id"],
+            attributes=["line1", "city", "state", "zipcode"],
+        )
+
+        assert not query_spy.called
+        assert address == {
+            "line1": persisted_address_ddb_dict["line1"],
+            "city": persisted_address_ddb_dict["city"],
+            "state": persisted_address_ddb_dict["state"],
+            "zipcode": persisted_address_ddb_dict["zipcode"],
+        }
+
+    def test_get_customer_address_returns_none_if_no_address(
+        self,
+        persisted_customer_ddb_dict: dict,
+    ) -> None:
+        customer_client: CustomerService = CustomerService()
+
+        assert not customer_client.get_customer_address(
+            persisted_customer_ddb_dict["email"],
+            "doom_at_11",
+        )
+
+    def test_get_customer_by_email_is_read_through_cached(
+        self,
+        persisted_customer_ddb_dict: dict,
+        mocker,
+    ) -> None:
+        customer_client: CustomerService = CustomerService()
+        query_spy = mocker.spy(get_client(), "query")
+
+        customers: List[Customer] = [
+            customer_client.get_customer_by_email(persisted_customer_ddb_dict["email"])
+            for _ in range(3)
+        ]
+
+        assert query_spy.call_count == 1
+        assert customers[0] == customers[2]
+        assert item_cache.hits == 2
+
+    def test_add_customer_address_keeps_other_cached_addresses(
+        self,
+        persisted_customer_ddb_dict: dict,
+        new_address_data_dict: dict,
+        mocker,
+    ) -> None:
+        customer_client: CustomerService = CustomerService()
+        address: DynamoAddress = customer_client.add_customer_address(
+            persisted_customer_ddb_dict["username"],
+            deepcopy(new_address_data_dict),
+        )
+        customer_client.get_customer_address(address.email, address.id)
+        query_spy = mocker.spy(get_client(), "query")
+        get_item_spy = mocker.spy(get_client(), "get_item")
+
+        customer_client.add_customer_address(
+            persisted_customer_ddb_dict["username"],
+            deepcopy(new_address_data_dict),
+        )
+        customer_client.get_customer_address(address.email, address.id)
+        item_cache.invalidate(address.pk, address.sk)
+        customer_client.get_customer_address(address.email, address.id)
+
+        assert not query_spy.called
+        assert get_item_spy.call_count == 1
+
+    def test_add_customer_address_invalidates_written_address(
+        self,
+        persisted_customer_ddb_dict: dict,
+        new_address_data_dict: dict,
+        mocker,
+    ) -> None:
+        customer_client: CustomerService = CustomerService()
+        address_id: ksuid = ksuid()
+        mocker.patch("src.services.customer_service.ksuid", return_value=address_id)
+        key: dict = DynamoAddress.calculate_key(
+            persisted_customer_ddb_dict["email"], str(address_id)
+        )
+        item_cache.set(
+            (customer_client.TABLE_NAME, key["pk"], key["sk"]),
+            {**key, "line1": "Stale Street"},
+        )
+
+        address: DynamoAddress = customer_client.add_customer_address(
+            persisted_customer_ddb_dict["username"],
+            deepcopy(new_address_data_dict),
+        )
+
+        assert customer_client.get_customer_address(
+            address.email, address.id
+        ) == get_item(key)
+        assert get_item(key)["line1"] == new_address_data_dict["line1"]
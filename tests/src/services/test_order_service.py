@@ -1,14 +1,28 @@
+from copy import deepcopy
+from datetime import datetime
+from time import tzset
 from typing import List
 
 from boto3.dynamodb.conditions import Key
 import pytest
+from freezegun import freeze_time
 from pytest import FixtureRequest
 
 
+from src.dynamodb.connection import get_client
 from src.dynamodb.helpers import get_item, put_item, query_by_key_condition_expression
+from src.models.line_item import LineItem
 from src.models.order import DynamoOrder, Order, OrderStatus
+from src.services import order_service
 from src.services.order_service import OrderService
-from src.services.exceptions import RemoveLineItemException
+from src.services.exceptions import (
+    AddLineItemException,
+    InvalidFieldsException,
+    OrderLookupException,
+    OrderStatusException,
+    RemoveLineItemException,
+    VersionConflictException,
+)
 
 
 class TestOrderService:
@@ -43,6 +57,8 @@ class TestOrderService:
             new_line_item_data=line_item_data_dict,
         )
         persisted_order_ddb_dict["item_count"] += 1
+        persisted_order_ddb_dict["next_line_item_id"] = 2
+        persisted_order_ddb_dict["version"] = 1
         items: List[dict] = query_by_key_condition_expression(
             key_condition_expression=Key("pk").eq(persisted_order_ddb_dict["pk"])
         )
@@ -51,6 +67,687 @@ class TestOrderService:
         assert line_item_ddb_dict in items
         assert persisted_order_ddb_dict in items
 
+    def test_order_adds_line_item_in_one_round_trip(
+        self,
+        new_order_data_dict: dict,
+        line_item_data_dict: dict,
+        mocker,
+    ) -> None:
+        order_service: OrderService = OrderService()
+        order: DynamoOrder = order_service.create_order(new_order_data_dict)
+        get_item_spy = mocker.spy(get_client(), "get_item")
+        transact_spy = mocker.spy(get_client(), "transact_write_items")
+
+        line_items: List[dict] = [
+            order_service.add_line_item_to_order(order.key, dict(line_item_data_dict))
+            for _ in range(3)
+        ]
+
+        assert [line_item["id"] for line_item in line_items] == ["01", "02", "03"]
+        assert transact_spy.call_count == 3
+        assert not get_item_spy.called
+        assert get_item(order.key)["item_count"] == 3
+
+    def test_order_adds_line_item_with_stale_item_count(
+        self,
+        persisted_order_ddb_dict: dict,
+        line_item_data_dict: dict,
+    ) -> None:
+        order_service: OrderService = OrderService()
+        order_key: dict = DynamoOrder.calculate_key(persisted_order_ddb_dict["id"])
+        order_service.add_line_item_to_order(order_key, dict(line_item_data_dict))
+
+        line_item: dict = order_service.add_line_item_to_order(
+            order_key,
+            dict(line_item_data_dict),
+            expected_item_count=0,
+        )
+
+        assert line_item["id"] == "02"
+        assert get_item(order_key)["item_count"] == 2
+
+    @pytest.mark.parametrize("max_embedded_line_items", [0, 3])
+    def test_order_add_line_item_never_reuses_removed_ids(
+        self,
+        new_order_data_dict: dict,
+        line_item_data_dict: dict,
+        max_embedded_line_items: int,
+        monkeypatch,
+    ) -> None:
+        monkeypatch.setattr(
+            order_service, "MAX_EMBEDDED_LINE_ITEMS", max_embedded_line_items
+        )
+        service: OrderService = OrderService()
+        order: DynamoOrder = service.create_order(new_order_data_dict)
+        for name in ("first", "second"):
+            service.add_line_item_to_order(
+                order.key, {**line_item_data_dict, "name": name}
+            )
+        service.remove_line_from_order(order.id, "01")
+
+        line_item: dict = service.add_line_item_to_order(
+            order.key, {**line_item_data_dict, "name": "third"}
+        )
+
+        assert line_item["id"] == "03"
+        assert [
+            (line_item.id, line_item.name)
+            for line_item in service.get_domain_order_by_id(order.id).line_items
+        ] == [("02", "second"), ("03", "third")]
+        assert get_item(order.key)["item_count"] == 2
+
+    def test_order_add_line_item_skips_existing_ids_of_older_orders(
+        self,
+        persisted_order_ddb_dict: dict,
+        persisted_line_item_ddb_dict: dict,
+        line_item_data_dict: dict,
+    ) -> None:
+        service: OrderService = OrderService()
+        order_key: dict = DynamoOrder.calculate_key(persisted_order_ddb_dict["id"])
+
+        line_item: dict = service.add_line_item_to_order(
+            order_key,
+            {**line_item_data_dict, "name": "Slurm"},
+            expected_item_count=0,
+        )
+
+        assert line_item["id"] == "02"
+        assert get_item(order_key)["next_line_item_id"] == 3
+        assert [
+            line_item.name
+            for line_item in service.get_domain_order_by_id(
+                persisted_order_ddb_dict["id"]
+            ).line_items
+        ] == [persisted_line_item_ddb_dict["name"], "Slurm"]
+
+    def test_order_add_line_item_to_older_order_in_one_round_trip(
+        self,
+        persisted_order_ddb_dict: dict,
+        line_item_data_dict: dict,
+        mocker,
+    ) -> None:
+        mocker.patch.dict(order_service._item_count_hints, clear=True)
+        get_item_spy = mocker.spy(get_client(), "get_item")
+        transact_spy = mocker.spy(get_client(), "transact_write_items")
+        order_key: dict = DynamoOrder.calculate_key(persisted_order_ddb_dict["id"])
+
+        line_item: dict = OrderService().add_line_item_to_order(
+            order_key,
+            line_item_data_dict,
+            expected_item_count=persisted_order_ddb_dict["item_count"],
+        )
+
+        assert line_item["id"] == "01"
+        assert transact_spy.call_count == 1
+        assert not get_item_spy.called
+        assert get_item(order_key)["next_line_item_id"] == 2
+
+    def test_order_add_line_item_raises_exception_if_no_order(
+        self,
+        line_item_data_dict: dict,
+    ) -> None:
+        order_service: OrderService = OrderService()
+
+        with pytest.raises(OrderLookupException):
+            order_service.add_line_item_to_order(
+                DynamoOrder.calculate_key("doom_at_11"),
+                line_item_data_dict,
+            )
+
+    def test_order_adds_line_items_in_transactional_chunks(
+        self,
+        persisted_order_ddb_dict: dict,
+        line_item_data_dict: dict,
+        mocker,
+    ) -> None:
+        order_service: OrderService = OrderService()
+        order_key: dict = DynamoOrder.calculate_key(persisted_order_ddb_dict["id"])
+        order_service.add_line_item_to_order(order_key, dict(line_item_data_dict))
+        transact_spy = mocker.spy(get_client(), "transact_write_items")
+
+        line_items: List[dict] = order_service.add_line_items_to_order(
+            order_key,
+            [dict(line_item_data_dict) for _ in range(30)],
+        )
+
+        assert [line_item["id"] for line_item in line_items] == [
+            str(id).zfill(2) for id in range(2, 32)
+        ]
+        assert [
+            len(call.kwargs["TransactItems"]) for call in transact_spy.call_args_list
+        ] == [25, 7]
+        assert get_item(order_key)["item_count"] == 31
+        assert all(
+            get_item(
+                LineItem.calculate_key(persisted_order_ddb_dict["id"], line_item["id"])
+            )
+            for line_item in line_items
+        )
+
+    def test_order_add_line_items_raises_exception_if_no_order(
+        self,
+        line_item_data_dict: dict,
+    ) -> None:
+        order_service: OrderService = OrderService()
+
+        with pytest.raises(OrderLookupException):
+            order_service.add_line_items_to_order(
+                DynamoOrder.calculate_key("doom_at_11"),
+                [line_item_data_dict],
+            )
+
+        assert not get_item(DynamoOrder.calculate_key("doom_at_11"))
+
+    def test_order_embeds_line_items_until_threshold_then_spills(
+        self,
+        new_order_data_dict: dict,
+        line_item_data_dict: dict,
+        monkeypatch,
+        mocker,
+    ) -> None:
+        monkeypatch.setattr(order_service, "MAX_EMBEDDED_LINE_ITEMS", 3)
+        service: OrderService = OrderService()
+        order: DynamoOrder = service.create_order(new_order_data_dict)
+        transact_spy = mocker.spy(get_client(), "transact_write_items")
+
+        for _ in range(3):
+            service.add_line_item_to_order(order.key, dict(line_item_data_dict))
+
+        assert not transact_spy.called
+        assert sorted(get_item(order.key)["line_items"]) == ["01", "02", "03"]
+        assert not get_item(LineItem.calculate_key(order.id, "01"))
+
+        service.add_line_item_to_order(order.key, dict(line_item_data_dict))
+
+        assert transact_spy.call_count == 1
+        assert "line_items" not in get_item(order.key)
+        assert all(
+            get_item(LineItem.calculate_key(order.id, id))
+            for id in ["01", "02", "03", "04"]
+        )
+        assert [
+            line_item.id
+            for line_item in service.get_domain_order_by_id(order.id).line_items
+        ] == ["01", "02", "03", "04"]
+
+    def test_order_reads_embedded_line_items(
+        self,
+        new_order_data_dict: dict,
+        line_item_data_dict: dict,
+        monkeypatch,
+    ) -> None:
+        monkeypatch.setattr(order_service, "MAX_EMBEDDED_LINE_ITEMS", 3)
+        service: OrderService = OrderService()
+        order: DynamoOrder = service.create_order(new_order_data_dict)
+        line_items: List[dict] = service.add_line_items_to_order(
+            order.key,
+            [dict(line_item_data_dict) for _ in range(2)],
+        )
+        expected: List[dict] = [
+            {field: line_item[field] for field in LineItem.__fields__}
+            for line_item in line_items
+        ]
+
+        domain_order: Order = service.get_domain_order_by_id(order.id)
+        order_fields: dict = service.get_domain_order_fields(
+            order.id, ["item_count", "line_items"]
+        )
+
+        assert len(service.get_domain_order_by_id(order.id, deserialize=False)) == 1
+        assert [line_item.dict() for line_item in domain_order.line_items] == expected
+        assert order_fields == {"item_count": 2, "line_items": expected}
+
+    def test_order_add_line_items_spills_embedded_line_items(
+        self,
+        new_order_data_dict: dict,
+        line_item_data_dict: dict,
+        monkeypatch,
+    ) -> None:
+        monkeypatch.setattr(order_service, "MAX_EMBEDDED_LINE_ITEMS", 3)
+        service: OrderService = OrderService()
+        order: DynamoOrder = service.create_order(new_order_data_dict)
+        service.add_line_item_to_order(order.key, dict(line_item_data_dict))
+
+        line_items: List[dict] = service.add_line_items_to_order(
+            order.key,
+            [dict(line_item_data_dict) for _ in range(3)],
+        )
+
+        assert [line_item["id"] for line_item in line_items] == ["02", "03", "04"]
+        assert "line_items" not in get_item(order.key)
+        assert len(service.get_domain_order_by_id(order.id).line_items) == 4
+
+    def test_order_add_line_items_keeps_item_count_if_write_fails(
+        self,
+        new_order_data_dict: dict,
+        line_item_data_dict: dict,
+        monkeypatch,
+        mocker,
+    ) -> None:
+        monkeypatch.setattr(order_service, "MAX_EMBEDDED_LINE_ITEMS", 3)
+        service: OrderService = OrderService()
+        order: DynamoOrder = service.create_order(new_order_data_dict)
+        service.add_line_items_to_order(
+            order.key,
+            [dict(line_item_data_dict) for _ in range(2)],
+        )
+        mocker.patch.object(
+            OrderService,
+            "_put_line_items",
+            side_effect=get_client().exceptions.TransactionCanceledException(
+                {"Error": {"Code": "TransactionCanceledException"}},
+                "TransactWriteItems",
+            ),
+        )
+
+        with pytest.raises(AddLineItemException):
+            service.add_line_items_to_order(
+                order.key,
+                [dict(line_item_data_dict) for _ in range(30)],
+            )
+
+        order_item: dict = get_item(order.key)
+        assert "line_items" not in order_item
+        assert order_item["item_count"] == 2
+        assert [
+            line_item.id
+            for line_item in service.get_domain_order_by_id(order.id).line_items
+        ] == ["01", "02"]
+
+    def test_remove_embedded_line_item_from_order(
+        self,
+        new_order_data_dict: dict,
+        line_item_data_dict: dict,
+        monkeypatch,
+    ) -> None:
+        monkeypatch.setattr(order_service, "MAX_EMBEDDED_LINE_ITEMS", 3)
+        service: OrderService = OrderService()
+        order: DynamoOrder = service.create_order(new_order_data_dict)
+        line_item: dict = service.add_line_item_to_order(
+            order.key, dict(line_item_data_dict)
+        )
+
+        service.remove_line_from_order(order.id, line_item["id"])
+
+        order_item: dict = get_item(order.key)
+        assert order_item["line_items"] == {}
+        assert order_item["item_count"] == 0
+        with pytest.raises(RemoveLineItemException):
+            service.remove_line_from_order(order.id, line_item["id"])
+
+    def test_convert_line_item_layout(
+        self,
+        persisted_order_ddb_dict: dict,
+        persisted_line_item_ddb_dict: dict,
+        monkeypatch,
+    ) -> None:
+        monkeypatch.setattr(order_service, "MAX_EMBEDDED_LINE_ITEMS", 3)
+        service: OrderService = OrderService()
+        order_id: str = persisted_order_ddb_dict["id"]
+        before: Order = service.get_domain_order_by_id(order_id)
+
+        assert service.convert_line_item_layout(order_id, embedded=True)
+        assert not service.convert_line_item_layout(order_id, embedded=True)
+        assert len(service.get_domain_order_by_id(order_id, deserialize=False)) == 1
+        assert service.get_domain_order_by_id(order_id).line_items == before.line_items
+
+        assert service.convert_line_item_layout(order_id, embedded=False)
+        assert not service.convert_line_item_layout(order_id, embedded=False)
+        assert persisted_line_item_ddb_dict in service.get_domain_order_by_id(
+            order_id, deserialize=False
+        )
+
+    def test_convert_line_item_layout_skips_orders_over_threshold(
+        self,
+        persisted_order_ddb_dict: dict,
+        persisted_line_item_ddb_dict: dict,
+    ) -> None:
+        service: OrderService = OrderService()
+
+        assert not service.convert_line_item_layout(
+            persisted_order_ddb_dict["id"], embedded=True
+        )
+
+    def test_list_orders_for_customer_pages_newest_first(
+        self,
+        new_order_data_dict: dict,
+        freezer,
+    ) -> None:
+        order_service: OrderService = OrderService()
+        orders: List[DynamoOrder] = []
+        for day in ("2022-01-01", "2022-01-02", "2022-01-03"):
+            freezer.move_to(day)
+            orders.append(order_service.create_order(deepcopy(new_order_data_dict)))
+        order_service.create_order(
+            {**new_order_data_dict, "customer_email": "kif.kroker@dop.com"}
+        )
+
+        first_page, cursor = order_service.list_orders_for_customer(
+            new_order_data_dict["customer_email"],
+            limit=2,
+        )
+        second_page, last_cursor = order_service.list_orders_for_customer(
+            new_order_data_dict["customer_email"],
+            limit=2,
+            cursor=cursor,
+        )
+
+        assert [order.id for order in first_page] == [orders[2].id, orders[1].id]
+        assert [order.id for order in second_page] == [orders[0].id]
+        assert last_cursor is None
+
+    def test_list_orders_for_customer_filters_by_date_range(
+        self,
+        new_order_data_dict: dict,
+        freezer,
+    ) -> None:
+        order_service: OrderService = OrderService()
+        orders: List[DynamoOrder] = []
+        for day in ("2022-01-01", "2022-01-02", "2022-01-03"):
+            freezer.move_to(day)
+            orders.append(order_service.create_order(deepcopy(new_order_data_dict)))
+
+        in_range, _ = order_service.list_orders_for_customer(
+            new_order_data_dict["customer_email"],
+            created_after=datetime(2022, 1, 2),
+            created_before=datetime(2022, 1, 2, 23, 59, 59),
+        )
+        after, _ = order_service.list_orders_for_customer(
+            new_order_data_dict["customer_email"],
+            created_after=datetime(2022, 1, 2),
+            newest_first=False,
+        )
+
+        assert [order.id for order in in_range] == [orders[1].id]
+        assert [order.id for order in after] == [orders[1].id, orders[2].id]
+
+    def test_list_orders_for_customer_reads_naive_datetimes_as_utc(
+        self,
+        new_order_data_dict: dict,
+        monkeypatch,
+    ) -> None:
+        order_service: OrderService = OrderService()
+        with freeze_time("2022-01-01T20:00:00"):
+            order: DynamoOrder = order_service.create_order(new_order_data_dict)
+
+        # Nine hours ahead of UTC, naive local midnight would be 15:00 UTC.
+        monkeypatch.setenv("TZ", "Asia/Tokyo")
+        tzset()
+        try:
+            before, _ = order_service.list_orders_for_customer(
+                order.customer_email, created_before=datetime(2022, 1, 1, 23, 59, 59)
+            )
+            after, _ = order_service.list_orders_for_customer(
+                order.customer_email, created_after=datetime(2022, 1, 2)
+            )
+        finally:
+            monkeypatch.undo()
+            tzset()
+
+        assert [found.id for found in before] == [order.id]
+        assert after == []
+
+    def test_iter_orders_by_status_merges_shards(
+        self,
+        new_order_data_dict: dict,
+        freezer,
+    ) -> None:
+        order_service: OrderService = OrderService()
+        orders: List[DynamoOrder] = []
+        for minute in range(12):
+            freezer.move_to(f"2022-01-01T00:{str(minute).zfill(2)}:00")
+            orders.append(order_service.create_order(deepcopy(new_order_data_dict)))
+
+        freezer.move_to("2022-01-01T01:00:00")
+        order_service.update_order_status(orders[0].id, OrderStatus.SUBMITTED)
+        order_service.update_order_status(orders[1].id, OrderStatus.DELIVERED)
+
+        new_orders: List[DynamoOrder] = list(
+            order_service.iter_orders_by_status(OrderStatus.NEW, page_size=1)
+        )
+        recent_orders: List[DynamoOrder] = list(
+            order_service.iter_orders_by_status(
+                OrderStatus.NEW,
+                since=datetime(2022, 1, 1, 0, 9, 30),
+            )
+        )
+        submitted_orders: List[DynamoOrder] = list(
+            order_service.iter_orders_by_status(OrderStatus.SUBMITTED)
+        )
+
+        assert [order.id for order in new_orders] == [order.id for order in orders[2:]]
+        assert [order.id for order in recent_orders] == [
+            order.id for order in orders[10:]
+        ]
+        assert [order.id for order in submitted_orders] == [orders[0].id]
+        assert len({get_item(order.key)["status_shard"] for order in orders[2:]}) > 1
+
+    def test_save_items_indexes_orders_by_status(
+        self,
+        order_ddb_dict: dict,
+    ) -> None:
+        order_service: OrderService = OrderService()
+        new_order: DynamoOrder = DynamoOrder(**order_ddb_dict)
+        delivered_order: DynamoOrder = DynamoOrder(
+            **{
+                **order_ddb_dict,
+                "id": f"{order_ddb_dict['id']}-delivered",
+                "status": OrderStatus.DELIVERED,
+            }
+        )
+
+        order_service.save_items([new_order, delivered_order])
+
+        assert [
+            order.id for order in order_service.iter_orders_by_status(OrderStatus.NEW)
+        ] == [new_order.id]
+        assert get_item(delivered_order.key)["status_changed"]
+        assert "status_shard" not in get_item(delivered_order.key)
+
+    def test_update_order_status_removes_delivered_order_from_index(
+        self,
+        new_order_data_dict: dict,
+    ) -> None:
+        order_service: OrderService = OrderService()
+        order: DynamoOrder = order_service.create_order(new_order_data_dict)
+
+        order_service.update_order_status(order.id, OrderStatus.DELIVERED)
+        item: dict = get_item(order.key)
+
+        assert item["status"] == OrderStatus.DELIVERED
+        assert "status_shard" not in item
+        with pytest.raises(OrderStatusException):
+            next(order_service.iter_orders_by_status(OrderStatus.DELIVERED))
+
+    def test_update_order_status_raises_exception_if_no_order(self) -> None:
+        order_service: OrderService = OrderService()
+
+        with pytest.raises(OrderLookupException):
+            order_service.update_order_status("doom_at_11", OrderStatus.SUBMITTED)
+
+    def test_update_order_status_raises_exception_if_version_changed(
+        self,
+        new_order_data_dict: dict,
+    ) -> None:
+        order_service: OrderService = OrderService()
+        order: DynamoOrder = order_service.create_order(new_order_data_dict)
+        order_service.update_order_status(order.id, OrderStatus.SUBMITTED)
+
+        with pytest.raises(VersionConflictException):
+            order_service.update_order_status(
+                order.id, OrderStatus.IN_PROGRESS, expected_version=0
+            )
+
+        assert get_item(order.key)["status"] == OrderStatus.SUBMITTED
+
+    def test_transition_order_status_enforces_transitions(
+        self,
+        new_order_data_dict: dict,
+    ) -> None:
+        order_service: OrderService = OrderService()
+        order: DynamoOrder = order_service.create_order(new_order_data_dict)
+
+        with pytest.raises(OrderStatusException):
+            order_service.transition_order_status(order.id, OrderStatus.SHIPPED)
+        with pytest.raises(OrderStatusException):
+            order_service.transition_order_status(order.id, OrderStatus.NEW)
+        with pytest.raises(OrderLookupException):
+            order_service.transition_order_status("doom_at_11", OrderStatus.SUBMITTED)
+
+        submitted: DynamoOrder = order_service.transition_order_status(
+            order.id, OrderStatus.SUBMITTED
+        )
+
+        assert submitted.status == OrderStatus.SUBMITTED
+        assert get_item(order.key)["status"] == OrderStatus.SUBMITTED
+
+    def test_transition_orders_status_reports_each_order(
+        self,
+        new_order_data_dict: dict,
+        mocker,
+    ) -> None:
+        order_service: OrderService = OrderService()
+        orders: List[DynamoOrder] = [
+            order_service.create_order(dict(new_order_data_dict)) for _ in range(3)
+        ]
+        for order in orders[:2]:
+            order_service.update_order_status(order.id, OrderStatus.FULFILLED)
+
+        client = get_client()
+        update_item = client.update_item
+        throttles: list = [
+            client.exceptions.ProvisionedThroughputExceededException(
+                {"Error": {"Code": "ProvisionedThroughputExceededException"}},
+                "UpdateItem",
+            )
+        ]
+
+        def throttle_once(**kwargs) -> dict:
+            if throttles:
+                raise throttles.pop()
+
+            return update_item(**kwargs)
+
+        mocker.patch.object(client, "update_item", side_effect=throttle_once)
+        mocker.patch("src.services.order_service.backoff")
+
+        report = order_service.transition_orders_status(
+            [order.id for order in orders] + ["doom_at_11", orders[0].id],
+            OrderStatus.SHIPPED,
+            max_workers=1,
+        )
+
+        assert report.succeeded == 2
+        assert report.failed == 2
+        assert report.retries == 1
+        assert [result.id for result in report.results] == [
+            *(order.id for order in orders),
+            "doom_at_11",
+        ]
+        assert [result.succeeded for result in report.results] == [
+            True,
+            True,
+            False,
+            False,
+        ]
+        assert report.results[0].attempts == 2
+        assert get_item(orders[1].key)["status"] == OrderStatus.SHIPPED
+        assert get_item(orders[2].key)["status"] == OrderStatus.NEW
+
+    def test_compare_and_swap_order(
+        self,
+        persisted_order_ddb_dict: dict,
+    ) -> None:
+        order_service: OrderService = OrderService()
+        order_id: str = persisted_order_ddb_dict["id"]
+
+        order: DynamoOrder = order_service.compare_and_swap_order(
+            order_id, 0, {"status": OrderStatus.SUBMITTED}
+        )
+
+        assert order.version == 1
+        assert order.status == OrderStatus.SUBMITTED
+        assert get_item(order.key)["status_shard"].startswith("submitted#")
+        with pytest.raises(VersionConflictException):
+            order_service.compare_and_swap_order(
+                order_id, 0, {"status": OrderStatus.IN_PROGRESS}
+            )
+        with pytest.raises(InvalidFieldsException):
+            order_service.compare_and_swap_order(order_id, 1, {"item_count": 5})
+        with pytest.raises(OrderLookupException):
+            order_service.compare_and_swap_order(
+                "doom_at_11", 0, {"status": OrderStatus.IN_PROGRESS}
+            )
+
+    def test_update_order_writes_only_changed_fields(
+        self,
+        persisted_order_ddb_dict: dict,
+        mocker,
+    ) -> None:
+        order_service: OrderService = OrderService()
+        update_spy = mocker.spy(get_client(), "update_item")
+        put_spy = mocker.spy(get_client(), "put_item")
+        order: DynamoOrder = DynamoOrder.construct(id=persisted_order_ddb_dict["id"])
+        order.status = OrderStatus.SUBMITTED
+
+        updated_order: DynamoOrder = order_service.update_order(order)
+
+        assert not put_spy.called
+        assert update_spy.call_args.kwargs["ExpressionAttributeNames"]["#f0"] == (
+            "status"
+        )
+        assert not order.dirty_fields
+        assert updated_order.status == OrderStatus.SUBMITTED
+        assert updated_order.version == 1
+        assert (
+            updated_order.customer_email == persisted_order_ddb_dict["customer_email"]
+        )
+
+    def test_update_order_never_sends_transition_to_new(
+        self,
+        persisted_order_ddb_dict: dict,
+        mocker,
+    ) -> None:
+        update_spy = mocker.spy(get_client(), "update_item")
+        order: DynamoOrder = DynamoOrder.construct(id=persisted_order_ddb_dict["id"])
+        order.status = OrderStatus.NEW
+
+        with pytest.raises(OrderStatusException):
+            OrderService().update_order(order)
+
+        assert not update_spy.called
+
+    def test_update_order_raises_exception_with_read_only_fields(
+        self,
+        persisted_order_ddb_dict: dict,
+    ) -> None:
+        order: DynamoOrder = DynamoOrder.construct(id=persisted_order_ddb_dict["id"])
+        order.item_count = 10
+
+        with pytest.raises(InvalidFieldsException):
+            OrderService().update_order(order)
+
+    def test_mutate_order_retries_on_conflict(
+        self,
+        new_order_data_dict: dict,
+    ) -> None:
+        order_service: OrderService = OrderService()
+        order: DynamoOrder = order_service.create_order(new_order_data_dict)
+        seen_versions: List[int] = []
+
+        def mutation(current: DynamoOrder) -> dict:
+            seen_versions.append(current.version)
+            if len(seen_versions) == 1:
+                order_service.update_order_status(order.id, OrderStatus.SUBMITTED)
+
+            return {"status": OrderStatus.IN_PROGRESS}
+
+        mutated: DynamoOrder = order_service.mutate_order(order.id, mutation)
+
+        assert seen_versions == [0, 1]
+        assert mutated.version == 2
+        assert mutated.status == OrderStatus.IN_PROGRESS
+
     def test_order_gets_domain_model_by_id(
         self,
         persisted_order_ddb_dict: dict,
@@ -61,6 +758,55 @@ class TestOrderService:
 
         assert isinstance(order, Order)
 
+    def test_order_gets_domain_order_fields_without_line_items(
+        self,
+        persisted_order_ddb_dict: dict,
+        persisted_line_item_ddb_dict: dict,
+        mocker,
+    ) -> None:
+        client: OrderService = OrderService()
+        query_spy = mocker.spy(get_client(), "query")
+
+        order_fields: dict = client.get_domain_order_fields(
+            persisted_order_ddb_dict["id"],
+            ["status", "item_count"],
+        )
+
+        assert order_fields == {
+            "status": persisted_order_ddb_dict["status"],
+            "item_count": persisted_order_ddb_dict["item_count"],
+        }
+        assert not query_spy.called
+
+    def test_order_gets_domain_order_fields_with_line_items(
+        self,
+        persisted_order_ddb_dict: dict,
+        persisted_line_item_ddb_dict: dict,
+    ) -> None:
+        client: OrderService = OrderService()
+
+        order_fields: dict = client.get_domain_order_fields(
+            persisted_order_ddb_dict["id"],
+            ["id", "line_items"],
+        )
+
+        assert order_fields["id"] == persisted_order_ddb_dict["id"]
+        assert order_fields["line_items"] == [
+            {
+                field: persisted_line_item_ddb_dict[field]
+                for field in LineItem.__fields__
+            }
+        ]
+
+    def test_order_get_domain_order_fields_raises_exception_with_invalid_fields(
+        self,
+        persisted_order_ddb_dict: dict,
+    ) -> None:
+        client: OrderService = OrderService()
+
+        with pytest.raises(InvalidFieldsException):
+            client.get_domain_order_fields(persisted_order_ddb_dict["id"], ["pk"])
+
     @pytest.mark.parametrize(
         "expected_type, expected_result, deserialize",
         [
@@ -115,6 +861,8 @@ class TestOrderService:
             key_condition_expression=Key("pk").eq(persisted_order_ddb_dict["pk"])
         )
         assert len(response) == 1
+        persisted_order_ddb_dict["next_line_item_id"] = 2
+        persisted_order_ddb_dict["version"] = 2
         assert persisted_order_ddb_dict in response
 
     def test_remove_line_item_raises_exception_if_no_line_item(
@@ -127,6 +875,89 @@ class TestOrderService:
                 order_id=persisted_order_ddb_dict["id"], line_item_id=1
             )
 
+    def test_remove_line_item_raises_exception_if_version_changed(
+        self,
+        persisted_order_ddb_dict: dict,
+        persisted_line_item_ddb_dict: dict,
+    ) -> None:
+        order_service: OrderService = OrderService()
+
+        with pytest.raises(VersionConflictException):
+            order_service.remove_line_from_order(
+                persisted_order_ddb_dict["id"],
+                persisted_line_item_ddb_dict["id"],
+                expected_version=3,
+            )
+
+        assert get_item(
+            {
+                "pk": persisted_line_item_ddb_dict["pk"],
+                "sk": persisted_line_item_ddb_dict["sk"],
+            }
+        )
+
+    def test_remove_embedded_line_item_without_transaction(
+        self,
+        new_order_data_dict: dict,
+        line_item_data_dict: dict,
+        monkeypatch,
+        mocker,
+    ) -> None:
+        monkeypatch.setattr(order_service, "MAX_EMBEDDED_LINE_ITEMS", 3)
+        service: OrderService = OrderService()
+        order: DynamoOrder = service.create_order(new_order_data_dict)
+        line_item: dict = service.add_line_item_to_order(
+            order.key, dict(line_item_data_dict)
+        )
+        transact_spy = mocker.spy(get_client(), "transact_write_items")
+
+        service.remove_line_from_order(order.id, line_item["id"], expected_version=1)
+
+        assert not transact_spy.called
+        assert get_item(order.key)["version"] == 2
+
+    def test_remove_line_item_retries_transaction_conflicts(
+        self,
+        persisted_order_ddb_dict: dict,
+        persisted_line_item_ddb_dict: dict,
+        mocker,
+    ) -> None:
+        client = get_client()
+        transact_write_items = client.transact_write_items
+        conflict = client.exceptions.TransactionCanceledException(
+            {
+                "Error": {"Code": "TransactionCanceledException"},
+                "CancellationReasons": [
+                    {"Code": "TransactionConflict"},
+                    {"Code": "None"},
+                ],
+            },
+            "TransactWriteItems",
+        )
+        responses: list = [conflict]
+
+        def conflict_once(**kwargs) -> dict:
+            if responses:
+                raise responses.pop()
+
+            return transact_write_items(**kwargs)
+
+        mocker.patch.object(client, "transact_write_items", side_effect=conflict_once)
+        mocker.patch("src.services.order_service.backoff")
+
+        OrderService().remove_line_from_order(
+            persisted_order_ddb_dict["id"],
+            persisted_line_item_ddb_dict["id"],
+        )
+
+        assert client.transact_write_items.call_count == 2
+        assert not get_item(
+            {
+                "pk": persisted_line_item_ddb_dict["pk"],
+                "sk": persisted_line_item_ddb_dict["sk"],
+            }
+        )
+
     def test_remove_line_item_raises_exception_if_set_status_no_new(
         self,
         persisted_order_ddb_dict: dict,
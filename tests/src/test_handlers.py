@@ -1,18 +1,29 @@
+import gzip
+import subprocess
+import sys
+from base64 import b64decode, b64encode
 from copy import deepcopy
 
 import pytest
 import simplejson as json
 
+from src.constants import MAX_REQUEST_BODY_BYTES
+from src.dynamodb.connection import get_client
 from src.dynamodb.helpers import get_item
 from src.handlers import (
     http_add_address_to_customer,
     http_add_line_item,
+    http_add_line_items,
     http_create_customer,
     http_create_order,
     http_get_domain_order,
+    http_list_customer_orders,
+    http_router,
+    http_transition_orders,
+    http_update_order,
 )
 from src.models.line_item import LineItem
-from src.models.order import Order, OrderStatus
+from src.models.order import DynamoOrder, Order, OrderStatus
 from src.services.order_service import OrderService
 
 
@@ -77,6 +88,47 @@ class TestHttpCreateCustomer:
             "message": "Unable to create customer.",
         }
 
+    def test_http_create_customer_returns_413_with_large_body(
+        self,
+        new_customer_data_dict: dict,
+    ) -> None:
+        new_customer_data_dict["first_name"] = "P" * MAX_REQUEST_BODY_BYTES
+
+        response: dict = http_create_customer(
+            event={"body": json.dumps(new_customer_data_dict)}, context=None
+        )
+
+        assert response["statusCode"] == "413"
+
+    @pytest.mark.parametrize("body", ["{", "[]", "bnVsbA=="])
+    def test_http_create_customer_returns_400_with_invalid_json(
+        self,
+        body: str,
+    ) -> None:
+        response: dict = http_create_customer(
+            event={"body": body, "isBase64Encoded": body.endswith("=")},
+            context=None,
+        )
+
+        assert response["statusCode"] == "400"
+
+    @pytest.mark.freeze_time
+    def test_http_create_customer_accepts_base64_body(
+        self,
+        customer_data_dict: dict,
+        new_customer_data_dict: dict,
+    ) -> None:
+        response: dict = http_create_customer(
+            event={
+                "body": b64encode(json.dumps(new_customer_data_dict).encode()),
+                "isBase64Encoded": True,
+            },
+            context=None,
+        )
+
+        assert response["statusCode"] == "201"
+        assert json.loads(response["body"]) == customer_data_dict
+
 
 class TestHttpAddAddressToCustomer:
     def test_add_address_to_customer_succeeds(
@@ -116,7 +168,7 @@ class TestHttpAddAddressToCustomer:
 
         assert response
         assert response["statusCode"] == "404"
-        assert response["body"] == '{"message": "Customer not found"}'
+        assert json.loads(response["body"]) == {"message": "Customer not found"}
 
 
 class TestHttpCreateOrder:
@@ -151,7 +203,9 @@ class TestHttpCreateOrder:
         )
 
         assert response["statusCode"] == "422"
-        assert response["body"] == '{"message": "Invalid delivery_address_id"}'
+        assert json.loads(response["body"]) == {
+            "message": "Invalid delivery_address_id"
+        }
 
     def test_create_order_returns_422_on_invalid_customer_email(
         self,
@@ -167,7 +221,55 @@ class TestHttpCreateOrder:
         )
 
         assert response["statusCode"] == "422"
-        assert response["body"] == '{"message": "Customer not found."}'
+        assert json.loads(response["body"]) == {"message": "Customer not found."}
+
+
+class TestHttpListCustomerOrders:
+    def test_http_list_customer_orders(
+        self,
+        persisted_customer_ddb_dict: dict,
+        persisted_order_ddb_dict: dict,
+    ) -> None:
+        response: dict = http_list_customer_orders(
+            event={
+                "pathParameters": {
+                    "username": persisted_customer_ddb_dict["username"],
+                },
+                "queryStringParameters": {"limit": "1"},
+            },
+            context=None,
+        )
+
+        assert response["statusCode"] == "200"
+        contents: dict = json.loads(response["body"])
+        assert [order["id"] for order in contents["orders"]] == [
+            persisted_order_ddb_dict["id"]
+        ]
+        assert contents["cursor"] is None
+
+    def test_http_list_customer_orders_returns_404_with_bad_username(self) -> None:
+        response: dict = http_list_customer_orders(
+            event={"pathParameters": {"username": "doom_at_11"}},
+            context=None,
+        )
+
+        assert response["statusCode"] == "404"
+
+    def test_http_list_customer_orders_returns_422_with_bad_limit(
+        self,
+        persisted_customer_ddb_dict: dict,
+    ) -> None:
+        response: dict = http_list_customer_orders(
+            event={
+                "pathParameters": {
+                    "username": persisted_customer_ddb_dict["username"],
+                },
+                "queryStringParameters": {"limit": "1000"},
+            },
+            context=None,
+        )
+
+        assert response["statusCode"] == "422"
 
 
 class TestHttpGetDomainOrder:
@@ -191,7 +293,312 @@ class TestHttpGetDomainOrder:
         )
 
         assert response["statusCode"] == "200"
-        assert response["body"] == domain_order.json()
+        assert response["body"] == domain_order.cached_json()
+        assert response["headers"]["ETag"]
+
+    def test_http_get_domain_order_returns_304_with_matching_etag(
+        self,
+        persisted_order_ddb_dict: dict,
+        persisted_line_item_ddb_dict: dict,
+        mocker,
+    ) -> None:
+        event: dict = {
+            "pathParameters": {
+                "order_id": persisted_order_ddb_dict["id"],
+            }
+        }
+        etag: str = http_get_domain_order(event=event, context=None)["headers"]["ETag"]
+        query_spy = mocker.spy(get_client(), "query")
+
+        response: dict = http_get_domain_order(
+            event={**event, "headers": {"if-none-match": f"W/{etag}"}},
+            context=None,
+        )
+
+        assert response["statusCode"] == "304"
+        assert response["headers"]["ETag"] == etag
+        assert response["body"] == ""
+        assert not query_spy.called
+
+    def test_http_get_domain_order_reuses_order_until_it_changes(
+        self,
+        persisted_order_ddb_dict: dict,
+        line_item_data_dict: dict,
+        mocker,
+    ) -> None:
+        event: dict = {
+            "pathParameters": {
+                "order_id": persisted_order_ddb_dict["id"],
+            },
+            "headers": {"If-None-Match": '"stale"'},
+        }
+        first_response: dict = http_get_domain_order(event=event, context=None)
+        query_spy = mocker.spy(get_client(), "query")
+
+        assert http_get_domain_order(event=event, context=None) == first_response
+        assert not query_spy.called
+
+        OrderService().add_line_item_to_order(
+            DynamoOrder.calculate_key(persisted_order_ddb_dict["id"]),
+            line_item_data_dict,
+        )
+        query_spy.reset_mock()
+        response: dict = http_get_domain_order(event=event, context=None)
+
+        assert query_spy.call_count == 1
+        assert response["headers"]["ETag"] != first_response["headers"]["ETag"]
+        assert len(json.loads(response["body"])["line_items"]) == 1
+
+    def test_http_get_domain_order_compresses_large_orders(
+        self,
+        persisted_order_ddb_dict: dict,
+        line_item_data_dict: dict,
+    ) -> None:
+        order_client: OrderService = OrderService()
+        for _ in range(20):
+            order_client.add_line_item_to_order(
+                DynamoOrder.calculate_key(persisted_order_ddb_dict["id"]),
+                line_item_data_dict,
+            )
+        event: dict = {
+            "pathParameters": {
+                "order_id": persisted_order_ddb_dict["id"],
+            },
+        }
+        response: dict = http_get_domain_order(
+            event={**event, "headers": {"accept-encoding": "gzip, deflate, br"}},
+            context=None,
+        )
+        uncompressed: dict = http_get_domain_order(event=event, context=None)
+
+        assert response["statusCode"] == "200"
+        assert response["isBase64Encoded"]
+        assert response["headers"]["Content-Encoding"] == "gzip"
+        assert response["headers"]["Vary"] == "Accept-Encoding"
+        assert response["headers"]["ETag"] == f"W/{uncompressed['headers']['ETag']}"
+        assert (
+            gzip.decompress(b64decode(response["body"])).decode()
+            == uncompressed["body"]
+        )
+        assert len(response["body"]) < len(uncompressed["body"])
+        assert not uncompressed["isBase64Encoded"]
+        assert "Content-Encoding" not in uncompressed["headers"]
+
+    def test_http_get_domain_order_with_fields(
+        self,
+        persisted_order_ddb_dict: dict,
+    ) -> None:
+        response: dict = http_get_domain_order(
+            event={
+                "pathParameters": {"order_id": persisted_order_ddb_dict["id"]},
+                "queryStringParameters": {"fields": "status, item_count"},
+            },
+            context=None,
+        )
+
+        assert response["statusCode"] == "200"
+        assert json.loads(response["body"]) == {
+            "status": persisted_order_ddb_dict["status"],
+            "item_count": persisted_order_ddb_dict["item_count"],
+        }
+
+    def test_http_get_domain_order_returns_422_with_invalid_fields(
+        self,
+        persisted_order_ddb_dict: dict,
+    ) -> None:
+        response: dict = http_get_domain_order(
+            event={
+                "pathParameters": {"order_id": persisted_order_ddb_dict["id"]},
+                "queryStringParameters": {"fields": "status,doom"},
+            },
+            context=None,
+        )
+
+        assert response["statusCode"] == "422"
+        assert json.loads(response["body"]) == {"message": "Invalid fields: doom"}
+
+    def test_http_get_domain_order_returns_404_with_bad_order_id(self) -> None:
+        response: dict = http_get_domain_order(
+            event={"pathParameters": {"order_id": "doom_at_11"}},
+            context=None,
+        )
+
+        assert response["statusCode"] == "404"
+
+
+class TestHttpUpdateOrder:
+    def test_http_update_order_succeeds(
+        self,
+        persisted_order_ddb_dict: dict,
+    ) -> None:
+        response: dict = http_update_order(
+            event={
+                "pathParameters": {"order_id": persisted_order_ddb_dict["id"]},
+                "body": json.dumps({"status": "submitted"}),
+            },
+            context=None,
+        )
+        order_item: dict = get_item(
+            DynamoOrder.calculate_key(persisted_order_ddb_dict["id"])
+        )
+
+        assert response["statusCode"] == "200"
+        assert json.loads(response["body"])["status"] == "submitted"
+        assert response["headers"]["ETag"]
+        assert order_item["status"] == "submitted"
+        assert order_item["status_shard"].startswith("submitted#")
+        assert (
+            order_item["delivery_address"]
+            == persisted_order_ddb_dict["delivery_address"]
+        )
+
+    def test_http_update_order_returns_404_with_bad_order_id(self) -> None:
+        response: dict = http_update_order(
+            event={
+                "pathParameters": {"order_id": "doom_at_11"},
+                "body": json.dumps({"status": "submitted"}),
+            },
+            context=None,
+        )
+
+        assert response["statusCode"] == "404"
+        assert not get_item(DynamoOrder.calculate_key("doom_at_11"))
+
+    def test_http_update_order_moves_order_through_allowed_statuses(
+        self,
+        persisted_order_ddb_dict: dict,
+    ) -> None:
+        for status in ("submitted", "in_progress"):
+            response: dict = http_update_order(
+                event={
+                    "pathParameters": {"order_id": persisted_order_ddb_dict["id"]},
+                    "body": json.dumps({"status": status}),
+                },
+                context=None,
+            )
+
+            assert response["statusCode"] == "200"
+            assert json.loads(response["body"])["status"] == status
+
+        order_item: dict = get_item(
+            DynamoOrder.calculate_key(persisted_order_ddb_dict["id"])
+        )
+        assert order_item["status"] == "in_progress"
+        assert order_item["version"] == 2
+
+    @pytest.mark.parametrize("status", ["delivered", "new"])
+    def test_http_update_order_returns_409_with_invalid_transition(
+        self,
+        persisted_order_ddb_dict: dict,
+        status: str,
+        mocker,
+    ) -> None:
+        update_spy = mocker.spy(get_client(), "update_item")
+
+        response: dict = http_update_order(
+            event={
+                "pathParameters": {"order_id": persisted_order_ddb_dict["id"]},
+                "body": json.dumps({"status": status}),
+            },
+            context=None,
+        )
+        order_item: dict = get_item(
+            DynamoOrder.calculate_key(persisted_order_ddb_dict["id"])
+        )
+
+        assert response["statusCode"] == "409"
+        assert json.loads(response["body"])["message"]
+        assert order_item["status"] == persisted_order_ddb_dict["status"]
+        assert update_spy.call_count == (0 if status == "new" else 1)
+
+    @pytest.mark.parametrize("body", [{}, {"status": "lost"}, {"item_count": 3}])
+    def test_http_update_order_returns_422_with_invalid_body(
+        self,
+        persisted_order_ddb_dict: dict,
+        body: dict,
+    ) -> None:
+        response: dict = http_update_order(
+            event={
+                "pathParameters": {"order_id": persisted_order_ddb_dict["id"]},
+                "body": json.dumps(body),
+            },
+            context=None,
+        )
+
+        assert response["statusCode"] == "422"
+
+
+class TestHttpTransitionOrders:
+    def test_http_transition_orders_succeeds(
+        self,
+        persisted_order_ddb_dict: dict,
+    ) -> None:
+        response: dict = http_transition_orders(
+            event={
+                "body": json.dumps(
+                    {
+                        "order_ids": [persisted_order_ddb_dict["id"], "doom_at_11"],
+                        "status": "submitted",
+                    }
+                ),
+            },
+        )
+        report: dict = json.loads(response["body"])
+
+        assert response["statusCode"] == "200"
+        assert report["succeeded"] == 1
+        assert report["failed"] == 1
+        assert [result["succeeded"] for result in report["results"]] == [True, False]
+
+    def test_http_transition_orders_returns_422_with_invalid_status(self) -> None:
+        response: dict = http_transition_orders(
+            event={"body": json.dumps({"order_ids": ["doom_at_11"], "status": "lost"})},
+        )
+
+        assert response["statusCode"] == "422"
+
+
+class TestHttpRouter:
+    def test_http_router_routes_get_domain_order(
+        self,
+        persisted_order_ddb_dict: dict,
+        persisted_line_item_ddb_dict: dict,
+    ) -> None:
+        order_id: str = persisted_order_ddb_dict["id"]
+        event: dict = {
+            "httpMethod": "GET",
+            "resource": "/{proxy+}",
+            "path": f"/v1/order/{order_id}",
+            "pathParameters": {"proxy": f"v1/order/{order_id}"},
+        }
+
+        response: dict = http_router(event=event, context=None)
+
+        assert response == http_get_domain_order(
+            event={"pathParameters": {"order_id": order_id}},
+            context=None,
+        )
+
+    def test_http_router_routes_post_request(self) -> None:
+        response: dict = http_router(
+            event={
+                "httpMethod": "POST",
+                "resource": "/v1/customer",
+                "path": "/v1/customer",
+                "body": json.dumps({"username": "fry"}),
+            },
+            context=None,
+        )
+
+        assert response["statusCode"] == "422"
+
+    def test_http_router_returns_404(self) -> None:
+        response: dict = http_router(
+            event={"httpMethod": "GET", "path": "/v2/order"},
+            context=None,
+        )
+
+        assert response["statusCode"] == "404"
 
 
 class TestHttpAddLineItem:
@@ -224,3 +631,100 @@ class TestHttpAddLineItem:
 
         fetched_line_item: dict = get_item(key)
         assert fetched_line_item
+
+    def test_http_add_line_item_returns_404_with_bad_order_id(
+        self,
+        line_item_data_dict: dict,
+    ) -> None:
+        new_line_item_data = deepcopy(line_item_data_dict)
+        new_line_item_data.pop("id")
+        new_line_item_data.pop("order_id")
+        response: dict = http_add_line_item(
+            event={
+                "pathParameters": {"order_id": "doom_at_11"},
+                "body": json.dumps(new_line_item_data),
+            },
+            context=None,
+        )
+
+        assert response["statusCode"] == "404"
+        assert json.loads(response["body"]) == {"message": "Order not found"}
+
+    def test_http_add_line_items_succeeds(
+        self,
+        persisted_order_ddb_dict: dict,
+        line_item_data_dict: dict,
+    ) -> None:
+        new_line_item_data = deepcopy(line_item_data_dict)
+        new_line_item_data.pop("id")
+        new_line_item_data.pop("order_id")
+        response: dict = http_add_line_items(
+            event={
+                "pathParameters": {
+                    "order_id": persisted_order_ddb_dict["id"],
+                },
+                "body": json.dumps({"line_items": [new_line_item_data] * 3}),
+            },
+            context=None,
+        )
+
+        assert response["statusCode"] == "201"
+        line_items: list = json.loads(response["body"])["line_items"]
+        assert [line_item["id"] for line_item in line_items] == ["01", "02", "03"]
+
+        for line_item in line_items:
+            assert get_item(
+                LineItem.calculate_key(persisted_order_ddb_dict["id"], line_item["id"])
+            )
+
+    def test_http_add_line_items_returns_404_with_bad_order_id(
+        self,
+        line_item_data_dict: dict,
+    ) -> None:
+        new_line_item_data = deepcopy(line_item_data_dict)
+        new_line_item_data.pop("id")
+        new_line_item_data.pop("order_id")
+        response: dict = http_add_line_items(
+            event={
+                "pathParameters": {"order_id": "doom_at_11"},
+                "body": json.dumps({"line_items": [new_line_item_data]}),
+            },
+            context=None,
+        )
+
+        assert response["statusCode"] == "404"
+
+    def test_http_add_line_items_returns_422_with_no_line_items(self) -> None:
+        response: dict = http_add_line_items(
+            event={
+                "pathParameters": {"order_id": "doom_at_11"},
+                "body": json.dumps({"line_items": []}),
+            },
+            context=None,
+        )
+
+        assert response["statusCode"] == "422"
+
+
+def test_handlers_import_defers_heavy_modules():
+    # A fresh interpreter, the test session has already imported everything.
+    result: subprocess.CompletedProcess = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, src.handlers; "
+            "print(sorted({name.split('.')[0] for name in sys.modules}))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    for module in (
+        "boto3",
+        "botocore",
+        "email_validator",
+        "ksuid",
+        "mypy_boto3_dynamodb",
+    ):
+        assert f"'{module}'" not in result.stdout